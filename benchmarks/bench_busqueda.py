@@ -0,0 +1,89 @@
+"""
+Benchmark de busqueda: latencia de IndiceBusqueda frente a recorrer todas las
+tareas comparando subcadenas, y coste de construir o cargar el indice
+
+Uso: python benchmarks/bench_busqueda.py [tareas]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+from bench_carga import generar_proyectos
+from busqueda import IndiceBusqueda
+from models import Proyecto
+
+PALABRAS = (
+    "implementar revisar codigo documentacion api backend frontend base datos "
+    "pruebas usuario login pago factura reporte error"
+).split()
+CONSULTAS = ("tarea 12345", "tarea 500", "#backend tarea 99", "factu")
+
+
+def generar_proyecto(tareas: int) -> Proyecto:
+    aleatorio = random.Random(1)
+    datos = generar_proyectos(tareas, 1)[0]
+    for columna in datos["columnas"]:
+        for tarea in columna["tareas"]:
+            tarea["titulo"] = " ".join(aleatorio.sample(PALABRAS, 3)) + f" {tarea['titulo']}"
+            tarea["descripcion"] = " ".join(aleatorio.choices(PALABRAS, k=12))
+    return Proyecto.from_dict(datos)
+
+
+def recorrer(proyecto: Proyecto, termino: str) -> list:
+    """La busqueda anterior: subcadena en titulo o descripcion de cada tarea"""
+    termino = termino.lower()
+    return [
+        tarea
+        for columna in proyecto.columnas
+        for tarea in columna.tareas
+        if termino in tarea.titulo.lower() or termino in tarea.descripcion.lower()
+    ]
+
+
+def medir(funcion, repeticiones: int = 5) -> float:
+    """Mejor tiempo en milisegundos"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main():
+    tareas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    proyecto = generar_proyecto(tareas)
+    print(f"{tareas} tareas")
+
+    inicio = time.perf_counter()
+    indice = IndiceBusqueda(proyecto)
+    print(f"{'construir':<22}{(time.perf_counter() - inicio) * 1000:>10.1f} ms")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "indice.json"
+        indice.guardar(ruta, proyecto.version)
+        inicio = time.perf_counter()
+        indice = IndiceBusqueda.cargar(proyecto, ruta)
+        print(f"{'cargar':<22}{(time.perf_counter() - inicio) * 1000:>10.1f} ms")
+    # La primera consulta construye el mapa de trigramas del vocabulario
+    inicio = time.perf_counter()
+    indice.buscar(proyecto, CONSULTAS[0])
+    print(f"{'primera consulta':<22}{(time.perf_counter() - inicio) * 1000:>10.1f} ms")
+
+    print(f"{'consulta':<22}{'indice':>10}{'recorrido':>12}")
+    for consulta in CONSULTAS:
+        con_indice = medir(lambda: indice.buscar(proyecto, consulta, limite=20))
+        if consulta.startswith("#"):
+            print(f"{consulta:<22}{con_indice:>8.3f}ms{'-':>12}")
+        else:
+            recorrido = medir(lambda: recorrer(proyecto, consulta), 2)
+            print(f"{consulta:<22}{con_indice:>8.3f}ms{recorrido:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de carga: objetos por segundo al construir proyectos con
+Proyecto.from_dict a partir de los diccionarios del archivo de datos
+
+Compara los modelos actuales con los de una revision anterior de git.
+
+Uso: python benchmarks/bench_carga.py [tareas] [proyectos] [revision_git]
+"""
+
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+import models
+from bench_memoria import cargar_modelos_de_revision
+
+
+def generar_proyectos(tareas: int, proyectos: int) -> list:
+    """Diccionarios de proyectos de cuatro columnas con ``tareas`` tareas en total"""
+    estados = ("Pendiente", "En Progreso", "Completada", "Bloqueada")
+    prioridades = ("Baja", "Media", "Alta", "Urgente")
+    fecha = "2024-01-15T10:30:00.123456"
+    datos = []
+    por_proyecto = tareas // proyectos
+    for p in range(proyectos):
+        columnas = [
+            {"columna_id": str(uuid.uuid4()), "nombre": nombre, "orden": i,
+             "tareas": [], "fecha_creacion": fecha}
+            for i, nombre in enumerate(estados)
+        ]
+        for i in range(por_proyecto):
+            columnas[i % 4]["tareas"].append({
+                "tarea_id": str(uuid.uuid4()),
+                "titulo": f"Tarea {i}",
+                "descripcion": "",
+                "prioridad": prioridades[i % 4],
+                "asignado_a": f"usuario{i % 50}",
+                "estado": estados[i % 4],
+                "fecha_creacion": fecha,
+                "fecha_modificacion": fecha,
+                "fecha_vencimiento": None,
+                "etiquetas": ["backend"] if i % 5 == 0 else [],
+            })
+        datos.append({
+            "proyecto_id": str(uuid.uuid4()), "nombre": f"Proyecto {p}",
+            "descripcion": "", "propietario_id": None, "columnas": columnas,
+            "miembros": [], "fecha_creacion": fecha, "fecha_modificacion": fecha,
+            "version": 1,
+        })
+    # Ida y vuelta por JSON: cada cadena es un objeto distinto, como al cargar
+    return json.loads(json.dumps(datos))
+
+
+def objetos_por_segundo(modulo, datos: list, repeticiones: int = 3) -> float:
+    """Proyectos, columnas y tareas construidos por segundo (mejor intento)"""
+    objetos = sum(
+        1 + len(p["columnas"]) + sum(len(c["tareas"]) for c in p["columnas"])
+        for p in datos
+    )
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        cargados = [modulo.Proyecto.from_dict(p) for p in datos]
+        mejor = min(mejor, time.perf_counter() - inicio)
+        del cargados
+    return objetos / mejor
+
+
+def main():
+    tareas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    proyectos = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    revision = sys.argv[3] if len(sys.argv) > 3 else None
+    datos = generar_proyectos(tareas, proyectos)
+    print(f"{tareas} tareas en {proyectos} proyectos")
+    if revision:
+        anterior = cargar_modelos_de_revision(revision)
+        print(f"{revision:<12}{objetos_por_segundo(anterior, datos):>12,.0f} objetos/s")
+    print(f"{'actual':<12}{objetos_por_segundo(models, datos):>12,.0f} objetos/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark de memoria: bytes por tarea al cargar tareas con Tarea.from_dict
+
+Compara los modelos actuales con los de una revision anterior de git
+(por ejemplo la previa a __slots__) cargando el mismo conjunto de datos.
+
+Uso: python benchmarks/bench_memoria.py [tareas] [revision_git]
+"""
+
+import gc
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+import models
+
+
+def generar_tareas(cantidad: int) -> list:
+    """Diccionarios de tareas como los que produce la lectura de projects.json"""
+    estados = ("Pendiente", "En Progreso", "Completada", "Bloqueada")
+    prioridades = ("Baja", "Media", "Alta", "Urgente")
+    tareas = []
+    for i in range(cantidad):
+        tarea = models.Tarea(
+            f"Tarea {i}", "", prioridades[i % 4], f"usuario{i % 50}"
+        ).to_dict()
+        tarea["estado"] = estados[i % 4]
+        tarea["etiquetas"] = ["backend"] if i % 5 == 0 else []
+        tareas.append(tarea)
+    # Ida y vuelta por JSON: cada cadena es un objeto distinto, como al cargar
+    return json.loads(json.dumps(tareas))
+
+
+def cargar_modelos_de_revision(revision: str):
+    """Importa models.py tal como estaba en ``revision``"""
+    codigo = subprocess.run(
+        ["git", "show", f"{revision}:models.py"],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    ).stdout
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(codigo)
+    especificacion = importlib.util.spec_from_file_location("models_anterior", f.name)
+    modulo = importlib.util.module_from_spec(especificacion)
+    especificacion.loader.exec_module(modulo)
+    Path(f.name).unlink()
+    return modulo
+
+
+def bytes_por_tarea(modulo, datos: list) -> float:
+    """Memoria retenida por las tareas cargadas (sin contar los diccionarios)"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    tareas = [modulo.Tarea.from_dict(d) for d in datos]
+    usado = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del tareas
+    return usado / len(datos)
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    revision = sys.argv[2] if len(sys.argv) > 2 else None
+    datos = generar_tareas(cantidad)
+    print(f"{cantidad} tareas")
+    if revision:
+        anterior = cargar_modelos_de_revision(revision)
+        print(f"{revision:<12}{bytes_por_tarea(anterior, datos):>10.0f} bytes/tarea")
+    print(f"{'actual':<12}{bytes_por_tarea(models, datos):>10.0f} bytes/tarea")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark de serializacion: tamano en disco y latencia de guardado/carga
+del archivo de datos en formato JSON frente al formato binario.
+
+Uso: python benchmarks/bench_serializacion.py [proyectos] [tareas_por_proyecto]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from models import Proyecto, Tarea
+from storage import StorageManager
+
+
+def generar_datos(num_proyectos: int, tareas_por_proyecto: int) -> dict:
+    """Genera un documento con proyectos de tres columnas y tareas etiquetadas"""
+    proyectos = []
+    for p in range(num_proyectos):
+        proyecto = Proyecto(f"Proyecto {p}", "Proyecto de prueba")
+        columnas = [proyecto.agregar_columna(n) for n in ("Pendiente", "En Progreso", "Completada")]
+        for t in range(tareas_por_proyecto):
+            tarea = Tarea(
+                f"Tarea {t}", f"Descripcion de la tarea {t}", "Alta", f"usuario{t % 10}"
+            )
+            tarea.agregar_etiqueta("backend")
+            columnas[t % 3].agregar_tarea(tarea)
+        proyectos.append(proyecto.to_dict())
+    return {"proyectos": proyectos, "usuarios": []}
+
+
+def medir(formato: str, datos: dict, directorio: Path, repeticiones: int = 3):
+    """Retorna (bytes, segundos de guardado, segundos de carga) del mejor intento"""
+    ruta = directorio / f"projects.{formato}"
+    sm = StorageManager(ruta, formato=formato)
+    guardado = carga = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        sm.guardar_datos(datos)
+        guardado = min(guardado, time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        sm.cargar_datos()
+        carga = min(carga, time.perf_counter() - inicio)
+    return ruta.stat().st_size, guardado, carga
+
+
+def main():
+    num_proyectos = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    tareas = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    datos = generar_datos(num_proyectos, tareas)
+    print(f"{num_proyectos} proyectos x {tareas} tareas")
+    print(f"{'formato':<10}{'tamano (KB)':>14}{'guardar (ms)':>15}{'cargar (ms)':>14}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato in ("json", "binario"):
+            tamano, guardado, carga = medir(formato, datos, Path(directorio))
+            print(f"{formato:<10}{tamano / 1024:>14.1f}{guardado * 1000:>15.1f}{carga * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""
+Indice invertido para buscar tareas de un proyecto
+Encuentra por subcadena en titulo y descripcion sin recorrer todas las tareas,
+ordena los resultados por relevancia y filtra por etiquetas
+"""
+
+import base64
+import heapq
+import json
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from models import Columna, Proyecto, Tarea
+
+# En una consulta, las palabras que empiezan asi filtran por etiqueta
+PREFIJO_ETIQUETA = "#"
+FORMATO_INDICE = 1
+
+Resultado = Tuple[Columna, Tarea]
+
+
+def _terminos(
+    tarea: Tarea, titulo: Optional[str] = None, descripcion: Optional[str] = None
+) -> Set[str]:
+    """Palabras en minusculas del titulo y la descripcion (o de los textos indicados)"""
+    titulo = tarea.titulo if titulo is None else titulo
+    descripcion = tarea.descripcion if descripcion is None else descripcion
+    return set(f"{titulo}\n{descripcion or ''}".lower().split())
+
+
+def _trigramas(termino: str) -> Set[str]:
+    return {termino[i:i + 3] for i in range(len(termino) - 2)}
+
+
+# Con menos candidatos que este umbral, las demas palabras de la consulta se
+# comprueban en su texto en lugar de reunir las tareas de cada palabra
+_FILTRAR_HASTA = 2000
+
+
+def _codificar(ordinales: Iterable[int]) -> str:
+    """Lista de ordinales como enteros de 32 bits little-endian en base64"""
+    arreglo = array("I", sorted(ordinales))
+    if sys.byteorder != "little":
+        arreglo.byteswap()
+    return base64.b64encode(arreglo.tobytes()).decode("ascii")
+
+
+def _decodificar(texto: str) -> Set[int]:
+    arreglo = array("I", base64.b64decode(texto))
+    if sys.byteorder != "little":
+        arreglo.byteswap()
+    return set(arreglo)
+
+
+class IndiceBusqueda:
+    """Indice invertido de las tareas de un proyecto
+
+    - ``_tareas_por_termino``: palabra (separada por espacios, en minusculas)
+      del titulo o la descripcion -> ordinales de las tareas que la contienen
+    - ``_terminos_por_trigrama``: trigrama -> palabras del vocabulario que lo
+      contienen, para localizar subcadenas sin recorrer el vocabulario (se
+      construye con la primera consulta que lo necesita)
+    - ``_tareas_por_etiqueta``: etiqueta en minusculas -> ordinales
+
+    Cada palabra de una consulta es subcadena de alguna palabra de la tarea
+    que la contiene, asi que se buscan las palabras del vocabulario que la
+    contienen (intersecando sus trigramas; las de menos de tres letras
+    recorren el vocabulario) y se intersecan sus tareas. Los candidatos se
+    comprueban con la consulta completa, de modo que el resultado es el mismo
+    que comparar ``consulta in titulo.lower()`` tarea por tarea.
+
+    Se mantiene al dia con las operaciones del proyecto (``aplicar_operacion``)
+    y se puede guardar y cargar (``guardar``/``cargar``) para no reconstruirlo
+    al arrancar: al cargarlo, los ordinales de cada palabra siguen codificados
+    hasta que una consulta o una operacion los necesita.
+    """
+
+    def __init__(self, proyecto: Optional[Proyecto] = None):
+        # Tarea de cada ordinal (None si se elimino) y ordinal de cada ID
+        self._tareas: List[Optional[Tarea]] = []
+        self._ordinales: Dict[str, int] = {}
+        self._tareas_por_termino: Dict[str, Union[Set[int], str]] = {}
+        self._terminos_por_trigrama: Optional[Dict[str, Set[str]]] = None
+        self._tareas_por_etiqueta: Dict[str, Set[int]] = {}
+        if proyecto is not None:
+            for columna in proyecto.columnas:
+                for tarea in columna.tareas:
+                    self._agregar(tarea)
+
+    def __len__(self) -> int:
+        return len(self._ordinales)
+
+    # Mantenimiento
+
+    def _tareas_del_termino(self, termino: str) -> Set[int]:
+        """Ordinales de una palabra del vocabulario (los decodifica si hace falta)"""
+        tareas = self._tareas_por_termino[termino]
+        if type(tareas) is str:
+            tareas = self._tareas_por_termino[termino] = _decodificar(tareas)
+        return tareas
+
+    def _trigramas_del_vocabulario(self) -> Dict[str, Set[str]]:
+        if self._terminos_por_trigrama is None:
+            trigramas: Dict[str, Set[str]] = {}
+            for termino in self._tareas_por_termino:
+                for trigrama in _trigramas(termino):
+                    trigramas.setdefault(trigrama, set()).add(termino)
+            self._terminos_por_trigrama = trigramas
+        return self._terminos_por_trigrama
+
+    def _indexar_termino(self, termino: str, ordinal: int):
+        if termino not in self._tareas_por_termino:
+            self._tareas_por_termino[termino] = {ordinal}
+            if self._terminos_por_trigrama is not None:
+                for trigrama in _trigramas(termino):
+                    self._terminos_por_trigrama.setdefault(trigrama, set()).add(termino)
+        else:
+            self._tareas_del_termino(termino).add(ordinal)
+
+    def _desindexar_termino(self, termino: str, ordinal: int):
+        if termino not in self._tareas_por_termino:
+            return
+        tareas = self._tareas_del_termino(termino)
+        tareas.discard(ordinal)
+        if not tareas:
+            del self._tareas_por_termino[termino]
+            if self._terminos_por_trigrama is not None:
+                for trigrama in _trigramas(termino):
+                    terminos = self._terminos_por_trigrama[trigrama]
+                    terminos.discard(termino)
+                    if not terminos:
+                        del self._terminos_por_trigrama[trigrama]
+
+    def _agregar(self, tarea: Tarea):
+        if tarea.tarea_id in self._ordinales:
+            self._quitar(tarea.tarea_id)
+        ordinal = len(self._tareas)
+        self._tareas.append(tarea)
+        self._ordinales[tarea.tarea_id] = ordinal
+        for termino in _terminos(tarea):
+            self._indexar_termino(termino, ordinal)
+        for etiqueta in tarea._etiquetas or ():
+            self._tareas_por_etiqueta.setdefault(etiqueta.lower(), set()).add(ordinal)
+
+    def _quitar(self, tarea_id: str):
+        ordinal = self._ordinales.pop(tarea_id, None)
+        if ordinal is None:
+            return
+        tarea = self._tareas[ordinal]
+        self._tareas[ordinal] = None
+        for termino in _terminos(tarea):
+            self._desindexar_termino(termino, ordinal)
+        for etiqueta in tarea._etiquetas or ():
+            self._quitar_etiqueta(etiqueta.lower(), ordinal)
+
+    def _quitar_etiqueta(self, etiqueta: str, ordinal: int):
+        tareas = self._tareas_por_etiqueta.get(etiqueta)
+        if tareas is not None:
+            tareas.discard(ordinal)
+            if not tareas:
+                del self._tareas_por_etiqueta[etiqueta]
+
+    def _actualizar_texto(self, tarea_id: str, anterior: Dict):
+        ordinal = self._ordinales.get(tarea_id)
+        if ordinal is None:
+            return
+        tarea = self._tareas[ordinal]
+        antes = _terminos(tarea, anterior.get("titulo"), anterior.get("descripcion"))
+        despues = _terminos(tarea)
+        for termino in antes - despues:
+            self._desindexar_termino(termino, ordinal)
+        for termino in despues - antes:
+            self._indexar_termino(termino, ordinal)
+
+    def aplicar_operacion(self, proyecto: Proyecto, operacion: Dict) -> bool:
+        """Actualiza el indice con una operacion ya aplicada al proyecto
+
+        Retorna False si no puede hacerlo (el indice debe reconstruirse).
+        """
+        op = operacion["op"]
+        if op == "agregar_tarea":
+            ubicacion = proyecto.localizar_tarea(operacion["tarea"]["tarea_id"])
+            if ubicacion is not None:
+                self._agregar(ubicacion[1])
+        elif op == "eliminar_tarea":
+            self._quitar(operacion["tarea_id"])
+        elif op == "actualizar_tarea":
+            campos = operacion["campos"]
+            if "titulo" in campos or "descripcion" in campos:
+                self._actualizar_texto(operacion["tarea_id"], operacion["anterior"])
+        elif op == "agregar_etiqueta":
+            ordinal = self._ordinales.get(operacion["tarea_id"])
+            if ordinal is not None:
+                etiqueta = operacion["etiqueta"].lower()
+                self._tareas_por_etiqueta.setdefault(etiqueta, set()).add(ordinal)
+        elif op == "eliminar_etiqueta":
+            ordinal = self._ordinales.get(operacion["tarea_id"])
+            if ordinal is not None:
+                etiqueta = operacion["etiqueta"].lower()
+                restantes = self._tareas[ordinal]._etiquetas or ()
+                if all(e.lower() != etiqueta for e in restantes):
+                    self._quitar_etiqueta(etiqueta, ordinal)
+        elif op == "eliminar_columna":
+            return False
+        return True
+
+    # Consultas
+
+    def _terminos_con(self, pieza: str) -> List[str]:
+        """Palabras del vocabulario que contienen ``pieza``"""
+        if len(pieza) >= 3:
+            trigramas = self._trigramas_del_vocabulario()
+            conjuntos = sorted((trigramas.get(t, ()) for t in _trigramas(pieza)), key=len)
+            terminos = set(conjuntos[0]).intersection(*conjuntos[1:])
+        else:
+            terminos = self._tareas_por_termino
+        return [termino for termino in terminos if pieza in termino]
+
+    def _estimar(self, terminos: List[str]) -> int:
+        """Tareas que suman las palabras (sin decodificar: 4 bytes por ordinal)"""
+        total = 0
+        for termino in terminos:
+            tareas = self._tareas_por_termino[termino]
+            total += len(tareas) * 3 // 16 if type(tareas) is str else len(tareas)
+        return total
+
+    def _tareas_con(self, terminos: List[str]) -> Set[int]:
+        """Ordinales de las tareas con alguna de las palabras (no modificar)"""
+        if len(terminos) == 1:
+            return self._tareas_del_termino(terminos[0])
+        tareas: Set[int] = set()
+        for termino in terminos:
+            tareas |= self._tareas_del_termino(termino)
+        return tareas
+
+    def _candidatos(self, piezas: List[str], etiquetas: List[str]) -> Set[int]:
+        """Tareas con todas las etiquetas y una palabra que contiene cada pieza"""
+        candidatos: Optional[Set[int]] = None
+        for etiqueta in etiquetas:
+            tareas = self._tareas_por_etiqueta.get(etiqueta, set())
+            candidatos = tareas if candidatos is None else candidatos & tareas
+            if not candidatos:
+                return set()
+        # Primero las piezas mas selectivas; las de menos de tres letras (que
+        # recorren el vocabulario) al final. Con pocos candidatos, el resto de
+        # piezas se comprueba en el texto de cada uno
+        largas = sorted(
+            ((self._terminos_con(pieza), pieza) for pieza in piezas if len(pieza) >= 3),
+            key=lambda par: self._estimar(par[0]),
+        )
+        cortas = [(None, pieza) for pieza in piezas if len(pieza) < 3]
+        tareas = self._tareas
+        for terminos, pieza in largas + cortas:
+            if candidatos is not None and len(candidatos) <= _FILTRAR_HASTA:
+                candidatos = {
+                    o for o in candidatos
+                    if pieza in tareas[o].titulo.lower()
+                    or pieza in (tareas[o].descripcion or "").lower()
+                }
+            else:
+                encontradas = self._tareas_con(
+                    terminos if terminos is not None else self._terminos_con(pieza)
+                )
+                candidatos = encontradas if candidatos is None else candidatos & encontradas
+            if not candidatos:
+                return set()
+        return candidatos or set()
+
+    @staticmethod
+    def _puntuar(titulo: str, frase: str, prefijos: List[Tuple[str, str]]) -> int:
+        """Relevancia: coincidencias en el titulo (entero, al inicio, dentro) y
+        palabras del titulo que empiezan por cada pieza (``(pieza, " " + pieza)``)"""
+        puntos = 0
+        if frase and frase in titulo:
+            if titulo == frase:
+                puntos += 8
+            elif titulo.startswith(frase):
+                puntos += 4
+            else:
+                puntos += 2
+        for pieza, tras_espacio in prefijos:
+            if titulo.startswith(pieza) or tras_espacio in titulo:
+                puntos += 1
+        return puntos
+
+    def buscar(
+        self, proyecto: Proyecto, consulta: str, limite: Optional[int] = None
+    ) -> List[Resultado]:
+        """Tareas cuyo titulo o descripcion contiene la consulta, por relevancia
+
+        Las palabras ``#etiqueta`` de la consulta no se buscan en el texto:
+        exigen que la tarea tenga esas etiquetas. A igual relevancia se
+        conserva el orden en que se indexaron las tareas (el del tablero al
+        construir el indice). Con ``limite`` solo se ordenan los mejores.
+        """
+        etiquetas, piezas = [], []
+        for palabra in consulta.lower().split():
+            if palabra.startswith(PREFIJO_ETIQUETA) and len(palabra) > len(PREFIJO_ETIQUETA):
+                etiquetas.append(palabra[len(PREFIJO_ETIQUETA):])
+            else:
+                piezas.append(palabra)
+        frase = " ".join(piezas) if etiquetas else consulta.strip().lower()
+        if not piezas and not etiquetas:
+            return []
+        # Una sola palabra ya esta en el titulo o la descripcion de cada candidato
+        comprobar = len(piezas) > 1 or (piezas and frase != piezas[0])
+
+        prefijos = [(pieza, " " + pieza) for pieza in piezas]
+        puntuadas, sin_puntos = [], []
+        tareas = self._tareas
+        for ordinal in self._candidatos(piezas, etiquetas):
+            tarea = tareas[ordinal]
+            titulo = tarea.titulo.lower()
+            if comprobar and frase not in titulo and frase not in (tarea.descripcion or "").lower():
+                continue
+            puntos = self._puntuar(titulo, frase, prefijos)
+            if puntos:
+                puntuadas.append((-puntos, ordinal))
+            else:
+                sin_puntos.append(ordinal)
+        if limite is None:
+            ordinales = [o for _, o in sorted(puntuadas)] + sorted(sin_puntos)
+        else:
+            ordinales = [o for _, o in heapq.nsmallest(limite, puntuadas)]
+            ordinales += heapq.nsmallest(limite - len(ordinales), sin_puntos)
+        resultados = []
+        for ordinal in ordinales:
+            ubicacion = proyecto.localizar_tarea(tareas[ordinal].tarea_id)
+            if ubicacion is not None:
+                resultados.append(ubicacion)
+        return resultados
+
+    # Persistencia
+
+    def to_dict(self, version: int) -> dict:
+        """Convierte el indice a diccionario, ligado a la ``version`` del proyecto
+
+        Los ordinales se compactan (se omiten las tareas eliminadas) y los de
+        cada palabra se guardan codificados (ver ``_codificar``).
+        """
+        nuevos = {}
+        ids = []
+        for ordinal, tarea in enumerate(self._tareas):
+            if tarea is not None:
+                nuevos[ordinal] = len(ids)
+                ids.append(tarea.tarea_id)
+        compactos = len(ids) == len(self._tareas)
+        terminos = {}
+        for termino, tareas in self._tareas_por_termino.items():
+            if type(tareas) is str and compactos:
+                terminos[termino] = tareas
+            else:
+                tareas = self._tareas_del_termino(termino)
+                terminos[termino] = _codificar(
+                    tareas if compactos else (nuevos[o] for o in tareas)
+                )
+        return {
+            "formato": FORMATO_INDICE,
+            "version": version,
+            "tareas": ids,
+            "terminos": terminos,
+            "etiquetas": {
+                etiqueta: sorted(nuevos[o] for o in tareas)
+                for etiqueta, tareas in self._tareas_por_etiqueta.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, proyecto: Proyecto, data: dict) -> Optional["IndiceBusqueda"]:
+        """Reconstruye el indice de ``proyecto`` desde diccionario
+
+        Retorna None si no corresponde al proyecto tal como esta en memoria
+        (otra version, cambios sin guardar o tareas que no coinciden).
+        """
+        if (
+            data.get("formato") != FORMATO_INDICE
+            or data.get("version") != proyecto.version
+            or proyecto.operaciones_pendientes()
+            or len(data["tareas"]) != proyecto.contar_tareas()
+        ):
+            return None
+        indice = cls()
+        for tarea_id in data["tareas"]:
+            ubicacion = proyecto.localizar_tarea(tarea_id)
+            if ubicacion is None:
+                return None
+            indice._ordinales[tarea_id] = len(indice._tareas)
+            indice._tareas.append(ubicacion[1])
+        indice._tareas_por_termino = dict(data["terminos"])
+        indice._tareas_por_etiqueta = {e: set(o) for e, o in data["etiquetas"].items()}
+        return indice
+
+    def guardar(self, ruta: Path, version: int) -> bool:
+        """Escribe el indice en ``ruta`` (archivo derivado: sin fsync)"""
+        from storage import escribir_atomico
+
+        datos = self.to_dict(version)
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            escribir_atomico(
+                ruta,
+                lambda f: json.dump(datos, f, ensure_ascii=False, separators=(",", ":")),
+                duradero=False,
+            )
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error al guardar el indice de busqueda: {e}")
+            return False
+
+    @classmethod
+    def cargar(cls, proyecto: Proyecto, ruta: Path) -> Optional["IndiceBusqueda"]:
+        """Lee el indice guardado en ``ruta`` si sigue vigente para ``proyecto``"""
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return cls.from_dict(proyecto, json.load(f))
+        except (json.JSONDecodeError, IOError, KeyError, TypeError):
+            return None
+
+
+def _ruta_indice(directorio: Path, proyecto: Proyecto) -> Path:
+    return directorio / f"{proyecto.proyecto_id}.busqueda.json"
+
+
+def indice_busqueda(proyecto: Proyecto, directorio: Optional[Path] = None) -> IndiceBusqueda:
+    """Indice de busqueda del proyecto, mantenido con sus operaciones
+
+    Con ``directorio``, la primera vez se intenta cargar el indice guardado
+    alli y, si no sirve, se construye y se guarda.
+    """
+
+    def construir(proyecto: Proyecto) -> IndiceBusqueda:
+        if directorio is None:
+            return IndiceBusqueda(proyecto)
+        ruta = _ruta_indice(directorio, proyecto)
+        indice = IndiceBusqueda.cargar(proyecto, ruta)
+        if indice is None:
+            indice = IndiceBusqueda(proyecto)
+            if not proyecto.operaciones_pendientes():
+                indice.guardar(ruta, proyecto.version)
+        return indice
+
+    return proyecto.derivado("busqueda", construir)
+
+
+def guardar_indice_busqueda(proyecto: Proyecto, directorio: Path) -> bool:
+    """Guarda el indice del proyecto si no hay cambios sin guardar"""
+    if proyecto.operaciones_pendientes():
+        return False
+    return indice_busqueda(proyecto, directorio).guardar(
+        _ruta_indice(directorio, proyecto), proyecto.version
+    )
+
+
+def buscar_tareas(
+    proyecto: Proyecto,
+    consulta: str,
+    limite: Optional[int] = None,
+    directorio: Optional[Path] = None,
+) -> List[Resultado]:
+    """Busca tareas del proyecto con su indice (ver ``IndiceBusqueda.buscar``)"""
+    return indice_busqueda(proyecto, directorio).buscar(proyecto, consulta, limite)
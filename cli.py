@@ -3,9 +3,10 @@ Interfaz de linea de comandos interactiva
 Proporciona menus y opciones para gestionar proyectos y tareas
 """
 
+from __future__ import annotations
+
 import os
 import sys
-from typing import Optional
 
 from config import (
     print_header,
@@ -19,17 +20,43 @@ from config import (
     TASK_STATUS_BLOCKED,
     PRIORITIES,
 )
-from models import Proyecto, Usuario, Columna, Tarea
-from storage import StorageManager
+
+# Los modelos y la persistencia se importan al usarse por primera vez, para que
+# el menu principal aparezca sin cargarlos (TYPE_CHECKING evita importar typing)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from models import Columna, Proyecto, Tarea, Usuario
 
 
 class CliInterface:
     """Interfaz de linea de comandos para gestionar proyectos"""
 
     def __init__(self):
-        self.storage = StorageManager()
+        self._storage = None
         self.usuario_actual: Optional[Usuario] = None
         self.proyecto_actual: Optional[Proyecto] = None
+        # Si se busco en el proyecto actual, su indice se guarda al salir de el
+        self._busqueda_usada = False
+
+    @property
+    def storage(self):
+        """Gestor de persistencia, creado en el primer acceso"""
+        if self._storage is None:
+            from storage import crear_storage
+
+            self._storage = crear_storage()
+        return self._storage
+
+    @storage.setter
+    def storage(self, storage):
+        self._storage = storage
+
+    def cerrar(self):
+        """Vuelca los cambios pendientes si la persistencia llego a usarse"""
+        if self._storage is not None:
+            self._storage.sincronizar()
 
     def limpiar_pantalla(self):
         """Limpia la pantalla de la terminal"""
@@ -94,6 +121,8 @@ class CliInterface:
             print_error("Email invalido")
             return
 
+        from models import Usuario
+
         usuario = Usuario(nombre, email)
         if self.storage.guardar_usuario(usuario):
             print_success(f"Usuario '{nombre}' creado exitosamente")
@@ -201,8 +230,9 @@ class CliInterface:
             print("3. Abrir proyecto")
             print("4. Eliminar proyecto")
             print("5. Volver al menu principal")
+            print("c. Consultar tareas de todos los proyectos")
             print()
-            opcion = input("Seleccione una opcion (1-5): ").strip()
+            opcion = input("Seleccione una opcion (1-5, c): ").strip().lower()
 
             if opcion == "1":
                 self.crear_proyecto()
@@ -212,6 +242,8 @@ class CliInterface:
                 self.abrir_proyecto()
             elif opcion == "4":
                 self.eliminar_proyecto()
+            elif opcion == "c":
+                self.consultar_tareas()
             elif opcion == "5":
                 continue
             else:
@@ -230,6 +262,8 @@ class CliInterface:
         descripcion = input("Descripcion del proyecto (opcional): ").strip()
 
         propietario_id = self.usuario_actual.usuario_id if self.usuario_actual else None
+        from models import Proyecto
+
         proyecto = Proyecto(nombre, descripcion, propietario_id)
 
         # Agregar columnas por defecto
@@ -246,34 +280,34 @@ class CliInterface:
 
     def listar_proyectos(self):
         """Lista todos los proyectos"""
-        proyectos = self.storage.cargar_todos_proyectos()
+        resumenes = self.storage.listar_resumenes_proyectos()
 
-        if not proyectos:
+        if not resumenes:
             print_warning("No hay proyectos registrados")
         else:
             print()
             print_header("PROYECTOS DISPONIBLES")
             print("-" * 80)
-            for i, proyecto in enumerate(proyectos, 1):
-                tareas = proyecto.contar_tareas()
-                columnas = len(proyecto.columnas)
+            for i, resumen in enumerate(resumenes, 1):
                 marcado = (
                     " *"
                     if self.proyecto_actual
-                    and proyecto.proyecto_id == self.proyecto_actual.proyecto_id
+                    and resumen["proyecto_id"] == self.proyecto_actual.proyecto_id
                     else ""
                 )
+                completadas = resumen.get("por_estado", {}).get(TASK_STATUS_COMPLETED, 0)
                 print(
-                    f"{i}. {proyecto.nombre:<25} | {tareas} tareas | {columnas} columnas {marcado}"
+                    f"{i}. {resumen['nombre']:<25} | {resumen['total_tareas']} tareas "
+                    f"({completadas} completadas) | {resumen['total_columnas']} columnas {marcado}"
                 )
 
         input("Presione Enter para continuar...")
 
     def abrir_proyecto(self):
         """Abre un proyecto para trabajar con el"""
-        proyectos = self.storage.cargar_todos_proyectos()
+        resumenes = self.storage.listar_resumenes_proyectos()
 
-        if not proyectos:
+        if not resumenes:
             print_warning("No hay proyectos disponibles")
             input("Presione Enter para continuar...")
             return
@@ -281,15 +315,22 @@ class CliInterface:
         print()
         print_header("SELECCIONAR PROYECTO")
         print("-" * 40)
-        for i, proyecto in enumerate(proyectos, 1):
-            print(f"{i}. {proyecto.nombre}")
+        for i, resumen in enumerate(resumenes, 1):
+            print(f"{i}. {resumen['nombre']}")
 
         print()
         try:
             opcion = int(input("Seleccione el proyecto: ").strip())
-            if 1 <= opcion <= len(proyectos):
-                self.proyecto_actual = proyectos[opcion - 1]
-                print_success(f"Proyecto actual: {self.proyecto_actual.nombre}")
+            if 1 <= opcion <= len(resumenes):
+                # Solo el proyecto elegido se carga completo
+                proyecto = self.storage.cargar_proyecto(
+                    resumenes[opcion - 1]["proyecto_id"]
+                )
+                if proyecto:
+                    self.proyecto_actual = proyecto
+                    print_success(f"Proyecto actual: {self.proyecto_actual.nombre}")
+                else:
+                    print_error("El proyecto ya no existe")
             else:
                 print_error("Opcion no valida")
         except ValueError:
@@ -297,11 +338,94 @@ class CliInterface:
 
         input("Presione Enter para continuar...")
 
+    @staticmethod
+    def _elegir_varios(titulo: str, opciones: list) -> list:
+        """Pide numeros separados por comas; vacio = ninguno"""
+        print(f"{titulo}:")
+        for i, valor in enumerate(opciones, 1):
+            print(f"{i}. {valor}")
+        elegidos = []
+        for parte in input("Seleccione (ej. 1,3; Enter para todos): ").split(","):
+            parte = parte.strip()
+            if parte.isdigit() and 1 <= int(parte) <= len(opciones):
+                elegidos.append(opciones[int(parte) - 1])
+        return elegidos
+
+    def consultar_tareas(self):
+        """Consulta tareas de todos los proyectos por estado, prioridad,
+        asignado, etiquetas, vencimiento y texto, mostrando paginas de resultados"""
+        from datetime import date
+
+        from consultas import ConsultaTareas, MotorConsultas
+
+        print()
+        print_header("CONSULTAR TAREAS")
+        estados = self._elegir_varios(
+            "Estados",
+            [
+                TASK_STATUS_PENDING,
+                TASK_STATUS_IN_PROGRESS,
+                TASK_STATUS_COMPLETED,
+                TASK_STATUS_BLOCKED,
+            ],
+        )
+        prioridades = self._elegir_varios("Prioridades", list(PRIORITIES))
+        asignado = input("Asignado a (Enter para todos, - para sin asignar): ").strip()
+        etiquetas = input("Etiquetas separadas por comas (todas deben estar): ").split(",")
+        fechas = []
+        for limite in ("desde", "hasta"):
+            texto = input(f"Vence {limite} (AAAA-MM-DD, Enter para no filtrar): ").strip()
+            try:
+                fechas.append(date.fromisoformat(texto) if texto else None)
+            except ValueError:
+                print_error("Fecha no valida")
+                input("Presione Enter para continuar...")
+                return
+        consulta = ConsultaTareas(
+            estados=estados,
+            prioridades=prioridades,
+            asignados=[] if not asignado else ["" if asignado == "-" else asignado],
+            etiquetas=[e.strip() for e in etiquetas if e.strip()],
+            vence_desde=fechas[0],
+            vence_hasta=fechas[1],
+            texto=input("Texto en titulo o descripcion (Enter para no filtrar): "),
+        )
+
+        motor = MotorConsultas(self.storage)
+        numero = 1
+        while True:
+            resultados, hay_mas = motor.pagina(consulta, numero)
+            print()
+            if not resultados:
+                print_warning("No se encontraron tareas")
+                break
+            print_header(f"RESULTADOS (pagina {numero})")
+            print("-" * 60)
+            for i, (proyecto, columna, tarea) in enumerate(resultados, 1):
+                print(f"{i}. {tarea.titulo} ({proyecto.nombre} / {columna.nombre})")
+                print(
+                    f"   {tarea.estado} | Prioridad: {tarea.prioridad} | "
+                    f"Asignado: {tarea.asignado_a or 'Sin asignar'} | "
+                    f"Vence: {tarea.fecha_vencimiento or '-'}"
+                )
+            print()
+            siguiente = input(
+                "s = siguiente pagina, a = anterior, Enter para terminar: "
+            ).strip().lower()
+            if siguiente == "s" and hay_mas:
+                numero += 1
+            elif siguiente == "a" and numero > 1:
+                numero -= 1
+            elif siguiente not in ("s", "a"):
+                break
+
+        input("Presione Enter para continuar...")
+
     def eliminar_proyecto(self):
         """Elimina un proyecto"""
-        proyectos = self.storage.cargar_todos_proyectos()
+        resumenes = self.storage.listar_resumenes_proyectos()
 
-        if not proyectos:
+        if not resumenes:
             print_warning("No hay proyectos para eliminar")
             input("Presione Enter para continuar...")
             return
@@ -309,21 +433,22 @@ class CliInterface:
         print()
         print_header("ELIMINAR PROYECTO")
         print("-" * 40)
-        for i, proyecto in enumerate(proyectos, 1):
-            print(f"{i}. {proyecto.nombre}")
+        for i, resumen in enumerate(resumenes, 1):
+            print(f"{i}. {resumen['nombre']}")
 
         print()
         try:
             opcion = int(input("Seleccione el proyecto a eliminar: ").strip())
-            if 1 <= opcion <= len(proyectos):
-                proyecto = proyectos[opcion - 1]
-                confirmacion = input(f"Eliminar '{proyecto.nombre}'? (s/n): ").lower()
+            if 1 <= opcion <= len(resumenes):
+                resumen = resumenes[opcion - 1]
+                confirmacion = input(f"Eliminar '{resumen['nombre']}'? (s/n): ").lower()
                 if confirmacion == "s":
-                    if self.storage.eliminar_proyecto(proyecto.proyecto_id):
+                    if self.storage.eliminar_proyecto(resumen["proyecto_id"]):
                         print_success("Proyecto eliminado")
                         if (
                             self.proyecto_actual
-                            and self.proyecto_actual.proyecto_id == proyecto.proyecto_id
+                            and self.proyecto_actual.proyecto_id
+                            == resumen["proyecto_id"]
                         ):
                             self.proyecto_actual = None
                     else:
@@ -373,6 +498,17 @@ class CliInterface:
                 print_error("Opcion no valida")
                 input("Presione Enter para continuar...")
 
+        self._guardar_indice_busqueda()
+
+    def _guardar_indice_busqueda(self):
+        """Guarda el indice de busqueda del proyecto actual si se uso"""
+        directorio = getattr(self.storage, "directorio_indices", None)
+        if self._busqueda_usada and directorio is not None:
+            from busqueda import guardar_indice_busqueda
+
+            guardar_indice_busqueda(self.proyecto_actual, directorio)
+        self._busqueda_usada = False
+
     def ver_tablero(self):
         """Visualiza el tablero del proyecto"""
         self.limpiar_pantalla()
@@ -462,6 +598,8 @@ class CliInterface:
             input("Asignar a usuario (opcional, nombre o ID): ").strip() or None
         )
 
+        from models import Tarea
+
         tarea = Tarea(titulo, descripcion, prioridad, asignado_a)
         columna.agregar_tarea(tarea)
 
@@ -473,25 +611,25 @@ class CliInterface:
         input("Presione Enter para continuar...")
 
     def buscar_tarea(self):
-        """Busca una tarea por titulo"""
+        """Busca tareas por titulo o descripcion con el indice del proyecto"""
         print()
-        termino = (
-            input("Ingrese el titulo o parte de el para buscar: ").strip().lower()
-        )
+        termino = input(
+            "Ingrese el titulo o parte de el para buscar (#etiqueta para filtrar): "
+        ).strip()
 
         if not termino:
             print_error("El termino de busqueda no puede estar vacio")
             input("Presione Enter para continuar...")
             return
 
-        tareas_encontradas = []
-        for columna in self.proyecto_actual.columnas:
-            for tarea in columna.tareas:
-                if (
-                    termino in tarea.titulo.lower()
-                    or termino in tarea.descripcion.lower()
-                ):
-                    tareas_encontradas.append((columna, tarea))
+        from busqueda import buscar_tareas
+
+        tareas_encontradas = buscar_tareas(
+            self.proyecto_actual,
+            termino,
+            directorio=getattr(self.storage, "directorio_indices", None),
+        )
+        self._busqueda_usada = True
 
         print()
         if not tareas_encontradas:
@@ -537,6 +675,9 @@ class CliInterface:
             print("7. Agregar etiqueta")
             print("8. Ver detalles")
             print("9. Eliminar tarea")
+            print("s. Subir en la columna")
+            print("b. Bajar en la columna")
+            print("p. Cambiar posicion en la columna")
             print("0. Guardar y volver")
             print()
             opcion = input("Seleccione una opcion: ").strip()
@@ -586,10 +727,11 @@ class CliInterface:
                     op = int(input("Seleccione columna de destino: ").strip())
                     if 1 <= op <= len(columnas):
                         nueva_columna = columnas[op - 1]
-                        columna.eliminar_tarea(tarea.tarea_id)
-                        nueva_columna.agregar_tarea(tarea)
-                        columna = nueva_columna
-                        print_success("Tarea movida")
+                        if self.proyecto_actual.mover_tarea(
+                            tarea.tarea_id, nueva_columna.columna_id
+                        ):
+                            columna = nueva_columna
+                            print_success("Tarea movida")
                 except ValueError:
                     pass
             elif opcion == "7":
@@ -618,6 +760,24 @@ class CliInterface:
                     columna.eliminar_tarea(tarea.tarea_id)
                     print_success("Tarea eliminada")
                     continuar = False
+            elif opcion in ("s", "b"):
+                mover = columna.subir_tarea if opcion == "s" else columna.bajar_tarea
+                if mover(tarea.tarea_id):
+                    posicion = columna.posicion_tarea(tarea.tarea_id) + 1
+                    print_success(f"Tarea en la posicion {posicion}")
+                else:
+                    print_info("La tarea ya esta en el extremo de la columna")
+            elif opcion == "p":
+                total = columna.contar_tareas()
+                try:
+                    posicion = int(input(f"Nueva posicion (1-{total}): ").strip())
+                    if 1 <= posicion <= total:
+                        columna.reordenar_tarea(tarea.tarea_id, posicion - 1)
+                        print_success(f"Tarea en la posicion {posicion}")
+                    else:
+                        print_error("Posicion no valida")
+                except ValueError:
+                    print_error("Posicion no valida")
             elif opcion == "0":
                 self.storage.guardar_proyecto(self.proyecto_actual)
                 print_success("Cambios guardados")
@@ -658,7 +818,7 @@ class CliInterface:
                     if 1 <= op <= len(columnas):
                         nuevo_nombre = input("Nuevo nombre: ").strip()
                         if nuevo_nombre:
-                            columnas[op - 1].nombre = nuevo_nombre
+                            columnas[op - 1].renombrar(nuevo_nombre)
                             self.storage.guardar_proyecto(self.proyecto_actual)
                             print_success("Columna renombrada")
                     input("Presione Enter para continuar...")
@@ -687,53 +847,49 @@ class CliInterface:
         print_header(f"ESTADISTICAS: {self.proyecto_actual.nombre}")
         print()
 
-        todas_tareas = self.proyecto_actual.obtener_todas_las_tareas()
-        total_tareas = len(todas_tareas)
+        from utils import ProyectoAnalytics
+
+        estadisticas = ProyectoAnalytics.calcular_estadisticas(self.proyecto_actual)
+        total_tareas = estadisticas.total_tareas
 
         if total_tareas == 0:
             print_warning("No hay tareas en el proyecto")
             input("Presione Enter para continuar...")
             return
 
-        # Contar por estado
-        pendientes = sum(1 for t in todas_tareas if t.estado == TASK_STATUS_PENDING)
-        en_progreso = sum(
-            1 for t in todas_tareas if t.estado == TASK_STATUS_IN_PROGRESS
-        )
-        completadas = sum(1 for t in todas_tareas if t.estado == TASK_STATUS_COMPLETED)
-        bloqueadas = sum(1 for t in todas_tareas if t.estado == TASK_STATUS_BLOCKED)
-
-        # Contar por prioridad
-        urgentes = sum(1 for t in todas_tareas if t.prioridad == "Urgente")
-        altas = sum(1 for t in todas_tareas if t.prioridad == "Alta")
-        medias = sum(1 for t in todas_tareas if t.prioridad == "Media")
-        bajas = sum(1 for t in todas_tareas if t.prioridad == "Baja")
-
-        # Tareas asignadas
-        asignadas = sum(1 for t in todas_tareas if t.asignado_a)
-        sin_asignar = total_tareas - asignadas
+        por_estado = estadisticas.por_estado
+        por_prioridad = estadisticas.por_prioridad
+        porcentaje = estadisticas.porcentaje
 
         print_info(f"Total de tareas: {total_tareas}")
         print()
         print_header("POR ESTADO:")
-        print(f"  Pendiente: {pendientes} ({pendientes*100//total_tareas}%)")
-        print(f"  En Progreso: {en_progreso} ({en_progreso*100//total_tareas}%)")
-        print(f"  Completada: {completadas} ({completadas*100//total_tareas}%)")
-        print(f"  Bloqueada: {bloqueadas} ({bloqueadas*100//total_tareas}%)")
+        for estado in (
+            TASK_STATUS_PENDING,
+            TASK_STATUS_IN_PROGRESS,
+            TASK_STATUS_COMPLETED,
+            TASK_STATUS_BLOCKED,
+        ):
+            print(f"  {estado}: {por_estado[estado]} ({porcentaje(por_estado[estado])}%)")
         print()
         print_header("POR PRIORIDAD:")
-        print(f"  Urgente: {urgentes} ({urgentes*100//total_tareas}%)")
-        print(f"  Alta: {altas} ({altas*100//total_tareas}%)")
-        print(f"  Media: {medias} ({medias*100//total_tareas}%)")
-        print(f"  Baja: {bajas} ({bajas*100//total_tareas}%)")
+        for prioridad in reversed(PRIORITIES):
+            cantidad = por_prioridad[prioridad]
+            print(f"  {prioridad}: {cantidad} ({porcentaje(cantidad)}%)")
         print()
         print_header("ASIGNACION:")
-        print(f"  Asignadas: {asignadas} ({asignadas*100//total_tareas}%)")
-        print(f"  Sin asignar: {sin_asignar} ({sin_asignar*100//total_tareas}%)")
+        asignadas, sin_asignar = estadisticas.asignadas, estadisticas.sin_asignar
+        print(f"  Asignadas: {asignadas} ({porcentaje(asignadas)}%)")
+        print(f"  Sin asignar: {sin_asignar} ({porcentaje(sin_asignar)}%)")
         print()
         print_header("POR COLUMNA:")
-        for columna in self.proyecto_actual.listar_columnas():
-            print(f"  {columna.nombre}: {columna.contar_tareas()} tareas")
+        for columna, cantidad in estadisticas.por_columna:
+            print(f"  {columna.nombre}: {cantidad} tareas")
+        if estadisticas.por_etiqueta:
+            print()
+            print_header("POR ETIQUETA:")
+            for etiqueta, cantidad in estadisticas.por_etiqueta.items():
+                print(f"  {etiqueta}: {cantidad} tareas")
 
         input("Presione Enter para continuar...")
 
@@ -750,6 +906,7 @@ class CliInterface:
             elif opcion == "3":
                 self.mostrar_menu_proyecto_actual()
             elif opcion == "4":
+                self.cerrar()
                 self.limpiar_pantalla()
                 print_success("Hasta luego!")
             else:
@@ -0,0 +1,183 @@
+"""
+Representacion columnar de las tareas de un proyecto para analitica
+Arreglos paralelos (NumPy si esta instalado, si no array.array) con los
+codigos de estado, prioridad, asignado y columna y las fechas como epoch
+
+API opcional para scripts y analisis externos: la aplicacion no la usa (las
+estadisticas salen de ContadoresProyecto y los vencimientos de
+vencimientos.py), asi que solo se construye si alguien llama a vista_columnar.
+"""
+
+from array import array
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from config import PRIORITIES, TASK_STATUS_COMPLETED, TASK_STATUSES
+from models import SIN_FECHA, Proyecto, Tarea, epoch
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+class _Categorias:
+    """Codifica valores repetidos como enteros pequenos, en orden de aparicion"""
+
+    def __init__(self, iniciales: Iterable = ()):
+        self.valores: List = []
+        self._codigos: Dict = {}
+        for valor in iniciales:
+            self.codigo(valor)
+
+    def codigo(self, valor) -> int:
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def buscar(self, valor) -> int:
+        """Codigo de ``valor`` o -1 si no aparece en ninguna tarea"""
+        return self._codigos.get(valor, -1)
+
+
+class TareasColumnares:
+    """Tareas de un proyecto como arreglos paralelos (una posicion por tarea)
+
+    - ``estados``, ``prioridades``, ``asignados``: codigos de categoria (ver
+      ``valores_estado``, ``valores_prioridad``, ``valores_asignado``; un
+      asignado vacio se codifica como None)
+    - ``columnas``: posicion de la columna en ``proyecto.columnas``
+    - ``creacion``, ``vencimiento``: segundos desde 1970 (``SIN_FECHA`` si falta)
+
+    ``tareas`` conserva los objetos en el mismo orden para traducir posiciones.
+    Con NumPy los arreglos son ``ndarray`` y las operaciones se vectorizan; sin
+    NumPy son ``array.array`` y se recorren en Python.
+    """
+
+    def __init__(self, proyecto: Proyecto):
+        self.tareas: List[Tarea] = []
+        self.columna_ids: List[str] = [c.columna_id for c in proyecto.columnas]
+        estados = _Categorias(TASK_STATUSES)
+        prioridades = _Categorias(PRIORITIES)
+        asignados = _Categorias()
+        codigos_estado, codigos_prioridad, codigos_asignado = [], [], []
+        codigos_columna, creacion, vencimiento = [], [], []
+
+        for posicion, columna in enumerate(proyecto.columnas):
+            for tarea in columna.tareas:
+                self.tareas.append(tarea)
+                codigos_estado.append(estados.codigo(tarea.estado))
+                codigos_prioridad.append(prioridades.codigo(tarea.prioridad))
+                codigos_asignado.append(asignados.codigo(tarea.asignado_a or None))
+                codigos_columna.append(posicion)
+                creacion.append(epoch(tarea.momento_creacion))
+                vencimiento.append(
+                    epoch(tarea.fecha_vencimiento) if tarea.fecha_vencimiento else SIN_FECHA
+                )
+
+        self.valores_estado, self._estados = estados.valores, estados
+        self.valores_prioridad, self._prioridades = prioridades.valores, prioridades
+        self.valores_asignado, self._asignados = asignados.valores, asignados
+        self.estados = self._arreglo("i", codigos_estado)
+        self.prioridades = self._arreglo("i", codigos_prioridad)
+        self.asignados = self._arreglo("i", codigos_asignado)
+        self.columnas = self._arreglo("i", codigos_columna)
+        self.creacion = self._arreglo("q", creacion)
+        self.vencimiento = self._arreglo("q", vencimiento)
+
+    @staticmethod
+    def _arreglo(tipo: str, valores: List[int]):
+        if np is not None:
+            return np.array(valores, dtype=np.int32 if tipo == "i" else np.int64)
+        return array(tipo, valores)
+
+    def __len__(self) -> int:
+        return len(self.tareas)
+
+    # Conteos
+
+    @staticmethod
+    def _contar(codigos, valores: List) -> Dict:
+        if np is not None:
+            cuentas = np.bincount(codigos, minlength=len(valores)).tolist()
+        else:
+            contador = Counter(codigos)
+            cuentas = [contador[i] for i in range(len(valores))]
+        return dict(zip(valores, cuentas))
+
+    def contar_por_estado(self) -> Dict[str, int]:
+        """Tareas por estado (incluye los estados estandar aunque no haya tareas)"""
+        return self._contar(self.estados, self.valores_estado)
+
+    def contar_por_prioridad(self) -> Dict[str, int]:
+        """Tareas por prioridad (incluye las prioridades estandar)"""
+        return self._contar(self.prioridades, self.valores_prioridad)
+
+    def contar_por_asignado(self) -> Dict[Optional[str], int]:
+        """Tareas por asignado en orden de aparicion (None = sin asignar)"""
+        return self._contar(self.asignados, self.valores_asignado)
+
+    def contar_por_columna(self) -> Dict[str, int]:
+        """Tareas por ID de columna"""
+        return self._contar(self.columnas, self.columna_ids)
+
+    # Filtros (retornan posiciones en ``tareas``)
+
+    def filtrar(
+        self,
+        estado: Optional[str] = None,
+        prioridad: Optional[str] = None,
+        asignado_a: Optional[str] = None,
+        columna_id: Optional[str] = None,
+    ) -> List[int]:
+        """Posiciones de las tareas que cumplen todos los criterios indicados"""
+        criterios = []
+        if estado is not None:
+            criterios.append((self.estados, self._estados.buscar(estado)))
+        if prioridad is not None:
+            criterios.append((self.prioridades, self._prioridades.buscar(prioridad)))
+        if asignado_a is not None:
+            criterios.append((self.asignados, self._asignados.buscar(asignado_a)))
+        if columna_id is not None:
+            codigo = self.columna_ids.index(columna_id) if columna_id in self.columna_ids else -1
+            criterios.append((self.columnas, codigo))
+
+        if np is not None:
+            mascara = np.ones(len(self.tareas), dtype=bool)
+            for arreglo, codigo in criterios:
+                mascara &= arreglo == codigo
+            return np.flatnonzero(mascara).tolist()
+        return [
+            i for i in range(len(self.tareas))
+            if all(arreglo[i] == codigo for arreglo, codigo in criterios)
+        ]
+
+    def posiciones_retrasadas(self, hoy: Optional[date] = None) -> List[int]:
+        """Posiciones de tareas no completadas que vencieron antes de ``hoy``"""
+        hoy = hoy or datetime.now().date()
+        limite = epoch(datetime(hoy.year, hoy.month, hoy.day))
+        completada = self._estados.buscar(TASK_STATUS_COMPLETED)
+        if np is not None:
+            mascara = (
+                (self.vencimiento != SIN_FECHA)
+                & (self.vencimiento < limite)
+                & (self.estados != completada)
+            )
+            return np.flatnonzero(mascara).tolist()
+        estados = self.estados
+        return [
+            i for i, vence in enumerate(self.vencimiento)
+            if SIN_FECHA < vence < limite and estados[i] != completada
+        ]
+
+    def seleccionar(self, posiciones: Iterable[int]) -> List[Tarea]:
+        """Traduce posiciones a objetos Tarea"""
+        return [self.tareas[i] for i in posiciones]
+
+
+def vista_columnar(proyecto: Proyecto) -> TareasColumnares:
+    """Vista columnar del proyecto; se reconstruye solo si el proyecto cambio"""
+    return proyecto.derivado("columnar", TareasColumnares)
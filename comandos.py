@@ -0,0 +1,458 @@
+"""
+Modo no interactivo: comandos de linea sobre los datos
+Cada comando es una lista de argumentos (``tarea agregar Web Pendiente "Login"``);
+los de un lote se ejecutan sobre los mismos proyectos cargados y los cambios
+se guardan una sola vez al final
+"""
+
+import argparse
+import csv
+import shlex
+import sys
+import time
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import PRIORITIES, TASK_STATUSES
+from models import Columna, Proyecto, Tarea, Usuario
+from utils import ValidadorDatos
+
+COLUMNAS_POR_DEFECTO = ("Pendiente", "En Progreso", "Completada")
+
+
+class ErrorComando(ValueError):
+    """Comando mal formado o que no se puede aplicar a los datos"""
+
+
+class _Analizador(argparse.ArgumentParser):
+    """ArgumentParser que lanza ErrorComando en lugar de terminar el proceso"""
+
+    def error(self, message: str):
+        raise ErrorComando(message)
+
+
+class EjecutorComandos:
+    """Ejecuta comandos sobre un gestor de persistencia y guarda al confirmar
+
+    Los proyectos se cargan la primera vez que un comando los nombra (por ID o
+    por nombre) y se conservan en memoria; ``confirmar`` guarda los proyectos
+    y usuarios modificados dentro de ``storage.lote()`` si el gestor lo tiene.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._proyectos: Dict[str, Proyecto] = {}
+        self._resumenes: Optional[List[Dict]] = None
+        self._modificados: Dict[str, Proyecto] = {}
+        self._usuarios: List[Usuario] = []
+        self._en_lote = False
+        self._analizador = self._crear_analizador()
+
+    # Analisis de argumentos
+
+    def _crear_analizador(self) -> argparse.ArgumentParser:
+        analizador = _Analizador(prog="main.py", description="Gestor de proyectos y tareas")
+        entidades = analizador.add_subparsers(dest="entidad", metavar="ENTIDAD")
+        entidades.required = True
+
+        usuario = entidades.add_parser("usuario", help="Usuarios").add_subparsers(
+            dest="accion", metavar="ACCION"
+        )
+        usuario.required = True
+        crear = usuario.add_parser("crear", help="Crea un usuario")
+        crear.add_argument("nombre")
+        crear.add_argument("email")
+        crear.set_defaults(funcion=self._usuario_crear)
+        usuario.add_parser("listar", help="Lista los usuarios").set_defaults(
+            funcion=self._usuario_listar
+        )
+
+        proyecto = entidades.add_parser("proyecto", help="Proyectos").add_subparsers(
+            dest="accion", metavar="ACCION"
+        )
+        proyecto.required = True
+        crear = proyecto.add_parser("crear", help="Crea un proyecto")
+        crear.add_argument("nombre")
+        crear.add_argument("-d", "--descripcion", default="")
+        crear.add_argument(
+            "--columnas",
+            default=",".join(COLUMNAS_POR_DEFECTO),
+            help="Nombres de columnas separados por comas",
+        )
+        crear.set_defaults(funcion=self._proyecto_crear)
+        proyecto.add_parser("listar", help="Lista los proyectos").set_defaults(
+            funcion=self._proyecto_listar
+        )
+
+        columna = entidades.add_parser("columna", help="Columnas").add_subparsers(
+            dest="accion", metavar="ACCION"
+        )
+        columna.required = True
+        agregar = columna.add_parser("agregar", help="Agrega una columna a un proyecto")
+        agregar.add_argument("proyecto")
+        agregar.add_argument("nombre")
+        agregar.set_defaults(funcion=self._columna_agregar)
+
+        tarea = entidades.add_parser("tarea", help="Tareas").add_subparsers(
+            dest="accion", metavar="ACCION"
+        )
+        tarea.required = True
+        agregar = tarea.add_parser("agregar", help="Agrega una tarea e imprime su ID")
+        agregar.add_argument("proyecto")
+        agregar.add_argument("columna")
+        agregar.add_argument("titulo")
+        agregar.add_argument("-d", "--descripcion", default="")
+        agregar.add_argument("-p", "--prioridad", choices=PRIORITIES, default="Media")
+        agregar.add_argument("-s", "--estado", choices=TASK_STATUSES)
+        agregar.add_argument("-a", "--asignado")
+        agregar.add_argument("-v", "--vence", help="Fecha de vencimiento ISO")
+        agregar.add_argument("-e", "--etiqueta", action="append", default=[])
+        agregar.set_defaults(funcion=self._tarea_agregar)
+
+        actualizar = tarea.add_parser("actualizar", help="Cambia campos de una tarea")
+        actualizar.add_argument("proyecto")
+        actualizar.add_argument("tarea_id")
+        actualizar.add_argument("-t", "--titulo")
+        actualizar.add_argument("-d", "--descripcion")
+        actualizar.add_argument("-p", "--prioridad", choices=PRIORITIES)
+        actualizar.add_argument("-s", "--estado", choices=TASK_STATUSES)
+        actualizar.add_argument("-a", "--asignado")
+        actualizar.add_argument("-v", "--vence")
+        actualizar.add_argument("-e", "--etiqueta", action="append", default=[])
+        actualizar.set_defaults(funcion=self._tarea_actualizar)
+
+        mover = tarea.add_parser(
+            "mover", help="Mueve una tarea a otra columna o de posicion en la suya"
+        )
+        mover.add_argument("proyecto")
+        mover.add_argument("tarea_id")
+        mover.add_argument("columna")
+        mover.add_argument("--posicion", type=int, help="Posicion en la columna (desde 1)")
+        mover.set_defaults(funcion=self._tarea_mover)
+
+        eliminar = tarea.add_parser("eliminar", help="Elimina una tarea")
+        eliminar.add_argument("proyecto")
+        eliminar.add_argument("tarea_id")
+        eliminar.set_defaults(funcion=self._tarea_eliminar)
+
+        importar = tarea.add_parser(
+            "importar",
+            help="Importa tareas de un CSV o JSONL guardando por lotes (no admitido en lotes)",
+        )
+        importar.add_argument("proyecto")
+        importar.add_argument("archivo")
+        importar.add_argument("--formato", choices=("csv", "jsonl"))
+        importar.add_argument(
+            "--lote",
+            type=int,
+            help="Tareas por guardado (en JSON y directorio es un minimo: el lote "
+            "crece hasta igualar lo ya guardado)",
+        )
+        importar.add_argument(
+            "--sin-crear-columnas",
+            dest="crear_columnas",
+            action="store_false",
+            help="Rechaza las filas de columnas que no existen",
+        )
+        importar.set_defaults(funcion=self._tarea_importar)
+
+        listar = tarea.add_parser("listar", help="Lista las tareas de un proyecto")
+        listar.add_argument("proyecto")
+        listar.add_argument("--columna")
+        listar.set_defaults(funcion=self._tarea_listar)
+
+        lote = entidades.add_parser(
+            "lote", help="Ejecuta los comandos de un archivo (o de stdin con '-')"
+        )
+        lote.add_argument("archivo", nargs="?", default="-")
+        lote.set_defaults(funcion=None)
+        return analizador
+
+    # Ejecucion
+
+    def ejecutar(self, argumentos: List[str]):
+        """Ejecuta un comando (sin guardar); lanza ErrorComando si falla"""
+        args = self._analizador.parse_args(argumentos)
+        if args.funcion is None:
+            raise ErrorComando("'lote' no se puede usar dentro de un lote")
+        args.funcion(args)
+
+    def ejecutar_lote(self, lineas: Iterable[str]) -> int:
+        """Ejecuta una linea por comando y retorna cuantos se ejecutaron
+
+        Las lineas vacias y lo que sigue a ``#`` se ignoran. Si un comando falla
+        se lanza ErrorComando indicando la linea (y nada se ha guardado aun).
+        """
+        ejecutados = 0
+        self._en_lote = True
+        try:
+            for numero, linea in enumerate(lineas, 1):
+                try:
+                    argumentos = shlex.split(linea, comments=True)
+                    if argumentos:
+                        self.ejecutar(argumentos)
+                        ejecutados += 1
+                except ValueError as e:
+                    raise ErrorComando(f"linea {numero}: {e}") from None
+        finally:
+            self._en_lote = False
+        return ejecutados
+
+    def confirmar(self) -> bool:
+        """Guarda una vez los usuarios y proyectos creados o modificados"""
+        lote = getattr(self.storage, "lote", None)
+        ok = True
+        with lote() if lote is not None else nullcontext():
+            for usuario in self._usuarios:
+                ok = self.storage.guardar_usuario(usuario) and ok
+            for proyecto in self._modificados.values():
+                ok = self.storage.guardar_proyecto(proyecto) and ok
+        if ok:
+            self._usuarios = []
+            self._modificados = {}
+        return ok
+
+    # Resolucion de referencias
+
+    def _proyecto(self, referencia: str) -> Proyecto:
+        """Proyecto por ID o por nombre (sin distinguir mayusculas)"""
+        proyecto = self._proyectos.get(referencia)
+        if proyecto is not None:
+            return proyecto
+        nombre = referencia.lower()
+        en_memoria = [p for p in self._proyectos.values() if p.nombre.lower() == nombre]
+        if self._resumenes is None:
+            self._resumenes = self.storage.listar_resumenes_proyectos()
+        guardados = [
+            r["proyecto_id"]
+            for r in self._resumenes
+            if r["proyecto_id"] not in self._proyectos
+            and (r["proyecto_id"] == referencia or r["nombre"].lower() == nombre)
+        ]
+        if len(en_memoria) + len(guardados) > 1:
+            raise ErrorComando(f"hay varios proyectos llamados '{referencia}'; use su ID")
+        if en_memoria:
+            return en_memoria[0]
+        if not guardados:
+            raise ErrorComando(f"proyecto no encontrado: '{referencia}'")
+        proyecto = self.storage.cargar_proyecto(guardados[0])
+        if proyecto is None:
+            raise ErrorComando(f"proyecto no encontrado: '{referencia}'")
+        self._proyectos[proyecto.proyecto_id] = proyecto
+        return proyecto
+
+    @staticmethod
+    def _columna(proyecto: Proyecto, referencia: str) -> Columna:
+        """Columna del proyecto por ID o por nombre (sin distinguir mayusculas)"""
+        columna = proyecto.obtener_columna(referencia)
+        if columna is not None:
+            return columna
+        nombre = referencia.lower()
+        for columna in proyecto.columnas:
+            if columna.nombre.lower() == nombre:
+                return columna
+        raise ErrorComando(f"columna no encontrada en '{proyecto.nombre}': '{referencia}'")
+
+    @staticmethod
+    def _ubicacion(proyecto: Proyecto, tarea_id: str) -> Tuple[Columna, Tarea]:
+        ubicacion = proyecto.localizar_tarea(tarea_id)
+        if ubicacion is None:
+            raise ErrorComando(f"tarea no encontrada en '{proyecto.nombre}': '{tarea_id}'")
+        return ubicacion
+
+    def _modificado(self, proyecto: Proyecto):
+        self._modificados[proyecto.proyecto_id] = proyecto
+
+    @staticmethod
+    def _validar_fecha(fecha: Optional[str]):
+        if fecha and not ValidadorDatos.validar_fecha_iso(fecha):
+            raise ErrorComando(f"fecha invalida: '{fecha}'")
+
+    # Comandos
+
+    def _usuario_crear(self, args):
+        if not ValidadorDatos.validar_no_vacio(args.nombre):
+            raise ErrorComando("el nombre no puede estar vacio")
+        if not ValidadorDatos.validar_email(args.email):
+            raise ErrorComando(f"email invalido: '{args.email}'")
+        usuario = Usuario(args.nombre, args.email)
+        self._usuarios.append(usuario)
+        print(usuario.usuario_id)
+
+    def _usuario_listar(self, args):
+        for usuario in self.storage.iterar_usuarios():
+            print(f"{usuario.usuario_id}\t{usuario.nombre}\t{usuario.email}")
+        for usuario in self._usuarios:
+            print(f"{usuario.usuario_id}\t{usuario.nombre}\t{usuario.email}")
+
+    def _proyecto_crear(self, args):
+        if not ValidadorDatos.validar_no_vacio(args.nombre):
+            raise ErrorComando("el nombre no puede estar vacio")
+        proyecto = Proyecto(args.nombre, args.descripcion)
+        for nombre in args.columnas.split(","):
+            if nombre.strip():
+                proyecto.agregar_columna(nombre.strip())
+        self._proyectos[proyecto.proyecto_id] = proyecto
+        self._modificado(proyecto)
+        print(proyecto.proyecto_id)
+
+    def _proyecto_listar(self, args):
+        if self._resumenes is None:
+            self._resumenes = self.storage.listar_resumenes_proyectos()
+        for resumen in self._resumenes:
+            proyecto = self._proyectos.get(resumen["proyecto_id"])
+            total = proyecto.contar_tareas() if proyecto else resumen["total_tareas"]
+            print(f"{resumen['proyecto_id']}\t{resumen['nombre']}\t{total}")
+        guardados = {r["proyecto_id"] for r in self._resumenes}
+        for proyecto in self._proyectos.values():
+            if proyecto.proyecto_id not in guardados:
+                print(f"{proyecto.proyecto_id}\t{proyecto.nombre}\t{proyecto.contar_tareas()}")
+
+    def _columna_agregar(self, args):
+        proyecto = self._proyecto(args.proyecto)
+        print(proyecto.agregar_columna(args.nombre).columna_id)
+        self._modificado(proyecto)
+
+    def _tarea_agregar(self, args):
+        if not ValidadorDatos.validar_no_vacio(args.titulo):
+            raise ErrorComando("el titulo no puede estar vacio")
+        self._validar_fecha(args.vence)
+        proyecto = self._proyecto(args.proyecto)
+        columna = self._columna(proyecto, args.columna)
+        tarea = Tarea(args.titulo, args.descripcion, args.prioridad, args.asignado)
+        if args.estado:
+            tarea.estado = args.estado
+        tarea.fecha_vencimiento = args.vence
+        columna.agregar_tarea(tarea)
+        for etiqueta in args.etiqueta:
+            tarea.agregar_etiqueta(etiqueta)
+        self._modificado(proyecto)
+        print(tarea.tarea_id)
+
+    def _tarea_actualizar(self, args):
+        self._validar_fecha(args.vence)
+        proyecto = self._proyecto(args.proyecto)
+        _, tarea = self._ubicacion(proyecto, args.tarea_id)
+        campos = {
+            campo: valor
+            for campo, valor in (
+                ("titulo", args.titulo),
+                ("descripcion", args.descripcion),
+                ("prioridad", args.prioridad),
+                ("estado", args.estado),
+                ("asignado_a", args.asignado),
+                ("fecha_vencimiento", args.vence),
+            )
+            if valor is not None
+        }
+        if campos:
+            tarea.actualizar(**campos)
+        for etiqueta in args.etiqueta:
+            tarea.agregar_etiqueta(etiqueta)
+        self._modificado(proyecto)
+
+    def _tarea_mover(self, args):
+        proyecto = self._proyecto(args.proyecto)
+        origen, _ = self._ubicacion(proyecto, args.tarea_id)
+        destino = self._columna(proyecto, args.columna)
+        posicion = args.posicion - 1 if args.posicion else None
+        if destino is origen:
+            # En la misma columna es una reordenacion (sin posicion, al final)
+            if posicion is None:
+                posicion = destino.contar_tareas() - 1
+            movida = destino.reordenar_tarea(args.tarea_id, posicion)
+        else:
+            movida = proyecto.mover_tarea(args.tarea_id, destino.columna_id, posicion)
+        if not movida:
+            raise ErrorComando(
+                f"la tarea '{args.tarea_id}' ya esta en esa posicion de '{destino.nombre}'"
+            )
+        self._modificado(proyecto)
+
+    def _tarea_eliminar(self, args):
+        proyecto = self._proyecto(args.proyecto)
+        columna, _ = self._ubicacion(proyecto, args.tarea_id)
+        columna.eliminar_tarea(args.tarea_id)
+        self._modificado(proyecto)
+
+    def _tarea_importar(self, args):
+        # La importacion guarda por su cuenta cada --lote tareas: dentro de un
+        # lote romperia la garantia de no guardar nada si un comando falla
+        if self._en_lote or self._modificados or self._usuarios:
+            raise ErrorComando("'tarea importar' no se puede usar dentro de un lote")
+        from importacion import TAMANO_LOTE, importar_tareas
+
+        proyecto = self._proyecto(args.proyecto)
+
+        def progreso(informe):
+            print(informe, file=sys.stderr)
+
+        try:
+            informe = importar_tareas(
+                self.storage,
+                proyecto,
+                args.archivo,
+                args.formato,
+                tamano_lote=args.lote or TAMANO_LOTE,
+                crear_columnas=args.crear_columnas,
+                progreso=progreso,
+            )
+        except (IOError, OSError, csv.Error) as e:
+            raise ErrorComando(f"no se pudo leer '{args.archivo}': {e}") from None
+        for error in informe.errores:
+            print(error, file=sys.stderr)
+        if not informe.completa:
+            raise ErrorComando(f"importacion interrumpida tras {informe.importadas} tareas")
+        print(informe)
+
+    def _tarea_listar(self, args):
+        proyecto = self._proyecto(args.proyecto)
+        columnas = (
+            [self._columna(proyecto, args.columna)] if args.columna else proyecto.columnas
+        )
+        for columna in columnas:
+            for tarea in columna.tareas:
+                print(
+                    f"{tarea.tarea_id}\t{columna.nombre}\t{tarea.titulo}\t{tarea.estado}\t"
+                    f"{tarea.prioridad}\t{tarea.asignado_a or ''}"
+                )
+
+
+def ejecutar_comandos(argumentos: List[str], storage=None) -> int:
+    """Ejecuta un comando o un lote (``lote [archivo]``) y guarda una vez
+
+    Retorna el codigo de salida: 0 si todo se ejecuto y guardo, 1 si no. Ante
+    un error no se guarda ningun cambio, salvo en ``tarea importar`` (que no se
+    admite en lotes): los lotes de tareas ya guardados se conservan.
+    """
+    if storage is None:
+        from storage import crear_storage
+
+        storage = crear_storage()
+    ejecutor = EjecutorComandos(storage)
+    inicio = time.perf_counter()
+    try:
+        if argumentos[0] == "lote":
+            archivo = argumentos[1] if len(argumentos) > 1 else "-"
+            if archivo == "-":
+                ejecutados = ejecutor.ejecutar_lote(sys.stdin)
+            else:
+                with open(archivo, "r", encoding="utf-8") as f:
+                    ejecutados = ejecutor.ejecutar_lote(f)
+        else:
+            ejecutor.ejecutar(argumentos)
+            ejecutados = 1
+    except ErrorComando as e:
+        print(f"Error al ejecutar el comando: {e}", file=sys.stderr)
+        return 1
+    except (IOError, OSError) as e:
+        print(f"Error al leer el lote: {e}", file=sys.stderr)
+        return 1
+
+    guardado = ejecutor.confirmar() and storage.sincronizar()
+    if argumentos[0] == "lote":
+        print(
+            f"{ejecutados} comandos en {time.perf_counter() - inicio:.2f} s",
+            file=sys.stderr,
+        )
+    return 0 if guardado else 1
@@ -4,15 +4,53 @@ Define constantes y configuraciones globales
 """
 
 import os
-from pathlib import Path
 
-# Rutas
-BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
-DATA_FILE = DATA_DIR / "projects.json"
+# Rutas (BASE_DIR, DATA_DIR, DATA_FILE, DATA_DB_FILE) relativas a este archivo.
+# Se construyen en el primer acceso para que importar config no cargue pathlib;
+# el directorio de datos lo crea el gestor de persistencia al instanciarse.
+_RUTAS = {
+    "BASE_DIR": (),
+    "DATA_DIR": ("data",),
+    "DATA_FILE": ("data", "projects.json"),
+    "DATA_DB_FILE": ("data", "projects.db"),
+}
+
+
+def __getattr__(nombre):
+    if nombre in _RUTAS:
+        from pathlib import Path
+
+        ruta = Path(__file__).parent.joinpath(*_RUTAS[nombre])
+        globals()[nombre] = ruta
+        return ruta
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+# Persistencia: "json" (archivo unico), "directorio" (un archivo por entidad)
+# o "sqlite" (base de datos local con indices)
+STORAGE_BACKEND = "json"
+
+# Cache en memoria del documento JSON
+# (intervalo 0 = escribir en cada guardado, None = solo al sincronizar)
+STORAGE_CACHE = True
+STORAGE_INTERVALO_FLUSH = 0.0
+
+# Formato de projects.json: "json" (legible) o "binario" (compacto);
+# la lectura detecta el formato automaticamente
+STORAGE_FORMATO = "json"
+
+# Diario de operaciones: los guardados anaden lineas a projects.json.diario
+# en lugar de reescribir projects.json, que se compacta periodicamente.
+# Mientras el diario no se compacte, projects.json por si solo no esta al dia.
+STORAGE_DIARIO = False
+
+# Generaciones de respaldo de projects.json (projects.json.bak1, .bak2, ...)
+STORAGE_RESPALDOS = 1
 
-# Crear directorio de datos si no existe
-DATA_DIR.mkdir(exist_ok=True)
+# Depuracion: recalcular los contadores de cada proyecto al cargarlo y tras cada
+# operacion y comprobar que coinciden con los persistidos o mantenidos
+# incrementalmente
+VERIFICAR_CONTADORES = False
 
 # Constantes de estado
 TASK_STATUS_PENDING = "Pendiente"
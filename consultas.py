@@ -0,0 +1,352 @@
+"""
+Consultas de tareas sobre todos los proyectos del almacenamiento
+Un indice secundario persistido (estado, prioridad, asignado, etiqueta y
+vencimiento -> tareas de cada proyecto) evita cargar los proyectos sin
+resultados; los resultados se generan de proyecto en proyecto
+"""
+
+import json
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from models import SIN_FECHA, Columna, Proyecto, Tarea, epoch
+
+FORMATO_INDICE_GLOBAL = 1
+ARCHIVO_INDICE_GLOBAL = "consultas.json"
+# Campos con lista de tareas por valor en el indice (las etiquetas en minusculas)
+CAMPOS_INDEXADOS = ("estado", "prioridad", "asignado_a", "etiquetas")
+
+# Con hasta tantas tareas candidatas el texto se comprueba tarea por tarea; con
+# mas se usa el indice de busqueda del proyecto
+_RECORRER_HASTA = 2000
+
+ResultadoGlobal = Tuple[Proyecto, Columna, Tarea]
+
+
+def _inicio_del_dia(dia: date) -> int:
+    return epoch(datetime(dia.year, dia.month, dia.day))
+
+
+class ConsultaTareas:
+    """Criterios de una consulta global; una tarea debe cumplirlos todos
+
+    - ``estados``, ``prioridades``, ``asignados``: la tarea tiene alguno de los
+      valores (``""`` en ``asignados`` = sin asignar)
+    - ``etiquetas``: la tarea tiene todas (sin distinguir mayusculas)
+    - ``vence_desde``, ``vence_hasta``: dias limite (inclusive) del vencimiento
+    - ``texto``: subcadena del titulo o la descripcion, como ``buscar_tareas``
+
+    Un criterio vacio no filtra.
+    """
+
+    def __init__(
+        self,
+        estados: Iterable[str] = (),
+        prioridades: Iterable[str] = (),
+        asignados: Iterable[str] = (),
+        etiquetas: Iterable[str] = (),
+        vence_desde: Optional[date] = None,
+        vence_hasta: Optional[date] = None,
+        texto: str = "",
+    ):
+        self.estados = set(estados)
+        self.prioridades = set(prioridades)
+        self.asignados = set(asignados)
+        self.etiquetas = {e.lower() for e in etiquetas}
+        self.vence_desde = vence_desde
+        self.vence_hasta = vence_hasta
+        self.texto = texto.strip().lower()
+
+    def filtros_por_valor(self) -> List[Tuple[str, Set[str], bool]]:
+        """(campo, valores, todos) de los criterios que resuelve el indice"""
+        filtros = [
+            ("estado", self.estados, False),
+            ("prioridad", self.prioridades, False),
+            ("asignado_a", self.asignados, False),
+            ("etiquetas", self.etiquetas, True),
+        ]
+        return [filtro for filtro in filtros if filtro[1]]
+
+    def rango_vencimiento(self) -> Optional[Tuple[int, int]]:
+        """Epochs [desde, hasta) del rango de vencimiento, o None si no se filtra"""
+        if self.vence_desde is None and self.vence_hasta is None:
+            return None
+        desde = _inicio_del_dia(self.vence_desde) if self.vence_desde else SIN_FECHA + 1
+        if self.vence_hasta is None:
+            return desde, -SIN_FECHA
+        return desde, _inicio_del_dia(self.vence_hasta + timedelta(days=1))
+
+    def cumple(self, tarea: Tarea) -> bool:
+        """Comprueba en la tarea todos los criterios salvo el texto"""
+        if self.estados and tarea.estado not in self.estados:
+            return False
+        if self.prioridades and tarea.prioridad not in self.prioridades:
+            return False
+        if self.asignados and (tarea.asignado_a or "") not in self.asignados:
+            return False
+        if self.etiquetas and not self.etiquetas <= {e.lower() for e in tarea.etiquetas}:
+            return False
+        rango = self.rango_vencimiento()
+        if rango is not None:
+            vence = epoch(tarea.fecha_vencimiento) if tarea.fecha_vencimiento else SIN_FECHA
+            if vence == SIN_FECHA or not rango[0] <= vence < rango[1]:
+                return False
+        return True
+
+    def cumple_texto(self, tarea: Tarea) -> bool:
+        return (
+            self.texto in tarea.titulo.lower()
+            or self.texto in (tarea.descripcion or "").lower()
+        )
+
+
+class IndiceGlobal:
+    """Indice secundario de las tareas de todos los proyectos
+
+    Por proyecto guarda una entrada con:
+
+    - ``firma``: ``[version, total_tareas]`` del resumen del proyecto indexado
+    - ``tareas``: IDs de sus tareas; las listas siguientes usan su posicion
+    - ``estado``, ``prioridad``, ``asignado_a``, ``etiquetas``: valor -> tareas
+    - ``vencimientos``: ``[epochs, tareas]`` ordenadas por fecha de vencimiento
+    """
+
+    def __init__(self):
+        self._proyectos: Dict[str, Dict] = {}
+
+    def __contains__(self, proyecto_id: str) -> bool:
+        return proyecto_id in self._proyectos
+
+    def firma(self, proyecto_id: str) -> Optional[List]:
+        entrada = self._proyectos.get(proyecto_id)
+        return entrada["firma"] if entrada is not None else None
+
+    def proyectos(self) -> List[str]:
+        return list(self._proyectos)
+
+    def indexar(self, proyecto: Proyecto, firma: List):
+        """Reemplaza la entrada del proyecto con sus tareas actuales"""
+        ids = []
+        por_campo = {campo: {} for campo in CAMPOS_INDEXADOS}
+        estados, prioridades = por_campo["estado"], por_campo["prioridad"]
+        asignados, etiquetas = por_campo["asignado_a"], por_campo["etiquetas"]
+        vencimientos = []
+        for columna in proyecto.columnas:
+            for tarea in columna.tareas:
+                posicion = len(ids)
+                ids.append(tarea.tarea_id)
+                estados.setdefault(tarea.estado, []).append(posicion)
+                prioridades.setdefault(tarea.prioridad, []).append(posicion)
+                asignados.setdefault(tarea.asignado_a or "", []).append(posicion)
+                for etiqueta in {e.lower() for e in tarea.etiquetas}:
+                    etiquetas.setdefault(etiqueta, []).append(posicion)
+                if tarea.fecha_vencimiento:
+                    vence = epoch(tarea.fecha_vencimiento)
+                    if vence != SIN_FECHA:
+                        vencimientos.append((vence, posicion))
+        vencimientos.sort()
+        entrada = {"firma": list(firma), "tareas": ids}
+        entrada.update(por_campo)
+        entrada["vencimientos"] = [[v for v, _ in vencimientos], [p for _, p in vencimientos]]
+        self._proyectos[proyecto.proyecto_id] = entrada
+
+    def quitar(self, proyecto_id: str) -> bool:
+        return self._proyectos.pop(proyecto_id, None) is not None
+
+    def tareas(self, proyecto_id: str, consulta: ConsultaTareas) -> Optional[Set[str]]:
+        """IDs de las tareas del proyecto que cumplen los criterios indexados
+
+        El texto no se comprueba. Retorna None si el proyecto no esta indexado.
+        """
+        entrada = self._proyectos.get(proyecto_id)
+        if entrada is None:
+            return None
+        listas = []
+        for campo, valores, todos in consulta.filtros_por_valor():
+            por_valor = entrada[campo]
+            if todos:
+                if not all(valor in por_valor for valor in valores):
+                    return set()
+                listas.extend(por_valor[valor] for valor in valores)
+            else:
+                union = [p for valor in valores for p in por_valor.get(valor, ())]
+                if not union:
+                    return set()
+                listas.append(union)
+        rango = consulta.rango_vencimiento()
+        if rango is not None:
+            epochs, posiciones = entrada["vencimientos"]
+            listas.append(
+                posiciones[bisect_left(epochs, rango[0]):bisect_left(epochs, rango[1])]
+            )
+
+        ids = entrada["tareas"]
+        if not listas:
+            return set(ids)
+        # Se intersecta empezando por la lista mas corta
+        listas.sort(key=len)
+        seleccion = set(listas[0])
+        for lista in listas[1:]:
+            if not seleccion:
+                break
+            seleccion.intersection_update(lista)
+        return {ids[p] for p in seleccion}
+
+    def to_dict(self) -> dict:
+        return {"formato": FORMATO_INDICE_GLOBAL, "proyectos": self._proyectos}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["IndiceGlobal"]:
+        """Crea el indice desde diccionario (None si es de otro formato)"""
+        if data.get("formato") != FORMATO_INDICE_GLOBAL:
+            return None
+        indice = cls()
+        indice._proyectos = data["proyectos"]
+        return indice
+
+    def guardar(self, ruta: Path) -> bool:
+        """Escribe el indice en ``ruta`` (archivo derivado: sin fsync)"""
+        from storage import escribir_atomico
+
+        datos = self.to_dict()
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            escribir_atomico(
+                ruta,
+                lambda f: json.dump(datos, f, ensure_ascii=False, separators=(",", ":")),
+                duradero=False,
+            )
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error al guardar el indice de consultas: {e}")
+            return False
+
+    @classmethod
+    def cargar(cls, ruta: Path) -> Optional["IndiceGlobal"]:
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (json.JSONDecodeError, IOError, KeyError, TypeError):
+            return None
+
+
+def _firma(resumen: Dict) -> List:
+    """Cambia cada vez que se guarda el proyecto (o cambia su numero de tareas)"""
+    return [resumen.get("version", 0), resumen["total_tareas"]]
+
+
+class MotorConsultas:
+    """Ejecuta consultas de tareas sobre todos los proyectos de ``storage``
+
+    El indice se guarda en ``storage.directorio_indices`` (si existe) y antes de
+    cada consulta se pone al dia con los resumenes de proyectos: solo se
+    vuelven a indexar los proyectos cuya version cambio.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.directorio: Optional[Path] = getattr(storage, "directorio_indices", None)
+        self._indice: Optional[IndiceGlobal] = None
+
+    @property
+    def ruta(self) -> Optional[Path]:
+        return self.directorio / ARCHIVO_INDICE_GLOBAL if self.directorio else None
+
+    def actualizar_indice(self) -> List[Dict]:
+        """Indexa los proyectos nuevos o modificados y retorna los resumenes"""
+        if self._indice is None:
+            if self.ruta is not None:
+                self._indice = IndiceGlobal.cargar(self.ruta)
+            if self._indice is None:
+                self._indice = IndiceGlobal()
+        indice = self._indice
+
+        resumenes = self.storage.listar_resumenes_proyectos()
+        cambios = False
+        for resumen in resumenes:
+            firma = _firma(resumen)
+            if indice.firma(resumen["proyecto_id"]) == firma:
+                continue
+            proyecto = self.storage.cargar_proyecto(resumen["proyecto_id"])
+            if proyecto is not None:
+                indice.indexar(proyecto, firma)
+                cambios = True
+        vigentes = {r["proyecto_id"] for r in resumenes}
+        for proyecto_id in indice.proyectos():
+            if proyecto_id not in vigentes:
+                cambios = indice.quitar(proyecto_id) or cambios
+        if cambios and self.ruta is not None:
+            indice.guardar(self.ruta)
+        return resumenes
+
+    def contar(self, consulta: ConsultaTareas) -> int:
+        """Numero de resultados; sin texto sale solo del indice"""
+        if consulta.texto:
+            return sum(1 for _ in self.iterar(consulta))
+        resumenes = self.actualizar_indice()
+        return sum(len(self._indice.tareas(r["proyecto_id"], consulta) or ()) for r in resumenes)
+
+    def iterar(self, consulta: ConsultaTareas, desde: int = 0) -> Iterator[ResultadoGlobal]:
+        """Genera (proyecto, columna, tarea) en orden de proyectos y de tablero
+
+        Solo se cargan los proyectos con tareas candidatas, de uno en uno. Los
+        ``desde`` primeros resultados se omiten; sin texto, los proyectos que
+        caen enteros antes de ``desde`` no llegan a cargarse.
+        """
+        for resumen in self.actualizar_indice():
+            candidatas = self._indice.tareas(resumen["proyecto_id"], consulta)
+            if not candidatas:
+                continue
+            if not consulta.texto and len(candidatas) <= desde:
+                desde -= len(candidatas)
+                continue
+            proyecto = self.storage.cargar_proyecto(resumen["proyecto_id"])
+            if proyecto is None:
+                continue
+            for resultado in self._resultados(proyecto, candidatas, consulta):
+                if desde:
+                    desde -= 1
+                else:
+                    yield resultado
+
+    def _resultados(
+        self, proyecto: Proyecto, candidatas: Set[str], consulta: ConsultaTareas
+    ) -> List[ResultadoGlobal]:
+        """Comprueba las candidatas en el proyecto cargado y las ordena por tablero"""
+        if consulta.texto and len(candidatas) > _RECORRER_HASTA:
+            from busqueda import buscar_tareas
+
+            con_texto = {
+                tarea.tarea_id
+                for _, tarea in buscar_tareas(proyecto, consulta.texto, directorio=self.directorio)
+            }
+            candidatas = candidatas & con_texto
+            consulta_texto = False
+        else:
+            consulta_texto = bool(consulta.texto)
+
+        posicion_columna = {c.columna_id: i for i, c in enumerate(proyecto.columnas)}
+        resultados = []
+        for tarea_id in candidatas:
+            ubicacion = proyecto.localizar_tarea(tarea_id)
+            if ubicacion is None:
+                continue
+            columna, tarea = ubicacion
+            if not consulta.cumple(tarea) or (consulta_texto and not consulta.cumple_texto(tarea)):
+                continue
+            orden = (posicion_columna[columna.columna_id], columna.posicion_tarea(tarea_id))
+            resultados.append((orden, (proyecto, columna, tarea)))
+        resultados.sort(key=lambda r: r[0])
+        return [resultado for _, resultado in resultados]
+
+    def pagina(
+        self, consulta: ConsultaTareas, numero: int = 1, tamano: int = 20
+    ) -> Tuple[List[ResultadoGlobal], bool]:
+        """Resultados de la pagina ``numero`` (desde 1) y si hay mas paginas"""
+        resultados = list(
+            islice(self.iterar(consulta, desde=(numero - 1) * tamano), tamano + 1)
+        )
+        return resultados[:tamano], len(resultados) > tamano
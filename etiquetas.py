@@ -0,0 +1,136 @@
+"""
+Indice de etiquetas de las tareas de un proyecto
+Etiqueta -> tareas que la tienen, para filtrar por varias etiquetas (todas o
+alguna) y contarlas sin recorrer todas las tareas
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from models import Columna, Proyecto, Tarea
+
+Resultado = Tuple[Columna, Tarea]
+
+
+class IndiceEtiquetas:
+    """Lista de tareas por etiqueta de un proyecto
+
+    Las etiquetas se comparan sin distinguir mayusculas (como la busqueda):
+    ``_tareas_por_etiqueta`` usa la etiqueta en minusculas. ``_tareas`` guarda
+    las tareas con etiquetas por ID, para quitar sus entradas cuando la tarea
+    se elimina.
+
+    Se mantiene al dia con las operaciones del proyecto (``aplicar_operacion``).
+    """
+
+    def __init__(self, proyecto: Proyecto):
+        self._tareas_por_etiqueta: Dict[str, Set[str]] = {}
+        self._tareas: Dict[str, Tarea] = {}
+        for columna in proyecto.columnas:
+            for tarea in columna.tareas:
+                for etiqueta in tarea._etiquetas or ():
+                    self._agregar(tarea, etiqueta)
+
+    def __len__(self) -> int:
+        """Numero de etiquetas distintas"""
+        return len(self._tareas_por_etiqueta)
+
+    def _agregar(self, tarea: Tarea, etiqueta: str):
+        self._tareas_por_etiqueta.setdefault(etiqueta.lower(), set()).add(tarea.tarea_id)
+        self._tareas[tarea.tarea_id] = tarea
+
+    def _quitar(self, tarea_id: str, clave: str):
+        tareas = self._tareas_por_etiqueta.get(clave)
+        if tareas is None:
+            return
+        tareas.discard(tarea_id)
+        if not tareas:
+            del self._tareas_por_etiqueta[clave]
+
+    def aplicar_operacion(self, proyecto: Proyecto, operacion: Dict) -> bool:
+        """Actualiza el indice con una operacion ya aplicada al proyecto
+
+        Retorna False si no puede hacerlo (el indice debe reconstruirse).
+        """
+        op = operacion["op"]
+        if op == "agregar_etiqueta":
+            ubicacion = proyecto.localizar_tarea(operacion["tarea_id"])
+            if ubicacion is not None:
+                self._agregar(ubicacion[1], operacion["etiqueta"])
+        elif op == "eliminar_etiqueta":
+            tarea = self._tareas.get(operacion["tarea_id"])
+            clave = operacion["etiqueta"].lower()
+            if tarea is not None and all(e.lower() != clave for e in tarea._etiquetas or ()):
+                self._quitar(tarea.tarea_id, clave)
+                if not tarea._etiquetas:
+                    del self._tareas[tarea.tarea_id]
+        elif op == "agregar_tarea":
+            ubicacion = proyecto.localizar_tarea(operacion["tarea"]["tarea_id"])
+            if ubicacion is not None:
+                for etiqueta in ubicacion[1]._etiquetas or ():
+                    self._agregar(ubicacion[1], etiqueta)
+        elif op == "eliminar_tarea":
+            tarea = self._tareas.pop(operacion["tarea_id"], None)
+            if tarea is not None:
+                for etiqueta in tarea._etiquetas or ():
+                    self._quitar(tarea.tarea_id, etiqueta.lower())
+        elif op == "eliminar_columna":
+            return False
+        return True
+
+    # Consultas
+
+    def tareas_con_todas(self, etiquetas: Iterable[str]) -> Set[str]:
+        """IDs de las tareas que tienen todas las etiquetas (interseccion)"""
+        conjuntos = []
+        for etiqueta in etiquetas:
+            tareas = self._tareas_por_etiqueta.get(etiqueta.lower())
+            if tareas is None:
+                return set()
+            conjuntos.append(tareas)
+        if not conjuntos:
+            return set()
+        conjuntos.sort(key=len)
+        return set.intersection(*conjuntos)
+
+    def tareas_con_alguna(self, etiquetas: Iterable[str]) -> Set[str]:
+        """IDs de las tareas que tienen al menos una de las etiquetas (union)"""
+        union: Set[str] = set()
+        for etiqueta in etiquetas:
+            union |= self._tareas_por_etiqueta.get(etiqueta.lower(), set())
+        return union
+
+    def filtrar(
+        self, proyecto: Proyecto, todas: Iterable[str] = (), alguna: Iterable[str] = ()
+    ) -> List[Resultado]:
+        """(columna, tarea) con todas las etiquetas de ``todas`` y alguna de
+        ``alguna``, en el orden del tablero (una lista vacia no filtra, pero
+        hace falta al menos una etiqueta)
+        """
+        todas, alguna = list(todas), list(alguna)
+        if todas and alguna:
+            seleccion = self.tareas_con_todas(todas) & self.tareas_con_alguna(alguna)
+        elif todas:
+            seleccion = self.tareas_con_todas(todas)
+        else:
+            seleccion = self.tareas_con_alguna(alguna)
+
+        posicion_columna = {c.columna_id: i for i, c in enumerate(proyecto.columnas)}
+        resultados = []
+        for tarea_id in seleccion:
+            columna, tarea = proyecto.localizar_tarea(tarea_id)
+            orden = (posicion_columna[columna.columna_id], columna.posicion_tarea(tarea_id))
+            resultados.append((orden, (columna, tarea)))
+        resultados.sort(key=lambda r: r[0])
+        return [resultado for _, resultado in resultados]
+
+    def contar(self) -> Dict[str, int]:
+        """Tareas por etiqueta en minusculas, de la mas usada a la menos
+        (empates por nombre)"""
+        cuentas = [(clave, len(tareas)) for clave, tareas in self._tareas_por_etiqueta.items()]
+        cuentas.sort(key=lambda c: (-c[1], c[0]))
+        return dict(cuentas)
+
+
+def indice_etiquetas(proyecto: Proyecto) -> IndiceEtiquetas:
+    """Indice de etiquetas del proyecto, mantenido con sus operaciones"""
+    return proyecto.derivado("etiquetas", IndiceEtiquetas)
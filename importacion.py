@@ -0,0 +1,316 @@
+"""
+Importacion masiva de tareas desde CSV o JSONL
+Las filas se leen en streaming, se validan por bloques con ValidadorDatos y el
+proyecto se guarda cada ``tamano_lote`` tareas importadas como minimo (ver
+ImportadorTareas._umbral)
+"""
+
+import csv
+import json
+import time
+import unicodedata
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Columna, Proyecto, Tarea, sin_recolector
+from utils import ValidadorDatos
+
+TAMANO_LOTE = 20000
+TAMANO_BLOQUE = 1000
+MAX_ERRORES = 100
+
+# (numero de linea, campos de la tarea o None, error de lectura o None)
+Fila = Tuple[int, Optional[Dict], Optional[str]]
+
+# Encabezado normalizado (ver _normalizar) -> campo de la tarea; incluye los
+# de ExportadorDatos.exportar_a_csv y los habituales en ingles de otras herramientas
+_CAMPOS = {
+    "id": "tarea_id",
+    "id tarea": "tarea_id",
+    "tarea id": "tarea_id",
+    "titulo": "titulo",
+    "descripcion": "descripcion",
+    "prioridad": "prioridad",
+    "estado": "estado",
+    "asignado": "asignado_a",
+    "asignado a": "asignado_a",
+    "vence": "fecha_vencimiento",
+    "vencimiento": "fecha_vencimiento",
+    "fecha vencimiento": "fecha_vencimiento",
+    "etiquetas": "etiquetas",
+    "columna": "columna",
+    "title": "titulo",
+    "name": "titulo",
+    "description": "descripcion",
+    "priority": "prioridad",
+    "status": "estado",
+    "assignee": "asignado_a",
+    "due": "fecha_vencimiento",
+    "due date": "fecha_vencimiento",
+    "tags": "etiquetas",
+    "labels": "etiquetas",
+    "column": "columna",
+    "list": "columna",
+}
+
+
+def _normalizar(encabezado: str) -> str:
+    """Encabezado en minusculas, sin acentos y con espacios en lugar de '_'
+
+    Repara tambien los encabezados UTF-8 leidos como latin-1 ("TÃ­tulo").
+    """
+    texto = encabezado.strip()
+    try:
+        texto = texto.encode("latin-1").decode("utf-8")
+    except UnicodeError:
+        pass
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return texto.lower().replace("_", " ")
+
+
+def _campos(registro: Dict, columnas: Dict[str, Optional[str]]) -> Dict:
+    """Campos de la tarea de un registro leido, omitiendo los vacios
+
+    ``columnas`` memoriza el campo de cada clave del registro (None si no se usa).
+    """
+    campos = {}
+    for clave, valor in registro.items():
+        if clave not in columnas:
+            columnas[clave] = _CAMPOS.get(_normalizar(str(clave)))
+        campo = columnas[clave]
+        if campo is None or valor is None:
+            continue
+        if campo == "etiquetas":
+            if isinstance(valor, str):
+                valor = valor.split("|")
+            etiquetas = [e.strip() for e in map(str, valor) if e.strip()]
+            if etiquetas:
+                campos[campo] = etiquetas
+            continue
+        valor = str(valor).strip()
+        if valor:
+            campos[campo] = valor
+    return campos
+
+
+def leer_csv(ruta: Path) -> Iterator[Fila]:
+    """Filas de un CSV con encabezado (etiquetas separadas por '|')"""
+    columnas: Dict[str, Optional[str]] = {}
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        lector = csv.DictReader(f)
+        for registro in lector:
+            registro.pop(None, None)  # valores sobrantes sin encabezado
+            yield lector.line_num, _campos(registro, columnas), None
+
+
+def leer_jsonl(ruta: Path) -> Iterator[Fila]:
+    """Filas de un archivo con un objeto JSON por linea"""
+    columnas: Dict[str, Optional[str]] = {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        for numero, linea in enumerate(f, 1):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except ValueError as e:
+                yield numero, None, f"JSON no valido: {e}"
+                continue
+            if not isinstance(registro, dict):
+                yield numero, None, "se esperaba un objeto JSON"
+                continue
+            yield numero, _campos(registro, columnas), None
+
+
+def leer_filas(ruta: Path, formato: Optional[str] = None) -> Iterator[Fila]:
+    """Filas de ``ruta`` en formato ``csv`` o ``jsonl`` (por defecto, segun la extension)"""
+    ruta = Path(ruta)
+    if formato is None:
+        formato = "jsonl" if ruta.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+    if formato == "jsonl":
+        return leer_jsonl(ruta)
+    if formato == "csv":
+        return leer_csv(ruta)
+    raise ValueError(f"formato no soportado: {formato}")
+
+
+class InformeImportacion:
+    """Contadores de una importacion en curso o terminada
+
+    ``errores`` conserva solo los primeros MAX_ERRORES rechazos ("linea N: ...").
+    """
+
+    def __init__(self):
+        self.leidas = 0
+        self.importadas = 0
+        self.duplicadas = 0
+        self.invalidas = 0
+        self.guardados = 0
+        self.columnas_creadas: List[str] = []
+        self.errores: List[str] = []
+        self.completa = False
+        self.segundos = 0.0
+
+    @property
+    def por_segundo(self) -> float:
+        """Filas leidas por segundo"""
+        return self.leidas / self.segundos if self.segundos else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.leidas} filas: {self.importadas} importadas, "
+            f"{self.duplicadas} duplicadas, {self.invalidas} invalidas "
+            f"en {self.segundos:.1f} s ({self.por_segundo:.0f} filas/s)"
+        )
+
+
+class ImportadorTareas:
+    """Agrega a un proyecto las tareas de una secuencia de filas
+
+    Las filas se toman por bloques (de TAMANO_BLOQUE o del lote, si es menor):
+    se validan con ``ValidadorDatos.errores_tarea`` y las validas se convierten
+    en tareas al final de su columna. Cada ``tamano_lote`` tareas (o mas, ver
+    ``_umbral``) el proyecto se guarda y se llama a ``progreso`` con el informe.
+
+    Memoria: de la entrada solo se retiene un bloque de filas y las operaciones
+    pendientes de un lote, pero las tareas importadas quedan en el Proyecto,
+    porque los modelos y los gestores de persistencia trabajan con proyectos
+    completos en memoria. La memoria crece con el tamano del proyecto resultante
+    (como al cargarlo), no esta acotada por el tamano del lote.
+
+    Columna de cada fila: el campo ``columna`` (por nombre o ID, sin distinguir
+    mayusculas; se crea si no existe y ``crear_columnas``), si no la columna
+    con el nombre del estado y si no la primera. Las filas cuyo ``tarea_id`` ya
+    esta en el proyecto (o aparecio antes en la entrada) se cuentan como
+    duplicadas y se omiten.
+    """
+
+    def __init__(
+        self,
+        storage,
+        proyecto: Proyecto,
+        tamano_lote: int = TAMANO_LOTE,
+        crear_columnas: bool = True,
+        progreso: Optional[Callable[[InformeImportacion], None]] = None,
+    ):
+        self.storage = storage
+        self.proyecto = proyecto
+        self.tamano_lote = max(tamano_lote, 1)
+        self._tamano_bloque = min(TAMANO_BLOQUE, self.tamano_lote)
+        self.crear_columnas = crear_columnas
+        self.progreso = progreso
+        self.informe = InformeImportacion()
+        self._columnas: Dict[str, Columna] = {}
+        for columna in proyecto.columnas:
+            self._columnas.setdefault(columna.nombre.lower(), columna)
+        self._inicio = 0.0
+
+    def importar(self, filas: Iterable[Fila]) -> InformeImportacion:
+        """Importa las filas guardando por lotes y retorna el informe
+
+        Si un guardado falla la importacion se detiene (``completa`` queda en
+        False); los lotes ya guardados se conservan.
+        """
+        self._inicio = time.perf_counter()
+        filas = iter(filas)
+        pendientes = 0
+        while True:
+            bloque = list(islice(filas, self._tamano_bloque))
+            if not bloque:
+                break
+            with sin_recolector():
+                pendientes += self._procesar(bloque)
+            if pendientes >= self._umbral(pendientes):
+                if not self._guardar():
+                    return self.informe
+                pendientes = 0
+        if self.proyecto.operaciones_pendientes() and not self._guardar():
+            return self.informe
+        self.informe.completa = True
+        self.informe.segundos = time.perf_counter() - self._inicio
+        return self.informe
+
+    def _umbral(self, pendientes: int) -> int:
+        """Tareas pendientes a partir de las cuales se guarda
+
+        Si el gestor reescribe el proyecto entero en cada guardado
+        (``guardado_incremental`` falso) el lote crece hasta igualar lo ya
+        guardado: cada escritura al menos duplica la anterior y el coste total
+        de escribir es lineal en el numero de filas en lugar de cuadratico.
+        """
+        if getattr(self.storage, "guardado_incremental", False):
+            return self.tamano_lote
+        return max(self.tamano_lote, self.proyecto.contar_tareas() - pendientes)
+
+    def _procesar(self, bloque: List[Fila]) -> int:
+        """Valida un bloque y agrega sus tareas; retorna cuantas agrego"""
+        informe = self.informe
+        informe.leidas += len(bloque)
+        validas = []
+        for numero, campos, error in bloque:
+            errores = [error] if error else ValidadorDatos.errores_tarea(campos)
+            if errores:
+                self._rechazar(numero, "; ".join(errores))
+            else:
+                validas.append((numero, campos))
+
+        ahora = datetime.now()
+        agregadas = 0
+        for numero, campos in validas:
+            tarea_id = campos.get("tarea_id")
+            if tarea_id and self.proyecto.localizar_tarea(tarea_id) is not None:
+                informe.duplicadas += 1
+                continue
+            columna = self._columna(campos.pop("columna", None), campos.get("estado"))
+            if columna is None:
+                self._rechazar(numero, "columna no encontrada")
+                continue
+            columna.agregar_tarea(Tarea.from_dict(campos, ahora))
+            agregadas += 1
+        informe.importadas += agregadas
+        return agregadas
+
+    def _columna(self, nombre: Optional[str], estado: Optional[str]) -> Optional[Columna]:
+        """Columna destino de una fila (ver la clase); None si no se puede resolver"""
+        if nombre:
+            columna = self._columnas.get(nombre.lower()) or self.proyecto.obtener_columna(nombre)
+            if columna is not None or not self.crear_columnas:
+                return columna
+        else:
+            columna = self._columnas.get((estado or "").lower())
+            if columna is not None:
+                return columna
+            if self.proyecto.columnas:
+                return self.proyecto.columnas[0]
+            if not self.crear_columnas:
+                return None
+            nombre = estado or "Pendiente"
+        columna = self.proyecto.agregar_columna(nombre)
+        self._columnas[nombre.lower()] = columna
+        self.informe.columnas_creadas.append(nombre)
+        return columna
+
+    def _rechazar(self, numero: int, motivo: str):
+        self.informe.invalidas += 1
+        if len(self.informe.errores) < MAX_ERRORES:
+            self.informe.errores.append(f"linea {numero}: {motivo}")
+
+    def _guardar(self) -> bool:
+        """Guarda el proyecto y notifica el progreso"""
+        guardado = self.storage.guardar_proyecto(self.proyecto)
+        self.informe.segundos = time.perf_counter() - self._inicio
+        if not guardado:
+            return False
+        self.informe.guardados += 1
+        if self.progreso is not None:
+            self.progreso(self.informe)
+        return True
+
+
+def importar_tareas(
+    storage, proyecto: Proyecto, ruta: Path, formato: Optional[str] = None, **opciones
+) -> InformeImportacion:
+    """Importa las tareas de un archivo CSV o JSONL al proyecto (ver ImportadorTareas)"""
+    return ImportadorTareas(storage, proyecto, **opciones).importar(leer_filas(ruta, formato))
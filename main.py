@@ -1,13 +1,28 @@
 """
 Punto de entrada principal de la aplicación
 Project Manager - Gestor de Proyectos y Tareas
+
+Sin argumentos abre el menu interactivo; con argumentos ejecuta un comando o
+un lote de comandos sin preguntar nada (ver comandos.py), por ejemplo:
+
+    python main.py proyecto crear Web
+    python main.py tarea agregar Web Pendiente "Pantalla de login" -p Alta
+    python main.py lote comandos.txt
 """
 
+import sys
+
 from cli import CliInterface
 
 
-def main():
-    """Función principal"""
+def main(argumentos=None) -> int:
+    """Función principal; retorna el codigo de salida"""
+    argumentos = sys.argv[1:] if argumentos is None else argumentos
+    if argumentos:
+        from comandos import ejecutar_comandos
+
+        return ejecutar_comandos(argumentos)
+
     app = CliInterface()
     try:
         app.ejecutar()
@@ -16,7 +31,10 @@ def main():
         print("\033[93m" + "⚠ Aplicación interrumpida por el usuario" + "\033[0m")
     except Exception as e:
         print(f"\033[91m✗ Error: {e}\033[0m")
+    finally:
+        app.cerrar()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -3,19 +3,144 @@ Modelos de datos para el Proyecto Trello Manager
 Define las clases principales: Usuario, Proyecto, Columna y Tarea
 """
 
-from datetime import datetime
-from typing import Optional, List
+import gc
+import sys
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, List, Tuple
 import uuid
 
+import config
+
+# Receptor de operaciones: cada cambio hecho con los metodos de los modelos se
+# notifica como un registro pequeno (ver Proyecto.operaciones_pendientes)
+Observador = Callable[[Dict], None]
+
+
+def _internar(valor):
+    """Comparte una unica copia de valores repetidos como estado y prioridad"""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+@contextmanager
+def sin_recolector():
+    """Pausa el recolector de ciclos durante una carga masiva
+
+    Crear cientos de miles de objetos dispara muchas pasadas del recolector
+    que no liberan nada (los objetos recien creados siguen en uso).
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def _marca_de_tiempo(ranura: str, cache: Optional[str] = None) -> property:
+    """Fecha guardada en ``ranura`` y expuesta como texto ISO
+
+    La ranura contiene un ``datetime`` (fechas creadas en memoria, que solo
+    se formatean al leer el atributo o serializar) o el texto tal como se
+    cargo, que no se interpreta hasta que se pide la fecha nativa. Asignarla
+    descarta el diccionario cacheado en la ranura ``cache``, si se indica.
+    """
+    leer = attrgetter(ranura)
+
+    def obtener(self) -> Optional[str]:
+        valor = leer(self)
+        return valor.isoformat() if type(valor) is datetime else valor
+
+    def asignar(self, valor):
+        setattr(self, ranura, valor)
+        if cache is not None:
+            setattr(self, cache, None)
+
+    return property(obtener, asignar)
+
+
+def _momento(ranura: str) -> property:
+    """Fecha de ``ranura`` como ``datetime`` (None si falta o no es valida)
+
+    Un texto en el formato canonico de ``isoformat()`` se sustituye por la
+    fecha interpretada, ya que formatearla reproduce el mismo texto.
+    """
+    leer = attrgetter(ranura)
+
+    def obtener(self) -> Optional[datetime]:
+        valor = leer(self)
+        if type(valor) is not str:
+            return valor
+        try:
+            fecha = datetime.fromisoformat(valor)
+        except ValueError:
+            return None
+        if fecha.isoformat() == valor:
+            setattr(self, ranura, fecha)
+        return fecha
+
+    return property(obtener)
+
+
+def _campo_editable(
+    nombre: str, operacion: Callable[[object, str, object, object], Dict], internar: bool = False
+) -> property:
+    """Atributo ``nombre`` de un modelo guardado en la ranura ``_<nombre>``
+
+    Asignarle un valor distinto registra la operacion que crea
+    ``operacion(modelo, nombre, valor, anterior)`` con ``_notificar`` del
+    modelo: se descarta su diccionario cacheado y el proyecto (si lo hay)
+    anota el cambio, igual que con los metodos (``actualizar``, ``renombrar``).
+    """
+    ranura = f"_{nombre}"
+    leer = attrgetter(ranura)
+
+    def asignar(self, valor):
+        if internar:
+            valor = _internar(valor)
+        anterior = leer(self)
+        if valor != anterior:
+            setattr(self, ranura, valor)
+            self._notificar(operacion(self, nombre, valor, anterior))
+
+    return property(leer, asignar)
+
+
+def _renombrado_columna(columna: "Columna", campo: str, valor, anterior) -> Dict:
+    return {"op": "renombrar_columna", "columna_id": columna.columna_id, "nombre": valor}
+
+
+def _actualizacion_proyecto(proyecto: "Proyecto", campo: str, valor, anterior) -> Dict:
+    return {"op": "actualizar_proyecto", "campos": {campo: valor}}
+
+
+def _actualizacion_tarea(tarea: "Tarea", campo: str, valor, anterior) -> Dict:
+    return {
+        "op": "actualizar_tarea",
+        "tarea_id": tarea.tarea_id,
+        "campos": {campo: valor},
+        "anterior": {campo: anterior},
+    }
+
 
 class Usuario:
     """Representa un usuario del sistema"""
 
+    __slots__ = ("usuario_id", "nombre", "email", "_fecha_creacion")
+
+    fecha_creacion = _marca_de_tiempo("_fecha_creacion")
+    momento_creacion = _momento("_fecha_creacion")
+
     def __init__(self, nombre: str, email: str, usuario_id: Optional[str] = None):
         self.usuario_id = usuario_id or str(uuid.uuid4())
         self.nombre = nombre
         self.email = email
-        self.fecha_creacion = datetime.now().isoformat()
+        self._fecha_creacion = datetime.now()
 
     def to_dict(self) -> dict:
         """Convierte el usuario a diccionario"""
@@ -28,9 +153,15 @@ class Usuario:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Usuario":
-        """Crea un usuario desde diccionario"""
-        usuario = cls(data["nombre"], data["email"], data["usuario_id"])
-        usuario.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
+        """Crea un usuario desde diccionario (sin pasar por __init__)"""
+        usuario = cls.__new__(cls)
+        usuario.usuario_id = data["usuario_id"] or str(uuid.uuid4())
+        usuario.nombre = data["nombre"]
+        usuario.email = data["email"]
+        if "fecha_creacion" in data:
+            usuario._fecha_creacion = data["fecha_creacion"]
+        else:
+            usuario._fecha_creacion = datetime.now()
         return usuario
 
     def __repr__(self) -> str:
@@ -38,7 +169,56 @@ class Usuario:
 
 
 class Tarea:
-    """Representa una tarea dentro de una columna"""
+    """Representa una tarea dentro de una columna
+
+    Usa ``__slots__`` (sin ``__dict__`` por instancia), comparte los valores de
+    ``estado`` y ``prioridad`` entre tareas (cadenas internadas) y solo crea el
+    conjunto de etiquetas al anadir la primera. Las
+    fechas de creacion y modificacion se guardan como ``datetime`` (o como el
+    texto cargado) y se formatean en ISO al leerlas (ver ``_marca_de_tiempo``).
+
+    ``_a_dict`` (el de la persistencia) reutiliza el diccionario generado
+    mientras la tarea no cambie; ``to_dict`` retorna siempre una copia.
+    Asignar un campo (``tarea.estado = ...``) equivale a ``actualizar`` con
+    ese campo salvo que no cambia la fecha de modificacion (ver
+    ``_campo_editable``).
+
+    ``rango`` es la clave de orden de la tarea dentro de su columna (ver
+    ``Columna``); la asigna la columna al insertarla o moverla.
+
+    Las etiquetas son un conjunto ordenado (claves de un dict, en orden de
+    insercion): agregar, eliminar y ``tiene_etiqueta`` son O(1).
+    ``etiquetas`` retorna una tupla; se modifican con ``agregar_etiqueta`` y
+    ``eliminar_etiqueta`` (asignar la lista entera equivale a eliminarlas y
+    agregar las nuevas).
+    """
+
+    __slots__ = (
+        "tarea_id",
+        "_titulo",
+        "_descripcion",
+        "_prioridad",
+        "_asignado_a",
+        "_estado",
+        "_fecha_creacion",
+        "_fecha_modificacion",
+        "_fecha_vencimiento",
+        "_etiquetas",
+        "rango",
+        "_observador",
+        "_dict",
+    )
+
+    titulo = _campo_editable("titulo", _actualizacion_tarea)
+    descripcion = _campo_editable("descripcion", _actualizacion_tarea)
+    prioridad = _campo_editable("prioridad", _actualizacion_tarea, internar=True)
+    asignado_a = _campo_editable("asignado_a", _actualizacion_tarea)
+    estado = _campo_editable("estado", _actualizacion_tarea, internar=True)
+    fecha_vencimiento = _campo_editable("fecha_vencimiento", _actualizacion_tarea)
+    fecha_creacion = _marca_de_tiempo("_fecha_creacion", "_dict")
+    fecha_modificacion = _marca_de_tiempo("_fecha_modificacion", "_dict")
+    momento_creacion = _momento("_fecha_creacion")
+    momento_modificacion = _momento("_fecha_modificacion")
 
     def __init__(
         self,
@@ -49,15 +229,39 @@ class Tarea:
         tarea_id: Optional[str] = None,
     ):
         self.tarea_id = tarea_id or str(uuid.uuid4())
-        self.titulo = titulo
-        self.descripcion = descripcion
-        self.prioridad = prioridad
-        self.asignado_a = asignado_a
-        self.estado = "Pendiente"
-        self.fecha_creacion = datetime.now().isoformat()
-        self.fecha_modificacion = datetime.now().isoformat()
-        self.fecha_vencimiento: Optional[str] = None
-        self.etiquetas: List[str] = []
+        self._titulo = titulo
+        self._descripcion = descripcion
+        self._prioridad = _internar(prioridad)
+        self._asignado_a = asignado_a
+        self._estado = "Pendiente"
+        self._fecha_creacion = self._fecha_modificacion = datetime.now()
+        self._fecha_vencimiento: Optional[str] = None
+        self._etiquetas: Optional[Dict[str, None]] = None
+        self.rango = 0
+        self._observador: Optional[Observador] = None
+        self._dict: Optional[dict] = None
+
+    @property
+    def etiquetas(self) -> Tuple[str, ...]:
+        return tuple(self._etiquetas) if self._etiquetas else ()
+
+    @etiquetas.setter
+    def etiquetas(self, etiquetas: Iterable[str]):
+        nuevas = tuple(dict.fromkeys(etiquetas))
+        if nuevas == self.etiquetas:
+            return
+        for etiqueta in self.etiquetas:
+            self.eliminar_etiqueta(etiqueta)
+        for etiqueta in nuevas:
+            self.agregar_etiqueta(etiqueta)
+
+    def tiene_etiqueta(self, etiqueta: str) -> bool:
+        return self._etiquetas is not None and etiqueta in self._etiquetas
+
+    def _notificar(self, operacion: Dict):
+        self._dict = None
+        if self._observador is not None:
+            self._observador(operacion)
 
     def actualizar(self, **kwargs):
         """Actualiza atributos de la tarea"""
@@ -69,115 +273,601 @@ class Tarea:
             "estado",
             "fecha_vencimiento",
         ]
+        campos = {}
+        anterior = {}
         for key, value in kwargs.items():
             if key in permitidos:
-                setattr(self, key, value)
-        self.fecha_modificacion = datetime.now().isoformat()
+                if key in ("estado", "prioridad"):
+                    value = _internar(value)
+                anterior[key] = getattr(self, key)
+                campos[key] = value
+                setattr(self, f"_{key}", value)
+        self._fecha_modificacion = datetime.now()
+        campos["fecha_modificacion"] = self.fecha_modificacion
+        self._notificar(
+            {
+                "op": "actualizar_tarea",
+                "tarea_id": self.tarea_id,
+                "campos": campos,
+                "anterior": anterior,
+            }
+        )
 
     def agregar_etiqueta(self, etiqueta: str):
         """Agrega una etiqueta a la tarea"""
-        if etiqueta not in self.etiquetas:
-            self.etiquetas.append(etiqueta)
+        if self._etiquetas is None:
+            self._etiquetas = {}
+        if etiqueta not in self._etiquetas:
+            self._etiquetas[_internar(etiqueta)] = None
+            self._notificar(
+                {"op": "agregar_etiqueta", "tarea_id": self.tarea_id, "etiqueta": etiqueta}
+            )
 
     def eliminar_etiqueta(self, etiqueta: str):
         """Elimina una etiqueta de la tarea"""
-        if etiqueta in self.etiquetas:
-            self.etiquetas.remove(etiqueta)
+        if self._etiquetas and etiqueta in self._etiquetas:
+            del self._etiquetas[etiqueta]
+            if not self._etiquetas:
+                self._etiquetas = None
+            self._notificar(
+                {"op": "eliminar_etiqueta", "tarea_id": self.tarea_id, "etiqueta": etiqueta}
+            )
 
     def to_dict(self) -> dict:
-        """Convierte la tarea a diccionario"""
-        return {
-            "tarea_id": self.tarea_id,
-            "titulo": self.titulo,
-            "descripcion": self.descripcion,
-            "prioridad": self.prioridad,
-            "asignado_a": self.asignado_a,
-            "estado": self.estado,
-            "fecha_creacion": self.fecha_creacion,
-            "fecha_modificacion": self.fecha_modificacion,
-            "fecha_vencimiento": self.fecha_vencimiento,
-            "etiquetas": self.etiquetas,
-        }
+        """Convierte la tarea a diccionario (nuevo en cada llamada)"""
+        datos = self._a_dict()
+        return dict(datos, etiquetas=list(datos["etiquetas"]))
+
+    def _a_dict(self) -> dict:
+        """Diccionario de la tarea para la persistencia
+
+        Se comparte entre llamadas mientras la tarea no cambie: no debe
+        modificarse ni salir de los modelos y los gestores de persistencia.
+        """
+        datos = self._dict
+        if datos is None:
+            datos = self._dict = {
+                "tarea_id": self.tarea_id,
+                "titulo": self.titulo,
+                "descripcion": self.descripcion,
+                "prioridad": self.prioridad,
+                "asignado_a": self.asignado_a,
+                "estado": self.estado,
+                "fecha_creacion": self.fecha_creacion,
+                "fecha_modificacion": self.fecha_modificacion,
+                "fecha_vencimiento": self.fecha_vencimiento,
+                "etiquetas": list(self._etiquetas) if self._etiquetas else [],
+                "rango": self.rango,
+            }
+        return datos
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Tarea":
-        """Crea una tarea desde diccionario"""
-        tarea = cls(
-            data["titulo"],
-            data.get("descripcion", ""),
-            data.get("prioridad", "Media"),
-            data.get("asignado_a"),
-            data.get("tarea_id"),
-        )
-        tarea.estado = data.get("estado", "Pendiente")
-        tarea.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
-        tarea.fecha_modificacion = data.get(
-            "fecha_modificacion", datetime.now().isoformat()
-        )
-        tarea.fecha_vencimiento = data.get("fecha_vencimiento")
-        tarea.etiquetas = data.get("etiquetas", [])
+    def from_dict(cls, data: dict, ahora: Optional[datetime] = None) -> "Tarea":
+        """Crea una tarea desde diccionario
+
+        No pasa por ``__init__``: asigna las ranuras directamente y solo genera
+        el ID o las fechas si faltan en ``data`` (con ``ahora``, si se indica,
+        para compartir una unica marca de tiempo en cargas masivas).
+        """
+        tarea = cls.__new__(cls)
+        get = data.get
+        tarea.tarea_id = get("tarea_id") or str(uuid.uuid4())
+        tarea._titulo = data["titulo"]
+        tarea._descripcion = get("descripcion", "")
+        tarea._prioridad = _internar(get("prioridad", "Media"))
+        tarea._asignado_a = get("asignado_a")
+        tarea._estado = _internar(get("estado", "Pendiente"))
+        try:
+            tarea._fecha_creacion = data["fecha_creacion"]
+            tarea._fecha_modificacion = data["fecha_modificacion"]
+        except KeyError:
+            ahora = ahora or datetime.now()
+            tarea._fecha_creacion = get("fecha_creacion", ahora)
+            tarea._fecha_modificacion = get("fecha_modificacion", ahora)
+        tarea._fecha_vencimiento = get("fecha_vencimiento")
+        etiquetas = get("etiquetas")
+        tarea._etiquetas = dict.fromkeys(map(_internar, etiquetas)) if etiquetas else None
+        tarea.rango = get("rango")
+        tarea._observador = None
+        tarea._dict = None
         return tarea
 
     def __repr__(self) -> str:
         return f"Tarea({self.titulo}, {self.estado}, {self.prioridad})"
 
 
+_ESTADO = attrgetter("_estado")
+_PRIORIDAD = attrgetter("_prioridad")
+_ASIGNADO = attrgetter("_asignado_a")
+
+
+class ContadoresProyecto:
+    """Conteos de tareas de un proyecto por estado, prioridad, asignado y columna
+
+    El proyecto los actualiza en O(1) al agregar, eliminar, mover o actualizar
+    tareas con los metodos de los modelos, de modo que consultarlos no recorre
+    tareas. Las tareas sin asignar se cuentan bajo la clave "" y los valores
+    que llegan a cero desaparecen (salvo en ``por_columna``, que tiene una
+    entrada por columna).
+    """
+
+    __slots__ = ("total", "por_estado", "por_prioridad", "por_asignado", "por_columna")
+
+    def __init__(self):
+        self.total = 0
+        self.por_estado: Dict[str, int] = {}
+        self.por_prioridad: Dict[str, int] = {}
+        self.por_asignado: Dict[str, int] = {}
+        self.por_columna: Dict[str, int] = {}
+
+    @staticmethod
+    def _sumar(conteos: Dict[str, int], clave: str, delta: int):
+        cantidad = conteos.get(clave, 0) + delta
+        if cantidad:
+            conteos[clave] = cantidad
+        else:
+            conteos.pop(clave, None)
+
+    def _contar(self, estado, prioridad, asignado_a, columna_id: str, delta: int):
+        self.total += delta
+        self._sumar(self.por_estado, estado, delta)
+        self._sumar(self.por_prioridad, prioridad, delta)
+        self._sumar(self.por_asignado, asignado_a or "", delta)
+        self.por_columna[columna_id] = self.por_columna.get(columna_id, 0) + delta
+
+    def contar(self, tarea: "Tarea", columna_id: str, delta: int = 1):
+        """Suma (o resta, con ``delta=-1``) una tarea de la columna indicada"""
+        self._contar(tarea.estado, tarea.prioridad, tarea.asignado_a, columna_id, delta)
+
+    def contar_datos(self, tarea: Dict, columna_id: str, delta: int = 1):
+        """Como ``contar`` con una tarea en formato diccionario"""
+        self._contar(
+            tarea.get("estado", "Pendiente"),
+            tarea.get("prioridad", "Media"),
+            tarea.get("asignado_a"),
+            columna_id,
+            delta,
+        )
+
+    def actualizar(self, anterior: Dict, campos: Dict):
+        """Aplica el cambio de una operacion ``actualizar_tarea``"""
+        for campo, conteos in (
+            ("estado", self.por_estado),
+            ("prioridad", self.por_prioridad),
+            ("asignado_a", self.por_asignado),
+        ):
+            if campo in anterior:
+                antes, despues = anterior[campo], campos[campo]
+                if campo == "asignado_a":
+                    antes, despues = antes or "", despues or ""
+                if antes != despues:
+                    self._sumar(conteos, antes, -1)
+                    self._sumar(conteos, despues, 1)
+
+    def quitar_columna(self, columna: "Columna"):
+        """Descuenta una columna eliminada y todas sus tareas"""
+        for tarea in columna._tareas.values():
+            self.contar(tarea, columna.columna_id, -1)
+        self.por_columna.pop(columna.columna_id, None)
+
+    @classmethod
+    def calcular(cls, columnas: Iterable["Columna"]) -> "ContadoresProyecto":
+        """Cuenta desde cero las tareas de las columnas"""
+        contadores = cls()
+        estados, prioridades, asignados = Counter(), Counter(), Counter()
+        for columna in columnas:
+            tareas = columna._tareas.values()
+            contadores.por_columna[columna.columna_id] = len(tareas)
+            contadores.total += len(tareas)
+            estados.update(map(_ESTADO, tareas))
+            prioridades.update(map(_PRIORIDAD, tareas))
+            asignados.update(map(_ASIGNADO, tareas))
+        sin_asignar = asignados.pop(None, 0)
+        if sin_asignar:
+            asignados[""] += sin_asignar
+        contadores.por_estado = dict(estados)
+        contadores.por_prioridad = dict(prioridades)
+        contadores.por_asignado = dict(asignados)
+        return contadores
+
+    @classmethod
+    def desde_datos(cls, columnas: Iterable[Dict]) -> "ContadoresProyecto":
+        """Cuenta las tareas de columnas en formato diccionario (sin crear modelos)"""
+        contadores = cls()
+        for columna in columnas:
+            columna_id = columna["columna_id"]
+            contadores.por_columna[columna_id] = 0
+            for tarea in columna.get("tareas", []):
+                contadores.contar_datos(tarea, columna_id)
+        return contadores
+
+    @classmethod
+    def persistidos(
+        cls, data: Optional[dict], tareas_por_columna: Dict[str, int]
+    ) -> Optional["ContadoresProyecto"]:
+        """Contadores guardados con un proyecto si cuadran con sus columnas
+
+        Solo se compara el numero de tareas de cada columna (sin recorrerlas);
+        None si faltan o no coinciden (datos anteriores a los contadores o
+        editados fuera de la aplicacion): entonces hay que calcularlos.
+        """
+        if not data:
+            return None
+        contadores = cls.from_dict(data)
+        por_columna = contadores.por_columna
+        if por_columna != tareas_por_columna or contadores.total != sum(por_columna.values()):
+            return None
+        return contadores
+
+    def to_dict(self) -> dict:
+        """Convierte los contadores a diccionario"""
+        return {
+            "total": self.total,
+            "por_estado": dict(self.por_estado),
+            "por_prioridad": dict(self.por_prioridad),
+            "por_asignado": dict(self.por_asignado),
+            "por_columna": dict(self.por_columna),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ContadoresProyecto":
+        """Crea los contadores desde diccionario"""
+        contadores = cls()
+        contadores.total = data.get("total", 0)
+        contadores.por_estado = dict(data.get("por_estado", {}))
+        contadores.por_prioridad = dict(data.get("por_prioridad", {}))
+        contadores.por_asignado = dict(data.get("por_asignado", {}))
+        contadores.por_columna = dict(data.get("por_columna", {}))
+        return contadores
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, ContadoresProyecto):
+            return NotImplemented
+        return self.to_dict() == otro.to_dict()
+
+    def __repr__(self) -> str:
+        return f"ContadoresProyecto({self.total} tareas)"
+
+
+# Distancia entre rangos al numerar una columna: deja sitio para unas 32
+# inserciones seguidas en el mismo hueco antes de tener que renumerarla
+SEPARACION_RANGO = 1 << 32
+
+
+def rangos_ordenados(rangos: List) -> bool:
+    """Indica si los rangos son enteros estrictamente crecientes"""
+    if any(type(rango) is not int for rango in rangos):
+        return False
+    return all(a < b for a, b in zip(rangos, islice(rangos, 1, None)))
+
+
+def numerar_rangos(cantidad: int) -> List[int]:
+    """Rangos equiespaciados para ``cantidad`` tareas consecutivas"""
+    return list(range(SEPARACION_RANGO, (cantidad + 1) * SEPARACION_RANGO, SEPARACION_RANGO))
+
+
+_EPOCA = datetime(1970, 1, 1)
+_SEGUNDO = timedelta(seconds=1)
+# Marca de fecha ausente o invalida en los indices que guardan epochs
+SIN_FECHA = -(2 ** 63)
+
+
+def epoch(valor) -> int:
+    """Segundos desde 1970 de un datetime o fecha ISO (SIN_FECHA si no es valida)
+
+    A las fechas con zona horaria se les quita la zona: cuenta la hora escrita.
+    """
+    if type(valor) is datetime:
+        fecha = valor
+    else:
+        try:
+            fecha = datetime.fromisoformat(valor)
+        except (ValueError, TypeError):
+            return SIN_FECHA
+    if fecha.tzinfo is not None:
+        fecha = fecha.replace(tzinfo=None)
+    return (fecha - _EPOCA) // _SEGUNDO
+
+
 class Columna:
-    """Representa una columna en el tablero"""
+    """Representa una columna en el tablero
+
+    Las tareas se guardan en un diccionario ``tarea_id -> Tarea`` (buscar y
+    comprobar por ID es O(1)) y en una lista ordenada por ``Tarea.rango``, un
+    entero persistido con cada tarea. Una posicion se localiza con busqueda
+    binaria sobre los rangos, O(log n), y colocar una tarea entre dos vecinas
+    solo le asigna el punto medio de sus rangos: reordenar cambia una tarea,
+    no la columna entera. Si dos vecinas no dejan hueco la columna se
+    renumera (operacion ``renumerar_columna``). ``tareas`` es una tupla (de
+    solo lectura) que se reconstruye tras cada cambio.
+
+    Dentro de un proyecto, ``_a_dict`` reutiliza el diccionario generado hasta
+    que cambia la columna o alguna de sus tareas (el proyecto lo descarta al
+    registrar operaciones sobre ellas, tambien las de asignar ``nombre`` o un
+    campo de una tarea).
+    """
+
+    __slots__ = (
+        "columna_id",
+        "_nombre",
+        "orden",
+        "_tareas",
+        "_orden",
+        "_rangos",
+        "_lista",
+        "_fecha_creacion",
+        "_proyecto",
+        "_observador",
+        "_dict",
+    )
+
+    nombre = _campo_editable("nombre", _renombrado_columna)
+    fecha_creacion = _marca_de_tiempo("_fecha_creacion", "_dict")
+    momento_creacion = _momento("_fecha_creacion")
 
     def __init__(self, nombre: str, orden: int = 0, columna_id: Optional[str] = None):
         self.columna_id = columna_id or str(uuid.uuid4())
-        self.nombre = nombre
+        self._nombre = nombre
         self.orden = orden
-        self.tareas: List[Tarea] = []
-        self.fecha_creacion = datetime.now().isoformat()
+        self._tareas: Dict[str, Tarea] = {}
+        # Tareas y sus rangos en listas paralelas ordenadas por rango
+        self._orden: List[Tarea] = []
+        self._rangos: List[int] = []
+        self._lista: Optional[Tuple[Tarea, ...]] = None
+        self._fecha_creacion = datetime.now()
+        self._proyecto: Optional["Proyecto"] = None
+        self._observador: Optional[Observador] = None
+        self._dict: Optional[dict] = None
+
+    @property
+    def tareas(self) -> Tuple[Tarea, ...]:
+        """Tareas en orden (se modifican con agregar_tarea/eliminar_tarea)"""
+        if self._lista is None:
+            self._lista = tuple(self._orden)
+        return self._lista
+
+    @tareas.setter
+    def tareas(self, tareas: Iterable[Tarea]):
+        self._tareas = {tarea.tarea_id: tarea for tarea in tareas}
+        self._orden = list(self._tareas.values())
+        self._asignar_rangos(numerar_rangos(len(self._orden)))
+        if self._proyecto is not None:
+            self._proyecto._reindexar()
+
+    def _asignar_rangos(self, rangos: List[int]):
+        """Asigna ``rangos`` a las tareas en su orden actual"""
+        for tarea, rango in zip(self._orden, rangos):
+            if tarea.rango != rango:
+                tarea.rango = rango
+                tarea._dict = None
+        self._rangos = rangos
+        self._lista = None
+        self._dict = None
 
-    def agregar_tarea(self, tarea: Tarea) -> bool:
-        """Agrega una tarea a la columna"""
-        if tarea not in self.tareas:
-            self.tareas.append(tarea)
+    def _notificar(self, operacion: Dict):
+        self._dict = None
+        if self._observador is not None:
+            self._observador(operacion)
+
+    def _conectar(self, proyecto: Optional["Proyecto"]):
+        """Asocia la columna a su proyecto (indice de tareas y registro de operaciones)"""
+        self._proyecto = proyecto
+        self._dict = None
+        self._observador = proyecto._registrar if proyecto is not None else None
+        for tarea in self._orden:
+            tarea._observador = self._observador
+
+    def _renumerar(self):
+        """Vuelve a espaciar los rangos cuando no queda hueco entre dos tareas"""
+        self._asignar_rangos(numerar_rangos(len(self._orden)))
+        self._notificar({"op": "renumerar_columna", "columna_id": self.columna_id})
+
+    def _rango_entre(self, anterior: int, siguiente: int) -> int:
+        """Rango entre las tareas en las posiciones ``anterior`` y ``siguiente``
+
+        Los extremos se indican con -1 y ``len``. Si no queda hueco entre ambas,
+        renumera la columna antes de calcularlo.
+        """
+        rangos = self._rangos
+        if anterior < 0:
+            return rangos[siguiente] - SEPARACION_RANGO if rangos else SEPARACION_RANGO
+        if siguiente >= len(rangos):
+            return rangos[anterior] + SEPARACION_RANGO
+        if rangos[siguiente] - rangos[anterior] < 2:
+            self._renumerar()
+            rangos = self._rangos
+        return (rangos[anterior] + rangos[siguiente]) // 2
+
+    def _ubicar(self, tarea: Tarea, rango: int):
+        """Inserta la tarea en el orden con el rango indicado"""
+        tarea.rango = rango
+        tarea._dict = None
+        posicion = bisect_left(self._rangos, rango)
+        self._orden.insert(posicion, tarea)
+        self._rangos.insert(posicion, rango)
+        self._lista = None
+
+    def _descolocar(self, tarea: Tarea):
+        """Quita la tarea del orden"""
+        posicion = bisect_left(self._rangos, tarea.rango)
+        del self._orden[posicion]
+        del self._rangos[posicion]
+        self._lista = None
+
+    def _insertar(self, tarea: Tarea, posicion: Optional[int] = None):
+        """Anade una tarea en ``posicion`` (None = al final) sin notificar su alta"""
+        if posicion is None or posicion > len(self._orden):
+            posicion = len(self._orden)
+        posicion = max(posicion, 0)
+        self._ubicar(tarea, self._rango_entre(posicion - 1, posicion))
+        self._tareas[tarea.tarea_id] = tarea
+        self._dict = None
+        tarea._observador = self._observador
+        if self._proyecto is not None:
+            self._proyecto._ubicaciones[tarea.tarea_id] = self
+            self._proyecto._contadores.contar(tarea, self.columna_id)
+
+    def renombrar(self, nombre: str):
+        """Cambia el nombre de la columna (igual que asignar ``nombre``)"""
+        self.nombre = nombre
+
+    def agregar_tarea(self, tarea: Tarea, posicion: Optional[int] = None) -> bool:
+        """Agrega una tarea a la columna en ``posicion`` (por defecto al final)"""
+        if tarea.tarea_id not in self._tareas:
+            self._insertar(tarea, posicion)
+            self._notificar(
+                {
+                    "op": "agregar_tarea",
+                    "columna_id": self.columna_id,
+                    "tarea": tarea._a_dict(),
+                }
+            )
             return True
         return False
 
+    def _extraer_tarea(self, tarea_id: str) -> Optional[Tarea]:
+        """Quita una tarea sin notificar (la operacion la registra quien llama)"""
+        tarea = self._tareas.pop(tarea_id, None)
+        if tarea is not None:
+            self._descolocar(tarea)
+            self._dict = None
+            if self._proyecto is not None:
+                ubicaciones = self._proyecto._ubicaciones
+                if ubicaciones.get(tarea_id) is self:
+                    del ubicaciones[tarea_id]
+                self._proyecto._contadores.contar(tarea, self.columna_id, -1)
+        return tarea
+
     def eliminar_tarea(self, tarea_id: str) -> bool:
         """Elimina una tarea de la columna"""
-        for i, tarea in enumerate(self.tareas):
-            if tarea.tarea_id == tarea_id:
-                self.tareas.pop(i)
-                return True
-        return False
+        tarea = self._extraer_tarea(tarea_id)
+        if tarea is None:
+            return False
+        tarea._observador = None
+        self._notificar(
+            {"op": "eliminar_tarea", "columna_id": self.columna_id, "tarea_id": tarea_id}
+        )
+        return True
+
+    def posicion_tarea(self, tarea_id: str) -> Optional[int]:
+        """Posicion de la tarea en la columna (0 = primera) o None si no esta"""
+        tarea = self._tareas.get(tarea_id)
+        if tarea is None:
+            return None
+        return bisect_left(self._rangos, tarea.rango)
+
+    def reordenar_tarea(self, tarea_id: str, posicion: int) -> bool:
+        """Mueve una tarea a ``posicion`` dentro de la columna
+
+        Solo cambia el rango de la tarea movida. Retorna False si la tarea no
+        esta en la columna o ya ocupa esa posicion.
+        """
+        tarea = self._tareas.get(tarea_id)
+        if tarea is None:
+            return False
+        posicion = min(max(posicion, 0), len(self._orden) - 1)
+        actual = bisect_left(self._rangos, tarea.rango)
+        if posicion == actual:
+            return False
+        # Vecinas en la posicion de destino, sin contar la propia tarea
+        if posicion < actual:
+            rango = self._rango_entre(posicion - 1, posicion)
+        else:
+            rango = self._rango_entre(posicion, posicion + 1)
+        self._descolocar(tarea)
+        self._ubicar(tarea, rango)
+        self._notificar(
+            {
+                "op": "reordenar_tarea",
+                "columna_id": self.columna_id,
+                "tarea_id": tarea_id,
+                "rango": tarea.rango,
+            }
+        )
+        return True
+
+    def subir_tarea(self, tarea_id: str) -> bool:
+        """Adelanta una posicion la tarea"""
+        posicion = self.posicion_tarea(tarea_id)
+        return posicion is not None and posicion > 0 and self.reordenar_tarea(
+            tarea_id, posicion - 1
+        )
+
+    def bajar_tarea(self, tarea_id: str) -> bool:
+        """Retrasa una posicion la tarea"""
+        posicion = self.posicion_tarea(tarea_id)
+        return posicion is not None and self.reordenar_tarea(tarea_id, posicion + 1)
 
     def obtener_tarea(self, tarea_id: str) -> Optional[Tarea]:
         """Obtiene una tarea por ID"""
-        for tarea in self.tareas:
-            if tarea.tarea_id == tarea_id:
-                return tarea
-        return None
+        return self._tareas.get(tarea_id)
+
+    def contiene_tarea(self, tarea_id: str) -> bool:
+        """Indica si la tarea esta en la columna"""
+        return tarea_id in self._tareas
 
     def listar_tareas(self) -> List[Tarea]:
-        """Retorna todas las tareas de la columna"""
-        return self.tareas
+        """Retorna todas las tareas de la columna (lista nueva)"""
+        return list(self.tareas)
 
     def contar_tareas(self) -> int:
         """Cuenta el nÃºmero de tareas"""
-        return len(self.tareas)
+        return len(self._tareas)
 
     def to_dict(self) -> dict:
-        """Convierte la columna a diccionario"""
-        return {
-            "columna_id": self.columna_id,
-            "nombre": self.nombre,
-            "orden": self.orden,
-            "tareas": [tarea.to_dict() for tarea in self.tareas],
-            "fecha_creacion": self.fecha_creacion,
-        }
+        """Convierte la columna a diccionario (nuevo en cada llamada)"""
+        return dict(self._a_dict(), tareas=[tarea.to_dict() for tarea in self._orden])
+
+    def _a_dict(self) -> dict:
+        """Diccionario de la columna para la persistencia (compartido, como
+        ``Tarea._a_dict``: no modificarlo)"""
+        datos = self._dict
+        if datos is None:
+            datos = {
+                "columna_id": self.columna_id,
+                "nombre": self.nombre,
+                "orden": self.orden,
+                "tareas": [tarea._a_dict() for tarea in self._orden],
+                "fecha_creacion": self.fecha_creacion,
+            }
+            if self._proyecto is not None:
+                self._dict = datos
+        return datos
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Columna":
-        """Crea una columna desde diccionario"""
-        columna = cls(data["nombre"], data.get("orden", 0), data.get("columna_id"))
-        columna.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
-        columna.tareas = [Tarea.from_dict(t) for t in data.get("tareas", [])]
+    def from_dict(cls, data: dict, ahora: Optional[datetime] = None) -> "Columna":
+        """Crea una columna y sus tareas desde diccionario (sin pasar por __init__)
+
+        Las tareas conservan el orden de la lista; si sus rangos faltan (datos
+        anteriores a los rangos) o no siguen ese orden, se numeran de nuevo.
+        """
+        columna = cls.__new__(cls)
+        get = data.get
+        columna.columna_id = get("columna_id") or str(uuid.uuid4())
+        columna._nombre = data["nombre"]
+        columna.orden = get("orden", 0)
+        if "fecha_creacion" in data:
+            columna._fecha_creacion = data["fecha_creacion"]
+        else:
+            columna._fecha_creacion = ahora or datetime.now()
+        tareas = {}
+        tarea_desde_dict = Tarea.from_dict
+        for datos_tarea in get("tareas", ()):
+            tarea = tarea_desde_dict(datos_tarea, ahora)
+            tareas[tarea.tarea_id] = tarea
+        columna._tareas = tareas
+        columna._orden = orden = list(tareas.values())
+        rangos = [tarea.rango for tarea in orden]
+        if rangos_ordenados(rangos):
+            columna._rangos = rangos
+        else:
+            columna._rangos = rangos = numerar_rangos(len(orden))
+            for tarea, rango in zip(orden, rangos):
+                tarea.rango = rango
+        columna._lista = None
+        columna._proyecto = None
+        columna._observador = None
+        columna._dict = None
         return columna
 
     def __repr__(self) -> str:
@@ -187,6 +877,34 @@ class Columna:
 class Proyecto:
     """Representa un proyecto con mÃºltiples columnas y tareas"""
 
+    __slots__ = (
+        "proyecto_id",
+        "_nombre",
+        "_descripcion",
+        "_propietario_id",
+        "_operaciones",
+        "_columnas",
+        "_columnas_por_id",
+        "_ubicaciones",
+        "_contadores",
+        "miembros",
+        "_fecha_creacion",
+        "_fecha_modificacion",
+        "version",
+        "_columnas_base",
+        "_tareas_base",
+        "_revision",
+        "_derivados",
+    )
+
+    nombre = _campo_editable("nombre", _actualizacion_proyecto)
+    descripcion = _campo_editable("descripcion", _actualizacion_proyecto)
+    propietario_id = _campo_editable("propietario_id", _actualizacion_proyecto)
+    fecha_creacion = _marca_de_tiempo("_fecha_creacion")
+    fecha_modificacion = _marca_de_tiempo("_fecha_modificacion")
+    momento_creacion = _momento("_fecha_creacion")
+    momento_modificacion = _momento("_fecha_modificacion")
+
     def __init__(
         self,
         nombre: str,
@@ -195,37 +913,178 @@ class Proyecto:
         proyecto_id: Optional[str] = None,
     ):
         self.proyecto_id = proyecto_id or str(uuid.uuid4())
-        self.nombre = nombre
-        self.descripcion = descripcion
-        self.propietario_id = propietario_id
+        self._nombre = nombre
+        self._descripcion = descripcion
+        self._propietario_id = propietario_id
+        # Operaciones hechas desde la ultima version persistida, en orden
+        self._operaciones: List[Dict] = []
+        # Contador de cambios del contenido y estructuras derivadas de el
+        self._revision = 0
+        self._derivados: Dict[str, Tuple[int, object]] = {}
+        # Conteos de tareas mantenidos con cada operacion (ver ContadoresProyecto)
+        self._contadores = ContadoresProyecto()
         self.columnas: List[Columna] = []
         self.miembros: List[str] = []
-        self.fecha_creacion = datetime.now().isoformat()
-        self.fecha_modificacion = datetime.now().isoformat()
+        self._fecha_creacion = self._fecha_modificacion = datetime.now()
+        # Control de concurrencia optimista: version guardada y columnas y
+        # tareas que existian en ella (para distinguir altas de bajas al fusionar)
+        self.version = 0
+        self._columnas_base: FrozenSet[str] = frozenset()
+        self._tareas_base: FrozenSet[str] = frozenset()
+
+    @property
+    def columnas(self) -> Tuple[Columna, ...]:
+        """Columnas del proyecto (se modifican con agregar_columna/eliminar_columna)"""
+        return tuple(self._columnas)
+
+    @columnas.setter
+    def columnas(self, columnas: Iterable[Columna]):
+        self._columnas = list(columnas)
+        self._reindexar()
+
+    def _reindexar(self, contadores: Optional[ContadoresProyecto] = None):
+        """Reconstruye los indices columna_id -> Columna y tarea_id -> Columna y
+        los contadores (salvo que se indiquen ya calculados)"""
+        self._revision += 1
+        self._columnas_por_id = {}
+        self._ubicaciones = {}
+        for columna in self._columnas:
+            columna._conectar(self)
+            self._columnas_por_id[columna.columna_id] = columna
+            self._ubicaciones.update(dict.fromkeys(columna._tareas, columna))
+        if contadores is None:
+            contadores = ContadoresProyecto.calcular(self._columnas)
+        self._contadores = contadores
+
+    def _registrar(self, operacion: Dict):
+        self._revision += 1
+        self._operaciones.append(operacion)
+        # Una tarea cambio: su columna debe volver a serializarse
+        columna = self._ubicaciones.get(operacion.get("tarea_id"))
+        if columna is not None:
+            columna._dict = None
+        if operacion["op"] == "actualizar_tarea":
+            self._contadores.actualizar(operacion["anterior"], operacion["campos"])
+        if self._derivados:
+            self._actualizar_derivados(operacion)
+        if config.VERIFICAR_CONTADORES:
+            self.verificar_contadores()
+
+    @property
+    def contadores(self) -> ContadoresProyecto:
+        """Conteos de tareas al dia (no modificar)"""
+        return self._contadores
+
+    def verificar_contadores(self):
+        """Recalcula los contadores desde las tareas y lanza AssertionError si difieren"""
+        recalculados = ContadoresProyecto.calcular(self._columnas)
+        if self._contadores != recalculados:
+            raise AssertionError(
+                f"Contadores desfasados: {self._contadores.to_dict()} != {recalculados.to_dict()}"
+            )
+
+    def _registrar_proyecto(self, operacion: Dict):
+        """Registra una operacion que tambien cambia la fecha de modificacion"""
+        self._actualizar_fecha_modificacion()
+        operacion["fecha_modificacion"] = self.fecha_modificacion
+        self._registrar(operacion)
+
+    # Asignar nombre, descripcion o propietario_id (ver _campo_editable)
+    _notificar = _registrar_proyecto
+
+    def operaciones_pendientes(self) -> List[Dict]:
+        """Operaciones hechas sobre el proyecto desde que se cargo o guardo
+
+        Se registran los cambios hechos con los metodos de los modelos
+        (``actualizar``, ``agregar_tarea``, ``mover_tarea``, ``renombrar``...)
+        y al asignar los campos editables de tareas, columnas y del proyecto.
+        Las tareas y columnas de las operaciones son los diccionarios compartidos
+        de ``_a_dict``: son de solo lectura.
+        """
+        return list(self._operaciones)
 
     def agregar_columna(self, nombre: str) -> Columna:
         """Agrega una nueva columna al proyecto"""
         orden = len(self.columnas)
         columna = Columna(nombre, orden)
-        self.columnas.append(columna)
-        self._actualizar_fecha_modificacion()
+        self._columnas.append(columna)
+        self._columnas_por_id[columna.columna_id] = columna
+        self._contadores.por_columna[columna.columna_id] = 0
+        columna._conectar(self)
+        self._registrar_proyecto({"op": "agregar_columna", "columna": columna._a_dict()})
         return columna
 
     def eliminar_columna(self, columna_id: str) -> bool:
         """Elimina una columna del proyecto"""
-        for i, columna in enumerate(self.columnas):
-            if columna.columna_id == columna_id:
-                self.columnas.pop(i)
-                self._actualizar_fecha_modificacion()
-                return True
-        return False
+        columna = self._columnas_por_id.pop(columna_id, None)
+        if columna is None:
+            return False
+        self._columnas.remove(columna)
+        for tarea_id in columna._tareas:
+            if self._ubicaciones.get(tarea_id) is columna:
+                del self._ubicaciones[tarea_id]
+        self._contadores.quitar_columna(columna)
+        columna._conectar(None)
+        self._registrar_proyecto({"op": "eliminar_columna", "columna_id": columna_id})
+        return True
+
+    def mover_tarea(
+        self, tarea_id: str, columna_destino_id: str, posicion: Optional[int] = None
+    ) -> bool:
+        """Mueve una tarea a otra columna, en ``posicion`` (por defecto al final)"""
+        destino = self._columnas_por_id.get(columna_destino_id)
+        origen = self._ubicaciones.get(tarea_id)
+        if destino is None or origen is None or origen is destino:
+            return False
+        destino._insertar(origen._extraer_tarea(tarea_id), posicion)
+        self._registrar(
+            {
+                "op": "mover_tarea",
+                "tarea_id": tarea_id,
+                "desde": origen.columna_id,
+                "hacia": destino.columna_id,
+                "rango": destino._tareas[tarea_id].rango,
+            }
+        )
+        return True
+
+    def derivado(self, nombre: str, construir: Callable[["Proyecto"], object]):
+        """Estructura derivada de las tareas, cacheada mientras no cambien
+
+        Se reconstruye con ``construir(proyecto)`` si hubo operaciones desde la
+        ultima vez, salvo que la estructura las haya aplicado ella misma (ver
+        ``_actualizar_derivados``). Asignar los campos de tareas y columnas
+        tambien registra operaciones; modificar las ranuras internas no.
+        """
+        entrada = self._derivados.get(nombre)
+        if entrada is None or entrada[0] != self._revision:
+            entrada = (self._revision, construir(self))
+            self._derivados[nombre] = entrada
+        return entrada[1]
+
+    def _actualizar_derivados(self, operacion: Dict):
+        """Mantiene vigentes las estructuras derivadas que aplican la operacion
+
+        Las que definen ``aplicar_operacion(proyecto, operacion)`` y devuelven
+        True siguen al dia; el resto se reconstruye en el siguiente acceso.
+        """
+        for nombre, (revision, valor) in list(self._derivados.items()):
+            if revision != self._revision - 1:
+                continue
+            aplicar = getattr(valor, "aplicar_operacion", None)
+            if aplicar is not None and aplicar(self, operacion):
+                self._derivados[nombre] = (self._revision, valor)
+
+    def localizar_tarea(self, tarea_id: str) -> Optional[Tuple[Columna, Tarea]]:
+        """Retorna (columna, tarea) para un ID de tarea, o None si no existe"""
+        columna = self._ubicaciones.get(tarea_id)
+        if columna is None:
+            return None
+        return columna, columna._tareas[tarea_id]
 
     def obtener_columna(self, columna_id: str) -> Optional[Columna]:
         """Obtiene una columna por ID"""
-        for columna in self.columnas:
-            if columna.columna_id == columna_id:
-                return columna
-        return None
+        return self._columnas_por_id.get(columna_id)
 
     def listar_columnas(self) -> List[Columna]:
         """Retorna todas las columnas ordenadas"""
@@ -235,7 +1094,7 @@ class Proyecto:
         """Agrega un miembro al proyecto"""
         if usuario_id not in self.miembros:
             self.miembros.append(usuario_id)
-            self._actualizar_fecha_modificacion()
+            self._registrar_proyecto({"op": "agregar_miembro", "usuario_id": usuario_id})
             return True
         return False
 
@@ -243,7 +1102,7 @@ class Proyecto:
         """Elimina un miembro del proyecto"""
         if usuario_id in self.miembros:
             self.miembros.remove(usuario_id)
-            self._actualizar_fecha_modificacion()
+            self._registrar_proyecto({"op": "eliminar_miembro", "usuario_id": usuario_id})
             return True
         return False
 
@@ -256,40 +1115,92 @@ class Proyecto:
 
     def contar_tareas(self) -> int:
         """Cuenta el nÃºmero total de tareas"""
-        return sum(columna.contar_tareas() for columna in self.columnas)
+        return self._contadores.total
+
+    def marcar_como_base(self, version: int):
+        """Registra el estado actual como la version ``version`` persistida"""
+        self.version = version
+        self._operaciones = []
+        self._columnas_base = frozenset(self._columnas_por_id)
+        self._tareas_base = frozenset(self._ubicaciones)
+
+    def restaurar_contenido(self, columnas: List[Dict], miembros: List[str]):
+        """Reemplaza columnas y miembros con datos persistidos (sin registrar operaciones)"""
+        self.columnas = [Columna.from_dict(c) for c in columnas]
+        self.miembros = list(miembros)
 
     def _actualizar_fecha_modificacion(self):
         """Actualiza la fecha de modificaciÃ³n"""
-        self.fecha_modificacion = datetime.now().isoformat()
+        self._fecha_modificacion = datetime.now()
 
     def to_dict(self) -> dict:
-        """Convierte el proyecto a diccionario"""
+        """Convierte el proyecto a diccionario (nuevo en cada llamada, se
+        puede modificar sin afectar al proyecto)"""
+        with sin_recolector():
+            columnas = [columna.to_dict() for columna in self.columnas]
+        return self._a_dict(columnas)
+
+    def _a_dict(self, columnas: Optional[List[dict]] = None) -> dict:
+        """Diccionario del proyecto para la persistencia
+
+        El diccionario del proyecto es nuevo en cada llamada; los de columnas
+        y tareas se reutilizan si no cambiaron (ver ``Columna._a_dict``) y no
+        deben modificarse.
+        """
+        if columnas is None:
+            with sin_recolector():
+                columnas = [columna._a_dict() for columna in self.columnas]
         return {
             "proyecto_id": self.proyecto_id,
             "nombre": self.nombre,
             "descripcion": self.descripcion,
             "propietario_id": self.propietario_id,
-            "columnas": [columna.to_dict() for columna in self.columnas],
-            "miembros": self.miembros,
+            "columnas": columnas,
+            "miembros": list(self.miembros),
             "fecha_creacion": self.fecha_creacion,
             "fecha_modificacion": self.fecha_modificacion,
+            "version": self.version,
+            "estadisticas": self._contadores.to_dict(),
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Proyecto":
-        """Crea un proyecto desde diccionario"""
-        proyecto = cls(
-            data["nombre"],
-            data.get("descripcion", ""),
-            data.get("propietario_id"),
-            data.get("proyecto_id"),
-        )
-        proyecto.columnas = [Columna.from_dict(c) for c in data.get("columnas", [])]
-        proyecto.miembros = data.get("miembros", [])
-        proyecto.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
-        proyecto.fecha_modificacion = data.get(
-            "fecha_modificacion", datetime.now().isoformat()
+        """Crea un proyecto con sus columnas y tareas desde diccionario
+
+        No pasa por ``__init__`` (ver ``Tarea.from_dict``), los indices y
+        contadores se construyen una sola vez con todas las columnas y el
+        recolector de ciclos se pausa mientras tanto.
+        """
+        with sin_recolector():
+            return cls._desde_dict(data)
+
+    @classmethod
+    def _desde_dict(cls, data: dict) -> "Proyecto":
+        proyecto = cls.__new__(cls)
+        get = data.get
+        ahora = datetime.now()
+        proyecto.proyecto_id = get("proyecto_id") or str(uuid.uuid4())
+        proyecto._nombre = data["nombre"]
+        proyecto._descripcion = get("descripcion", "")
+        proyecto._propietario_id = get("propietario_id")
+        proyecto._operaciones = []
+        proyecto._revision = 0
+        proyecto._derivados = {}
+        columna_desde_dict = Columna.from_dict
+        proyecto._columnas = [columna_desde_dict(c, ahora) for c in get("columnas", ())]
+        # Los contadores guardados evitan recorrer las tareas (ver persistidos)
+        proyecto._reindexar(
+            ContadoresProyecto.persistidos(
+                get("estadisticas"),
+                {c.columna_id: len(c._tareas) for c in proyecto._columnas},
+            )
         )
+        if config.VERIFICAR_CONTADORES:
+            proyecto.verificar_contadores()
+        proyecto.miembros = list(get("miembros", ()))
+        proyecto._fecha_creacion = get("fecha_creacion", ahora)
+        proyecto._fecha_modificacion = get("fecha_modificacion", ahora)
+        proyecto.marcar_como_base(get("version", 0))
         return proyecto
 
     def __repr__(self) -> str:
@@ -0,0 +1,230 @@
+"""
+Formatos de serializacion del archivo de datos
+JSON legible (formato por defecto) y un formato binario compacto
+"""
+
+import io
+import json
+import re
+import struct
+from datetime import datetime, timedelta
+from typing import IO, Dict
+
+
+class SerializadorJSON:
+    """JSON con sangria, el formato historico de projects.json"""
+
+    nombre = "json"
+
+    def escribir(self, datos: Dict, f: IO[bytes]):
+        """Escribe el documento en un archivo binario abierto"""
+        texto = io.TextIOWrapper(f, encoding="utf-8")
+        json.dump(datos, texto, ensure_ascii=False, indent=2)
+        texto.flush()
+        texto.detach()
+
+    def leer(self, contenido: bytes) -> Dict:
+        """Decodifica el documento completo"""
+        return json.loads(contenido.decode("utf-8"))
+
+
+# Etiquetas de tipo del formato binario
+_NULO, _FALSO, _VERDADERO, _ENTERO, _REAL, _TEXTO, _UUID, _LISTA, _DICT, _FECHA = range(10)
+
+_PATRON_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
+_EPOCA = datetime(1970, 1, 1)
+_MICROSEGUNDO = timedelta(microseconds=1)
+_DOBLE = struct.Struct("<d")
+
+
+class ErrorFormatoBinario(ValueError):
+    """El contenido no es un documento binario valido"""
+
+
+class SerializadorBinario:
+    """Formato binario compacto con diccionario de claves
+
+    Estructura: la firma ``MAGIA`` seguida de un unico valor codificado como
+    ``etiqueta (1 byte) + carga``. Enteros y longitudes usan varints; las
+    claves de diccionario se escriben completas la primera vez y despues
+    como referencia numerica; los UUID canonicos ocupan 16 bytes y las fechas
+    ISO sin zona horaria un varint de microsegundos desde 1970. Las cadenas
+    solo se compactan si su reconstruccion es identica al original.
+    """
+
+    nombre = "binario"
+    MAGIA = b"TMB\x01"
+
+    # Codificacion
+
+    def escribir(self, datos: Dict, f: IO[bytes]):
+        """Escribe el documento en un archivo binario abierto"""
+        salida = bytearray(self.MAGIA)
+        self._codificar(datos, salida, {})
+        f.write(salida)
+
+    @staticmethod
+    def _zigzag(numero: int) -> int:
+        """Transforma enteros con signo en naturales pequenos (0, -1, 1, -2...)"""
+        return numero * 2 if numero >= 0 else -numero * 2 - 1
+
+    @staticmethod
+    def _varint(numero: int, salida: bytearray):
+        while numero > 0x7F:
+            salida.append((numero & 0x7F) | 0x80)
+            numero >>= 7
+        salida.append(numero)
+
+    def _codificar_texto(self, texto: str, salida: bytearray):
+        largo = len(texto)
+        if largo == 36 and _PATRON_UUID.match(texto):
+            salida.append(_UUID)
+            salida += bytes.fromhex(texto.replace("-", ""))
+            return
+        if largo in (19, 26) and texto[10:11] == "T":
+            try:
+                fecha = datetime.fromisoformat(texto)
+            except ValueError:
+                fecha = None
+            if fecha is not None and fecha.tzinfo is None and fecha.isoformat() == texto:
+                micros = (fecha - _EPOCA) // _MICROSEGUNDO
+                salida.append(_FECHA)
+                self._varint(self._zigzag(micros), salida)
+                return
+        codificado = texto.encode("utf-8")
+        salida.append(_TEXTO)
+        self._varint(len(codificado), salida)
+        salida += codificado
+
+    def _codificar(self, valor, salida: bytearray, claves: Dict[str, int]):
+        if valor is None:
+            salida.append(_NULO)
+        elif valor is True:
+            salida.append(_VERDADERO)
+        elif valor is False:
+            salida.append(_FALSO)
+        elif isinstance(valor, int):
+            salida.append(_ENTERO)
+            self._varint(self._zigzag(valor), salida)
+        elif isinstance(valor, float):
+            salida.append(_REAL)
+            salida += _DOBLE.pack(valor)
+        elif isinstance(valor, str):
+            self._codificar_texto(valor, salida)
+        elif isinstance(valor, (list, tuple)):
+            salida.append(_LISTA)
+            self._varint(len(valor), salida)
+            for elemento in valor:
+                self._codificar(elemento, salida, claves)
+        elif isinstance(valor, dict):
+            salida.append(_DICT)
+            self._varint(len(valor), salida)
+            for clave, elemento in valor.items():
+                indice = claves.get(clave)
+                if indice is None:
+                    # 0 = clave nueva (se registra); n = referencia a la clave n-1
+                    claves[clave] = len(claves)
+                    codificada = clave.encode("utf-8")
+                    salida.append(0)
+                    self._varint(len(codificada), salida)
+                    salida += codificada
+                else:
+                    self._varint(indice + 1, salida)
+                self._codificar(elemento, salida, claves)
+        else:
+            raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+    # Decodificacion
+
+    def leer(self, contenido: bytes) -> Dict:
+        """Decodifica el documento completo"""
+        if not contenido.startswith(self.MAGIA):
+            raise ErrorFormatoBinario("Firma de formato binario ausente")
+        try:
+            valor, pos = self._decodificar(contenido, len(self.MAGIA), [])
+        except (IndexError, UnicodeDecodeError, struct.error) as e:
+            raise ErrorFormatoBinario(f"Documento binario truncado o corrupto: {e}")
+        if pos != len(contenido):
+            raise ErrorFormatoBinario("Datos sobrantes tras el documento")
+        return valor
+
+    @staticmethod
+    def _leer_varint(contenido: bytes, pos: int):
+        numero = desplazamiento = 0
+        while True:
+            byte = contenido[pos]
+            pos += 1
+            numero |= (byte & 0x7F) << desplazamiento
+            if byte < 0x80:
+                return numero, pos
+            desplazamiento += 7
+
+    def _decodificar(self, contenido: bytes, pos: int, claves: list):
+        etiqueta = contenido[pos]
+        pos += 1
+        if etiqueta == _TEXTO:
+            largo = contenido[pos]
+            if largo < 0x80:
+                pos += 1
+            else:
+                largo, pos = self._leer_varint(contenido, pos)
+            return contenido[pos:pos + largo].decode("utf-8"), pos + largo
+        if etiqueta == _DICT:
+            cantidad, pos = self._leer_varint(contenido, pos)
+            resultado = {}
+            for _ in range(cantidad):
+                referencia = contenido[pos]
+                if referencia < 0x80:
+                    pos += 1
+                else:
+                    referencia, pos = self._leer_varint(contenido, pos)
+                if referencia == 0:
+                    largo, pos = self._leer_varint(contenido, pos)
+                    clave = contenido[pos:pos + largo].decode("utf-8")
+                    pos += largo
+                    claves.append(clave)
+                else:
+                    clave = claves[referencia - 1]
+                resultado[clave], pos = self._decodificar(contenido, pos, claves)
+            return resultado, pos
+        if etiqueta == _UUID:
+            h = contenido[pos:pos + 16].hex()
+            if len(h) != 32:
+                raise IndexError("UUID truncado")
+            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}", pos + 16
+        if etiqueta == _FECHA:
+            zigzag, pos = self._leer_varint(contenido, pos)
+            micros = (zigzag >> 1) ^ -(zigzag & 1)
+            return (_EPOCA + micros * _MICROSEGUNDO).isoformat(), pos
+        if etiqueta == _LISTA:
+            cantidad, pos = self._leer_varint(contenido, pos)
+            resultado = []
+            for _ in range(cantidad):
+                elemento, pos = self._decodificar(contenido, pos, claves)
+                resultado.append(elemento)
+            return resultado, pos
+        if etiqueta == _NULO:
+            return None, pos
+        if etiqueta == _ENTERO:
+            zigzag, pos = self._leer_varint(contenido, pos)
+            return (zigzag >> 1) ^ -(zigzag & 1), pos
+        if etiqueta == _VERDADERO:
+            return True, pos
+        if etiqueta == _FALSO:
+            return False, pos
+        if etiqueta == _REAL:
+            return _DOBLE.unpack_from(contenido, pos)[0], pos + 8
+        raise ErrorFormatoBinario(f"Etiqueta de tipo desconocida: {etiqueta}")
+
+
+SERIALIZADORES = {
+    SerializadorJSON.nombre: SerializadorJSON(),
+    SerializadorBinario.nombre: SerializadorBinario(),
+}
+
+
+def detectar_serializador(contenido: bytes):
+    """Elige el serializador segun la firma del contenido (JSON si no hay firma)"""
+    if contenido.startswith(SerializadorBinario.MAGIA):
+        return SERIALIZADORES[SerializadorBinario.nombre]
+    return SERIALIZADORES[SerializadorJSON.nombre]
@@ -4,117 +4,1437 @@ Maneja la carga y guardado de proyectos en JSON
 """
 
 import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, FrozenSet, IO, Iterator, List, Dict, Optional, Tuple
 
-from models import Proyecto, Usuario
-from config import DATA_FILE
+from models import ContadoresProyecto, Proyecto, Usuario, numerar_rangos, rangos_ordenados
+from serializacion import SERIALIZADORES, SerializadorJSON, detectar_serializador
+from config import (
+    DATA_FILE,
+    STORAGE_BACKEND,
+    STORAGE_CACHE,
+    STORAGE_DIARIO,
+    STORAGE_FORMATO,
+    STORAGE_INTERVALO_FLUSH,
+    STORAGE_RESPALDOS,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: sin bloqueo entre procesos
+    fcntl = None
+
+
+def ruta_respaldo(ruta: Path, generacion: int) -> Path:
+    """Ruta de la generacion de respaldo N (1 = la mas reciente)"""
+    return ruta.with_name(f"{ruta.name}.bak{generacion}")
+
+
+def _sincronizar_directorio(directorio: Path):
+    """Hace duradero un rename dentro del directorio (solo POSIX)"""
+    if os.name != "posix":
+        return
+    descriptor = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def escribir_atomico(
+    ruta: Path,
+    escribir: Callable[[IO], None],
+    respaldos: int = 0,
+    duradero: bool = True,
+    binario: bool = False,
+):
+    """Escribe un archivo de forma atomica y segura ante caidas
+
+    El contenido se escribe en un temporal del mismo directorio, se fuerza a
+    disco con fsync y se renombra sobre el destino, de modo que un corte a
+    mitad de escritura deja intacta la version anterior. Con ``respaldos > 0``
+    la version anterior se conserva como ``<archivo>.bak1`` y las generaciones
+    previas se desplazan hasta ``.bak<respaldos>``. Con ``duradero=False`` se
+    omiten los fsync (para archivos derivados que se pueden regenerar). Con
+    ``binario=True`` la funcion ``escribir`` recibe un archivo en modo binario.
+    """
+    temporal = ruta.with_name(f".{ruta.name}.{os.getpid()}.tmp")
+    try:
+        with (
+            open(temporal, "wb") if binario else open(temporal, "w", encoding="utf-8")
+        ) as f:
+            escribir(f)
+            if duradero:
+                f.flush()
+                os.fsync(f.fileno())
+
+        if respaldos > 0 and ruta.exists():
+            for generacion in range(respaldos - 1, 0, -1):
+                anterior = ruta_respaldo(ruta, generacion)
+                if anterior.exists():
+                    os.replace(anterior, ruta_respaldo(ruta, generacion + 1))
+            # Un enlace duro conserva la version actual sin copiarla
+            reciente = ruta_respaldo(ruta, 1)
+            reciente.unlink(missing_ok=True)
+            try:
+                os.link(ruta, reciente)
+            except OSError:
+                shutil.copy2(ruta, reciente)
+
+        os.replace(temporal, ruta)
+        if duradero:
+            _sincronizar_directorio(ruta.parent)
+    finally:
+        if temporal.exists():
+            temporal.unlink()
+
+
+class _LectorJSON:
+    """Lector incremental de un texto JSON sobre un archivo abierto
+
+    Mantiene en memoria solo el fragmento pendiente de decodificar; cada valor
+    se decodifica con ``json.JSONDecoder.raw_decode`` y, si el bufer aun no lo
+    contiene completo, se leen mas bloques (de tamano creciente para no volver
+    a decodificar muchas veces un valor grande).
+    """
+
+    _ESPACIOS = " \t\n\r"
+
+    def __init__(self, archivo: IO, tamano_bloque: int):
+        self._archivo = archivo
+        self._tamano_bloque = tamano_bloque
+        self._decodificador = json.JSONDecoder()
+        self._bufer = ""
+        self._pos = 0
+        self._fin = False
+
+    def _rellenar(self) -> bool:
+        """Lee otro bloque; False si el archivo ya se leyo completo"""
+        if self._fin:
+            return False
+        pendiente = self._bufer[self._pos:]
+        bloque = self._archivo.read(max(self._tamano_bloque, len(pendiente)))
+        if not bloque:
+            self._fin = True
+            return False
+        self._bufer = pendiente + bloque
+        self._pos = 0
+        return True
+
+    def _saltar_espacios(self):
+        while True:
+            while self._pos < len(self._bufer) and self._bufer[self._pos] in self._ESPACIOS:
+                self._pos += 1
+            if self._pos < len(self._bufer) or not self._rellenar():
+                return
+
+    def consumir(self, caracter: str) -> bool:
+        """Consume ``caracter`` si es el siguiente simbolo"""
+        self._saltar_espacios()
+        if self._bufer[self._pos:self._pos + 1] == caracter:
+            self._pos += 1
+            return True
+        return False
+
+    def esperar(self, caracter: str):
+        """Consume ``caracter`` o falla si el siguiente simbolo es otro"""
+        if not self.consumir(caracter):
+            raise json.JSONDecodeError(f"Se esperaba '{caracter}'", self._bufer, self._pos)
+
+    def decodificar(self):
+        """Decodifica el siguiente valor JSON completo"""
+        self._saltar_espacios()
+        while True:
+            try:
+                valor, fin = self._decodificador.raw_decode(self._bufer, self._pos)
+            except json.JSONDecodeError:
+                if self._rellenar():
+                    continue
+                raise
+            # Un numero al final del bufer podria continuar en el siguiente bloque
+            if fin == len(self._bufer) and self._rellenar():
+                continue
+            self._pos = fin
+            return valor
+
+
+def iterar_arreglo_json(
+    ruta: Path, clave: str, tamano_bloque: int = 1 << 16
+) -> Iterator[Dict]:
+    """Recorre uno a uno los elementos de ``documento[clave]`` sin cargar el archivo
+
+    La memoria usada queda acotada por el elemento mas grande, no por el
+    tamano del archivo. Lanza ``json.JSONDecodeError`` si el archivo es invalido.
+    """
+    with open(ruta, "r", encoding="utf-8") as f:
+        lector = _LectorJSON(f, tamano_bloque)
+        lector.esperar("{")
+        if lector.consumir("}"):
+            return
+        while True:
+            nombre = lector.decodificar()
+            lector.esperar(":")
+            if nombre == clave:
+                lector.esperar("[")
+                if lector.consumir("]"):
+                    return
+                while True:
+                    yield lector.decodificar()
+                    if not lector.consumir(","):
+                        lector.esperar("]")
+                        return
+            lector.decodificar()
+            if not lector.consumir(","):
+                lector.esperar("}")
+                return
+
+
+def fusionar_proyectos(
+    guardado: Dict,
+    nuestro: Dict,
+    columnas_base: FrozenSet[str],
+    tareas_base: FrozenSet[str],
+) -> Dict:
+    """Fusiona a nivel de tarea dos versiones concurrentes de un proyecto
+
+    ``guardado`` es lo que hay en disco y ``nuestro`` lo que se quiere guardar;
+    ``columnas_base`` y ``tareas_base`` son los IDs que existian cuando se
+    cargo ``nuestro``. Reglas:
+
+    - Una tarea presente en ambas versiones conserva la de ``fecha_modificacion``
+      mas reciente (en empate, la nuestra), junto con su columna.
+    - Una tarea presente en una sola version se conserva si es nueva (no estaba
+      en la base) y se descarta si la otra parte la elimino.
+    - Las columnas nuevas de la otra parte se anaden al final; los miembros se unen.
+    - Las tareas de cada columna se ordenan por ``rango`` (si coinciden dos
+      rangos, la columna se renumera al cargarla).
+    """
+    columnas = [dict(c, tareas=[]) for c in nuestro.get("columnas", [])]
+    ids_nuestras = {c["columna_id"] for c in columnas}
+    for c in guardado.get("columnas", []):
+        if c["columna_id"] not in ids_nuestras and c["columna_id"] not in columnas_base:
+            columnas.append(dict(c, tareas=[]))
+    por_columna = {c["columna_id"]: c for c in columnas}
+
+    def ubicar(datos: Dict) -> Dict[str, Tuple[str, Dict]]:
+        return {
+            t["tarea_id"]: (c["columna_id"], t)
+            for c in datos.get("columnas", [])
+            for t in c.get("tareas", [])
+        }
+
+    nuestras, suyas = ubicar(nuestro), ubicar(guardado)
+    for tarea_id in list(nuestras) + [i for i in suyas if i not in nuestras]:
+        propia, ajena = nuestras.get(tarea_id), suyas.get(tarea_id)
+        if propia and ajena:
+            mas_reciente = ajena[1].get("fecha_modificacion") or ""
+            elegida = ajena if mas_reciente > (propia[1].get("fecha_modificacion") or "") else propia
+        elif tarea_id in tareas_base:
+            continue
+        else:
+            elegida = propia or ajena
+        columna_id, tarea = elegida
+        if columna_id in por_columna:
+            por_columna[columna_id]["tareas"].append(tarea)
+
+    for columna in columnas:
+        if all(type(t.get("rango")) is int for t in columna["tareas"]):
+            columna["tareas"].sort(key=lambda t: t["rango"])
+
+    fusionado = dict(nuestro, columnas=columnas)
+    fusionado["miembros"] = list(
+        dict.fromkeys(nuestro.get("miembros", []) + guardado.get("miembros", []))
+    )
+    fusionado["estadisticas"] = ContadoresProyecto.desde_datos(columnas).to_dict()
+    return fusionado
+
+
+def resumir_proyecto(datos_proyecto: Dict) -> Dict:
+    """Resumen ligero de un proyecto (sin construir Columna ni Tarea)
+
+    Los conteos de tareas (total, por estado y por prioridad) salen de los
+    contadores persistidos con el proyecto; solo se cuentan las tareas si faltan.
+    """
+    columnas = datos_proyecto.get("columnas", [])
+    estadisticas = datos_proyecto.get("estadisticas")
+    if estadisticas is None:
+        estadisticas = ContadoresProyecto.desde_datos(columnas).to_dict()
+    return {
+        "proyecto_id": datos_proyecto["proyecto_id"],
+        "nombre": datos_proyecto["nombre"],
+        "total_columnas": len(columnas),
+        "total_tareas": estadisticas["total"],
+        "por_estado": estadisticas.get("por_estado", {}),
+        "por_prioridad": estadisticas.get("por_prioridad", {}),
+        "fecha_creacion": datos_proyecto.get("fecha_creacion", ""),
+        "version": datos_proyecto.get("version", 0),
+    }
+
+
+def leer_diario(ruta: Path) -> Iterator[Dict]:
+    """Genera en orden los registros del diario de operaciones
+
+    Una linea incompleta o ilegible (un anexo interrumpido por una caida)
+    marca el final del diario: esa linea y las siguientes se ignoran.
+    """
+    try:
+        f = open(ruta, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        for linea in f:
+            try:
+                if not linea.endswith(b"\n"):
+                    raise ValueError("linea incompleta")
+                registro = json.loads(linea)
+            except ValueError as e:
+                print(f"Error al cargar el diario: {e}")
+                return
+            yield registro
+
+
+def anexar_diario(ruta: Path, lineas: List[str]) -> int:
+    """Anade registros ya codificados al diario con un unico fsync
+
+    Si el diario termina en una linea incompleta se recorta antes de anadir,
+    para que los registros nuevos no queden detras de una linea invalida.
+    Retorna el tamano del diario tras la escritura.
+    """
+    nuevo = not ruta.exists()
+    with open(ruta, "ab+") as f:
+        tamano = f.seek(0, os.SEEK_END)
+        if tamano:
+            f.seek(tamano - 1)
+            if f.read(1) != b"\n":
+                f.seek(0)
+                contenido = f.read()
+                f.truncate(contenido.rfind(b"\n") + 1)
+        f.write("".join(linea + "\n" for linea in lineas).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+        tamano = f.tell()
+    if nuevo:
+        _sincronizar_directorio(ruta.parent)
+    return tamano
+
+
+# Campos de tarea con contador y su valor si faltan en el diccionario
+_CAMPOS_CONTADOS = {"estado": "Pendiente", "prioridad": "Media", "asignado_a": None}
+
+
+class AplicadorOperaciones:
+    """Aplica registros del diario de operaciones sobre el documento de datos
+
+    Trabaja directamente con los diccionarios del documento. Guarda por
+    proyecto un indice ``tarea_id -> (columna, tarea)`` que se construye la
+    primera vez que se necesita, de modo que reaplicar un diario largo no
+    recorre el proyecto en cada operacion.
+
+    Las operaciones son idempotentes (anadir algo que ya existe o quitar algo
+    que no existe no hace nada), asi que reaplicar registros que ya estan en el
+    punto de control, tras una caida en mitad de una compactacion, no altera
+    el resultado.
+
+    Los contadores persistidos (``estadisticas``) se mantienen al dia: se
+    cargan la primera vez que una operacion cambia las tareas o columnas de un
+    proyecto (o se cuentan, si faltan o no cuadran) y cada operacion aplica su
+    diferencia, igual que hace Proyecto con los modelos.
+
+    Las tareas de cada columna se mantienen ordenadas por ``rango``, como en
+    ``Columna``: las que llegan con rango se insertan en su sitio y las
+    columnas sin rangos validos se numeran igual que al cargarlas.
+
+    Los diccionarios de columna y tarea pueden ser los que cachean los
+    modelos (``Tarea._a_dict``); solo se modifican los afectados por la
+    operacion, cuyo modelo ya descarto su copia al registrarla.
+    """
+
+    # Operaciones que pueden cambiar los contadores del proyecto
+    _OPERACIONES_CONTADAS = frozenset(
+        (
+            "agregar_columna",
+            "eliminar_columna",
+            "agregar_tarea",
+            "eliminar_tarea",
+            "mover_tarea",
+            "actualizar_tarea",
+        )
+    )
+
+    def __init__(self, datos: Dict):
+        self.datos = datos
+        self._proyectos: Optional[Dict[str, Dict]] = None
+        self._indices: Dict[str, Dict[str, Tuple[Dict, Dict]]] = {}
+        self._contadores: Dict[str, ContadoresProyecto] = {}
+        self._operaciones_proyecto = {
+            "agregar_columna": self._agregar_columna,
+            "eliminar_columna": self._eliminar_columna,
+            "renombrar_columna": self._renombrar_columna,
+            "agregar_tarea": self._agregar_tarea,
+            "eliminar_tarea": self._eliminar_tarea,
+            "mover_tarea": self._mover_tarea,
+            "reordenar_tarea": self._reordenar_tarea,
+            "renumerar_columna": self._renumerar_columna,
+            "actualizar_tarea": self._actualizar_tarea,
+            "agregar_etiqueta": self._agregar_etiqueta,
+            "eliminar_etiqueta": self._eliminar_etiqueta,
+            "agregar_miembro": self._agregar_miembro,
+            "eliminar_miembro": self._eliminar_miembro,
+            "actualizar_proyecto": self._actualizar_proyecto,
+        }
+
+    def aplicar(self, registro: Dict):
+        """Aplica un registro; las operaciones sobre proyectos inexistentes se ignoran"""
+        op = registro["op"]
+        if op == "guardar_usuario":
+            usuario = registro["usuario"]
+            usuarios = self.datos.setdefault("usuarios", [])
+            for i, u in enumerate(usuarios):
+                if u["usuario_id"] == usuario["usuario_id"]:
+                    usuarios[i] = usuario
+                    break
+            else:
+                usuarios.append(usuario)
+        elif op == "eliminar_usuario":
+            self.datos["usuarios"] = [
+                u for u in self.datos.get("usuarios", [])
+                if u["usuario_id"] != registro["usuario_id"]
+            ]
+        elif op == "guardar_proyecto":
+            proyecto = registro["proyecto"]
+            proyecto_id = proyecto["proyecto_id"]
+            proyectos = self.datos.setdefault("proyectos", [])
+            anterior = self._proyecto(proyecto_id)
+            if anterior is None:
+                proyectos.append(proyecto)
+            else:
+                proyectos[self._posicion(proyectos, anterior)] = proyecto
+            self._proyectos[proyecto_id] = proyecto
+            self._indices.pop(proyecto_id, None)
+            self._contadores.pop(proyecto_id, None)
+        elif op == "eliminar_proyecto":
+            proyecto = self._proyecto(registro["proyecto_id"])
+            if proyecto is not None:
+                proyectos = self.datos["proyectos"]
+                del proyectos[self._posicion(proyectos, proyecto)]
+                del self._proyectos[registro["proyecto_id"]]
+                self._indices.pop(registro["proyecto_id"], None)
+                self._contadores.pop(registro["proyecto_id"], None)
+        elif op in self._operaciones_proyecto:
+            proyecto = self._proyecto(registro["proyecto_id"])
+            if proyecto is None:
+                return
+            contadores = None
+            if op in self._OPERACIONES_CONTADAS:
+                contadores = self._contadores_de(proyecto)
+            self._operaciones_proyecto[op](proyecto, registro)
+            if contadores is not None:
+                proyecto["estadisticas"] = contadores.to_dict()
+            if "fecha_modificacion" in registro:
+                proyecto["fecha_modificacion"] = registro["fecha_modificacion"]
+            if "version" in registro:
+                proyecto["version"] = registro["version"]
+        else:
+            raise ValueError(f"Operacion desconocida en el diario: {op}")
+
+    @staticmethod
+    def _posicion(lista: List[Dict], elemento: Dict) -> int:
+        """Posicion de ``elemento`` comparando por identidad"""
+        for i, actual in enumerate(lista):
+            if actual is elemento:
+                return i
+        raise ValueError("Elemento ausente")
+
+    def _proyecto(self, proyecto_id: str) -> Optional[Dict]:
+        if self._proyectos is None:
+            self._proyectos = {
+                p["proyecto_id"]: p for p in self.datos.get("proyectos", [])
+            }
+        return self._proyectos.get(proyecto_id)
+
+    def _indice(self, proyecto: Dict) -> Dict[str, Tuple[Dict, Dict]]:
+        indice = self._indices.get(proyecto["proyecto_id"])
+        if indice is None:
+            indice = {
+                t["tarea_id"]: (c, t)
+                for c in proyecto.get("columnas", [])
+                for t in c.get("tareas", [])
+            }
+            self._indices[proyecto["proyecto_id"]] = indice
+        return indice
+
+    def _contadores_de(self, proyecto: Dict) -> ContadoresProyecto:
+        contadores = self._contadores.get(proyecto["proyecto_id"])
+        if contadores is None:
+            columnas = proyecto.get("columnas", [])
+            contadores = ContadoresProyecto.persistidos(
+                proyecto.get("estadisticas"),
+                {c["columna_id"]: len(c.get("tareas", [])) for c in columnas},
+            ) or ContadoresProyecto.desde_datos(columnas)
+            self._contadores[proyecto["proyecto_id"]] = contadores
+        return contadores
+
+    @staticmethod
+    def _columna(proyecto: Dict, columna_id: str) -> Optional[Dict]:
+        for columna in proyecto.get("columnas", []):
+            if columna["columna_id"] == columna_id:
+                return columna
+        return None
+
+    def _agregar_columna(self, proyecto: Dict, registro: Dict):
+        columna = registro["columna"]
+        if self._columna(proyecto, columna["columna_id"]) is None:
+            proyecto.setdefault("columnas", []).append(columna)
+            self._indices.pop(proyecto["proyecto_id"], None)
+            contadores = self._contadores_de(proyecto)
+            contadores.por_columna[columna["columna_id"]] = 0
+            for tarea in columna.get("tareas", []):
+                contadores.contar_datos(tarea, columna["columna_id"])
+
+    def _eliminar_columna(self, proyecto: Dict, registro: Dict):
+        columna = self._columna(proyecto, registro["columna_id"])
+        if columna is not None:
+            del proyecto["columnas"][self._posicion(proyecto["columnas"], columna)]
+            self._indices.pop(proyecto["proyecto_id"], None)
+            contadores = self._contadores_de(proyecto)
+            for tarea in columna.get("tareas", []):
+                contadores.contar_datos(tarea, columna["columna_id"], -1)
+            contadores.por_columna.pop(columna["columna_id"], None)
+
+    def _renombrar_columna(self, proyecto: Dict, registro: Dict):
+        columna = self._columna(proyecto, registro["columna_id"])
+        if columna is not None:
+            columna["nombre"] = registro["nombre"]
+
+    @staticmethod
+    def _numerar(tareas: List[Dict], forzar: bool = False):
+        """Numera los rangos de las tareas en su orden si faltan o estan desordenados"""
+        if forzar or not rangos_ordenados([t.get("rango") for t in tareas]):
+            for tarea, rango in zip(tareas, numerar_rangos(len(tareas))):
+                tarea["rango"] = rango
+
+    def _colocar(self, columna: Dict, tarea: Dict, rango: Optional[int]):
+        """Inserta la tarea en la columna segun ``rango`` (sin rango, al final)"""
+        tareas = columna.setdefault("tareas", [])
+        if rango is None:
+            tareas.append(tarea)
+            return
+        self._numerar(tareas)
+        tarea["rango"] = rango
+        inicio, fin = 0, len(tareas)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if tareas[medio]["rango"] < rango:
+                inicio = medio + 1
+            else:
+                fin = medio
+        tareas.insert(inicio, tarea)
+
+    def _agregar_tarea(self, proyecto: Dict, registro: Dict):
+        tarea = registro["tarea"]
+        columna = self._columna(proyecto, registro["columna_id"])
+        indice = self._indice(proyecto)
+        if columna is not None and tarea["tarea_id"] not in indice:
+            self._colocar(columna, tarea, tarea.get("rango"))
+            indice[tarea["tarea_id"]] = (columna, tarea)
+            self._contadores_de(proyecto).contar_datos(tarea, columna["columna_id"])
+
+    def _eliminar_tarea(self, proyecto: Dict, registro: Dict):
+        ubicacion = self._indice(proyecto).pop(registro["tarea_id"], None)
+        if ubicacion is not None:
+            columna, tarea = ubicacion
+            del columna["tareas"][self._posicion(columna["tareas"], tarea)]
+            self._contadores_de(proyecto).contar_datos(tarea, columna["columna_id"], -1)
+
+    def _mover_tarea(self, proyecto: Dict, registro: Dict):
+        indice = self._indice(proyecto)
+        ubicacion = indice.get(registro["tarea_id"])
+        destino = self._columna(proyecto, registro["hacia"])
+        if ubicacion is None or destino is None or ubicacion[0] is destino:
+            return
+        origen, tarea = ubicacion
+        del origen["tareas"][self._posicion(origen["tareas"], tarea)]
+        self._colocar(destino, tarea, registro.get("rango"))
+        indice[registro["tarea_id"]] = (destino, tarea)
+        contadores = self._contadores_de(proyecto)
+        contadores.contar_datos(tarea, origen["columna_id"], -1)
+        contadores.contar_datos(tarea, destino["columna_id"])
+
+    def _reordenar_tarea(self, proyecto: Dict, registro: Dict):
+        ubicacion = self._indice(proyecto).get(registro["tarea_id"])
+        if ubicacion is not None:
+            columna, tarea = ubicacion
+            del columna["tareas"][self._posicion(columna["tareas"], tarea)]
+            self._colocar(columna, tarea, registro["rango"])
+
+    def _renumerar_columna(self, proyecto: Dict, registro: Dict):
+        columna = self._columna(proyecto, registro["columna_id"])
+        if columna is not None:
+            self._numerar(columna.get("tareas", []), forzar=True)
+
+    def _tarea(self, proyecto: Dict, tarea_id: str) -> Optional[Dict]:
+        ubicacion = self._indice(proyecto).get(tarea_id)
+        return ubicacion[1] if ubicacion is not None else None
+
+    def _actualizar_tarea(self, proyecto: Dict, registro: Dict):
+        tarea = self._tarea(proyecto, registro["tarea_id"])
+        if tarea is not None:
+            campos = registro["campos"]
+            anterior = {
+                campo: tarea.get(campo, defecto)
+                for campo, defecto in _CAMPOS_CONTADOS.items()
+                if campo in campos
+            }
+            self._contadores_de(proyecto).actualizar(anterior, campos)
+            tarea.update(campos)
+
+    def _agregar_etiqueta(self, proyecto: Dict, registro: Dict):
+        tarea = self._tarea(proyecto, registro["tarea_id"])
+        if tarea is not None:
+            etiquetas = tarea.setdefault("etiquetas", [])
+            if registro["etiqueta"] not in etiquetas:
+                etiquetas.append(registro["etiqueta"])
+
+    def _eliminar_etiqueta(self, proyecto: Dict, registro: Dict):
+        tarea = self._tarea(proyecto, registro["tarea_id"])
+        if tarea is not None and registro["etiqueta"] in tarea.get("etiquetas", []):
+            tarea["etiquetas"].remove(registro["etiqueta"])
+
+    def _actualizar_proyecto(self, proyecto: Dict, registro: Dict):
+        proyecto.update(registro["campos"])
+
+    def _agregar_miembro(self, proyecto: Dict, registro: Dict):
+        miembros = proyecto.setdefault("miembros", [])
+        if registro["usuario_id"] not in miembros:
+            miembros.append(registro["usuario_id"])
+
+    def _eliminar_miembro(self, proyecto: Dict, registro: Dict):
+        if registro["usuario_id"] in proyecto.get("miembros", []):
+            proyecto["miembros"].remove(registro["usuario_id"])
+
+
+def aplicar_diario(datos: Dict, ruta_diario: Path) -> Dict:
+    """Reaplica sobre ``datos`` (el punto de control) los registros del diario"""
+    aplicador = AplicadorOperaciones(datos)
+    for registro in leer_diario(ruta_diario):
+        try:
+            aplicador.aplicar(registro)
+        except (KeyError, ValueError) as e:
+            print(f"Error al cargar el diario: registro invalido {e}")
+            break
+    return datos
 
 
 class StorageManager:
-    """Gestiona la persistencia de datos en JSON"""
+    """Gestiona la persistencia de datos en JSON
 
-    def __init__(self, archivo_datos: Path = DATA_FILE):
+    Con ``cache=True`` el documento se mantiene en memoria: las lecturas solo
+    consultan la firma (mtime, tamano e inodo) del archivo y las escrituras se
+    vuelcan a disco segun ``intervalo_flush``:
+
+    - ``0``: se escribe en cada guardado (write-through)
+    - ``> 0``: se escribe como mucho una vez cada ``intervalo_flush`` segundos
+    - ``None``: solo se escribe al llamar a ``sincronizar()``
+
+    Cada escritura a disco es atomica (temporal + fsync + rename) y, con
+    ``respaldos > 0``, conserva esa cantidad de generaciones anteriores que se
+    usan para recuperar los datos si el archivo principal esta corrupto.
+
+    Junto al archivo de datos se mantiene ``<nombre>.resumen.json`` con el
+    resumen de cada proyecto, para listar proyectos sin decodificar tareas.
+
+    Las operaciones de lectura-modificacion-escritura toman un bloqueo
+    exclusivo (fcntl) sobre ``<archivo>.lock``, y cada proyecto lleva un
+    contador ``version``: si otro proceso lo guardo despues de cargarlo, los
+    cambios se fusionan por tarea. Los modos diferidos (cache con intervalo
+    distinto de 0) solo son seguros con un unico proceso escritor.
+
+    ``formato`` elige como se escribe el archivo ("json" o "binario", ver
+    serializacion.py); al leer, el formato se detecta automaticamente.
+
+    Con ``diario=True`` los guardados no reescriben el archivo: cada cambio
+    (las operaciones que registran los modelos, ver
+    ``Proyecto.operaciones_pendientes``) se anade como una linea JSON a
+    ``<archivo>.diario``. Al cargar, el diario se reaplica sobre el archivo de
+    datos, que actua como punto de control, y cuando el diario supera
+    ``umbral_compactacion`` bytes se escribe un punto de control nuevo y el
+    diario se vacia. El diario sirve ademas como registro de auditoria de los
+    cambios desde la ultima compactacion.
+    """
+
+    def __init__(
+        self,
+        archivo_datos: Path = DATA_FILE,
+        cache: bool = False,
+        intervalo_flush: Optional[float] = 0.0,
+        respaldos: int = 0,
+        formato: str = "json",
+        diario: bool = False,
+        umbral_compactacion: int = 1024 * 1024,
+    ):
         self.archivo_datos = archivo_datos
         self.archivo_datos.parent.mkdir(parents=True, exist_ok=True)
+        self.archivo_resumen = archivo_datos.with_name(
+            f"{archivo_datos.stem}.resumen.json"
+        )
+        self.archivo_bloqueo = archivo_datos.with_name(f"{archivo_datos.name}.lock")
+        self.archivo_diario = archivo_datos.with_name(f"{archivo_datos.name}.diario")
+        # Indices derivados de los proyectos (ver busqueda.py); se regeneran si faltan
+        self.directorio_indices = archivo_datos.with_name(f"{archivo_datos.stem}.indices")
+        self.cache = cache
+        self.intervalo_flush = intervalo_flush
+        self.respaldos = respaldos
+        if formato not in SERIALIZADORES:
+            raise ValueError(f"Formato de datos desconocido: {formato}")
+        self.serializador = SERIALIZADORES[formato]
+        self.diario = diario
+        self.umbral_compactacion = umbral_compactacion
+        self._datos_cache: Optional[Dict] = None
+        self._firma_cache: Optional[Tuple] = None
+        self._cambios_pendientes = False
+        # Lineas del diario aun no escritas (None: hay que reescribir el documento)
+        self._registros_pendientes: Optional[List[str]] = []
+        self._aplicador: Optional[AplicadorOperaciones] = None
+        self._ultimo_flush = time.monotonic()
+        self._lotes_abiertos = 0
+        self._bloqueos_abiertos = 0
 
-    def cargar_datos(self) -> Dict:
-        """Carga todos los datos del archivo JSON"""
+    @contextmanager
+    def _bloqueo(self) -> Iterator[None]:
+        """Bloqueo exclusivo entre procesos, reentrante dentro del mismo gestor"""
+        if self._bloqueos_abiertos or fcntl is None:
+            self._bloqueos_abiertos += 1
+            try:
+                yield
+            finally:
+                self._bloqueos_abiertos -= 1
+            return
+
+        with open(self.archivo_bloqueo, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            self._bloqueos_abiertos += 1
+            try:
+                yield
+            finally:
+                self._bloqueos_abiertos -= 1
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @property
+    def guardado_incremental(self) -> bool:
+        """Indica si guardar un proyecto cuesta lo que sus cambios y no lo que
+        el proyecto entero (solo en modo diario)"""
+        return self.diario
+
+    def _firma_archivo(self) -> Optional[Tuple[int, int, int]]:
+        """Retorna (mtime_ns, tamano, inodo) del archivo de datos o None si no existe
+
+        El inodo detecta un reemplazo atomico (rename) por un archivo del mismo
+        tamano dentro de la resolucion del mtime del sistema de archivos.
+        """
+        try:
+            estado = self.archivo_datos.stat()
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+    def _firma_documento(self) -> Optional[Tuple]:
+        """Firma del archivo de datos y, en modo diario, tambien la del diario"""
+        if not self.diario:
+            return self._firma_archivo()
+        try:
+            estado = self.archivo_diario.stat()
+            firma_diario = (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+        except OSError:
+            firma_diario = None
+        return (self._firma_archivo(), firma_diario)
+
+    def _diario_vacio(self) -> bool:
+        """Indica si no hay registros en el diario que reaplicar"""
+        if not self.diario:
+            return True
+        try:
+            return self.archivo_diario.stat().st_size == 0
+        except OSError:
+            return True
+
+    @staticmethod
+    def _decodificar(ruta: Path) -> Dict:
+        """Lee un archivo de datos detectando su formato por la firma"""
+        with open(ruta, "rb") as f:
+            contenido = f.read()
+        return detectar_serializador(contenido).leer(contenido)
+
+    def _leer_archivo(self) -> Dict:
+        """Lee y decodifica el archivo de datos completo
+
+        Si el archivo esta corrupto se intenta recuperar la generacion de
+        respaldo valida mas reciente.
+        """
         if self.archivo_datos.exists():
             try:
-                with open(self.archivo_datos, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                return self._decodificar(self.archivo_datos)
+            except (ValueError, IOError) as e:
                 print(f"Error al cargar datos: {e}")
+                for generacion in range(1, self.respaldos + 1):
+                    respaldo = ruta_respaldo(self.archivo_datos, generacion)
+                    try:
+                        datos = self._decodificar(respaldo)
+                    except (ValueError, IOError):
+                        continue
+                    print(f"Datos recuperados del respaldo {respaldo.name}")
+                    return datos
                 return {"proyectos": [], "usuarios": []}
         return {"proyectos": [], "usuarios": []}
 
-    def guardar_datos(self, datos: Dict) -> bool:
-        """Guarda todos los datos en el archivo JSON"""
+    def _leer_documento(self) -> Dict:
+        """Lee el archivo de datos y, en modo diario, reaplica el diario encima"""
+        datos = self._leer_archivo()
+        if self.diario:
+            aplicar_diario(datos, self.archivo_diario)
+        return datos
+
+    def _escribir_archivo(self, datos: Dict) -> bool:
+        """Escribe el documento completo en el archivo de datos
+
+        En modo diario es un punto de control: tras escribirlo, el diario se
+        vacia. Si hay una caida entre ambos pasos, el diario se reaplica sobre
+        un punto de control que ya lo contiene, lo que no altera el resultado.
+        """
         try:
-            with open(self.archivo_datos, "w", encoding="utf-8") as f:
-                json.dump(datos, f, ensure_ascii=False, indent=2)
-            return True
-        except IOError as e:
+            escribir_atomico(
+                self.archivo_datos,
+                lambda f: self.serializador.escribir(datos, f),
+                self.respaldos,
+                binario=True,
+            )
+            if self.diario and self.archivo_diario.exists():
+                with open(self.archivo_diario, "r+b") as f:
+                    f.truncate()
+                    os.fsync(f.fileno())
+        except (IOError, OSError) as e:
             print(f"Error al guardar datos: {e}")
             return False
+        self._escribir_resumen(datos)
+        return True
+
+    def _anexar_registros(self, lineas: List[str], datos: Dict) -> bool:
+        """Escribe lineas en el diario y compacta si supera el umbral
+
+        Si aun no existe el archivo de datos se escribe como punto de control.
+        """
+        if not self.archivo_datos.exists():
+            return self._escribir_archivo(datos)
+        try:
+            tamano = anexar_diario(self.archivo_diario, lineas)
+        except (IOError, OSError) as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+        if tamano >= self.umbral_compactacion:
+            return self._escribir_archivo(datos)
+        return True
+
+    def _anotar(self, datos: Dict, registros: List[Dict]) -> bool:
+        """Registra operaciones en el diario y las aplica sobre ``datos``
+
+        ``datos`` es el documento actual (de ``cargar_datos``). Sin cache ni
+        lote las lineas se escriben de inmediato; si no, quedan pendientes
+        igual que los guardados completos.
+        """
+        if self._aplicador is None or self._aplicador.datos is not datos:
+            self._aplicador = AplicadorOperaciones(datos)
+        marca = datetime.now().isoformat()
+        lineas = []
+        for registro in registros:
+            registro["ts"] = marca
+            # Se codifica antes de aplicar: el documento puede seguir cambiando
+            lineas.append(json.dumps(registro, ensure_ascii=False, separators=(",", ":")))
+            self._aplicador.aplicar(registro)
+
+        if not self.cache and not self._lotes_abiertos:
+            return self._anexar_registros(lineas, datos)
+        if self._registros_pendientes is not None:
+            self._registros_pendientes.extend(lineas)
+        self._datos_cache = datos
+        return self._diferir_escritura()
+
+    def _escribir_resumen(self, datos: Dict):
+        """Actualiza el resumen de proyectos, ligado a la firma del archivo de datos"""
+        resumen = {
+            "firma": list(self._firma_archivo() or ()),
+            "proyectos": [resumir_proyecto(p) for p in datos.get("proyectos", [])],
+        }
+        try:
+            escribir_atomico(
+                self.archivo_resumen,
+                lambda f: json.dump(resumen, f, ensure_ascii=False),
+                duradero=False,
+            )
+        except (IOError, OSError):
+            # Es un archivo derivado: si falta o queda desfasado se regenera
+            pass
+
+    def listar_resumenes_proyectos(self) -> List[Dict]:
+        """Lista id, nombre, version y conteo de columnas y tareas de cada proyecto
+
+        Usa el resumen persistido si corresponde a la version actual del
+        archivo de datos; si no, lo regenera a partir del documento.
+        """
+        if self._cambios_pendientes or self.cache or not self._diario_vacio():
+            return [resumir_proyecto(p) for p in self.cargar_datos().get("proyectos", [])]
+
+        firma = self._firma_archivo()
+        if firma is None:
+            return []
+        try:
+            with open(self.archivo_resumen, "r", encoding="utf-8") as f:
+                resumen = json.load(f)
+            # Los resumenes sin conteos por estado son de una version anterior
+            if resumen.get("firma") == list(firma) and all(
+                "por_estado" in p for p in resumen["proyectos"]
+            ):
+                return resumen["proyectos"]
+        except (json.JSONDecodeError, IOError, KeyError):
+            pass
+
+        datos = self.cargar_datos()
+        self._escribir_resumen(datos)
+        return [resumir_proyecto(p) for p in datos.get("proyectos", [])]
+
+    def cargar_datos(self) -> Dict:
+        """Carga todos los datos del archivo JSON
+
+        En modo cache (o dentro de un lote) se devuelve el documento compartido
+        en memoria; solo se vuelve a leer el archivo si cambio en disco y no
+        hay cambios pendientes.
+        """
+        if self._cambios_pendientes:
+            return self._datos_cache
+        if not self.cache:
+            return self._leer_documento()
+
+        if self._datos_cache is None or self._firma_documento() != self._firma_cache:
+            # La firma se toma antes de leer: si el archivo cambia durante la
+            # lectura, la siguiente consulta detectara la diferencia.
+            self._firma_cache = self._firma_documento()
+            self._datos_cache = self._leer_documento()
+        return self._datos_cache
+
+    def guardar_datos(self, datos: Dict) -> bool:
+        """Guarda todos los datos en el archivo JSON"""
+        if not self.cache and not self._lotes_abiertos:
+            with self._bloqueo():
+                return self._escribir_archivo(datos)
+
+        self._datos_cache = datos
+        # Un documento completo reemplaza las operaciones pendientes
+        self._registros_pendientes = None
+        self._aplicador = None
+        return self._diferir_escritura()
+
+    def _diferir_escritura(self) -> bool:
+        """Marca cambios pendientes y los vuelca si toca segun el modo"""
+        self._cambios_pendientes = True
+        if self._lotes_abiertos:
+            return True
+        if (
+            self.intervalo_flush is not None
+            and time.monotonic() - self._ultimo_flush >= self.intervalo_flush
+        ):
+            return self.sincronizar()
+        return True
+
+    def sincronizar(self) -> bool:
+        """Vuelca a disco los cambios pendientes del modo cache o de un lote"""
+        if not self._cambios_pendientes:
+            return True
+        with self._bloqueo():
+            if self.diario and self._registros_pendientes is not None:
+                escrito = self._anexar_registros(
+                    self._registros_pendientes, self._datos_cache
+                )
+            else:
+                escrito = self._escribir_archivo(self._datos_cache)
+            if not escrito:
+                return False
+        self._cambios_pendientes = False
+        self._registros_pendientes = []
+        self._firma_cache = self._firma_documento()
+        self._ultimo_flush = time.monotonic()
+        if not self.cache:
+            self._datos_cache = None
+        return True
+
+    def compactar(self) -> bool:
+        """Escribe un punto de control con el estado actual y vacia el diario"""
+        with self._bloqueo():
+            datos = self.cargar_datos()
+            self._datos_cache = datos
+            self._registros_pendientes = None
+            self._cambios_pendientes = True
+            return self.sincronizar()
+
+    @contextmanager
+    def lote(self) -> Iterator["StorageManager"]:
+        """Agrupa varios guardados en una sola escritura (group commit)
+
+        Dentro del bloque los guardados se acumulan en memoria; al salir del
+        lote mas externo se escriben con un unico fsync. El bloqueo entre
+        procesos se mantiene durante todo el lote::
+
+            with storage.lote():
+                storage.guardar_proyecto(a)
+                storage.guardar_proyecto(b)
+        """
+        with self._bloqueo():
+            self._lotes_abiertos += 1
+            try:
+                yield self
+            finally:
+                self._lotes_abiertos -= 1
+                if not self._lotes_abiertos:
+                    self.sincronizar()
+
+    def invalidar_cache(self):
+        """Descarta el documento en memoria (los cambios pendientes se pierden)"""
+        self._datos_cache = None
+        self._firma_cache = None
+        self._cambios_pendientes = False
+        self._registros_pendientes = []
+
+    def _iterar_registros(self, clave: str) -> Iterator[Dict]:
+        """Recorre los registros de ``clave`` ("proyectos" o "usuarios")
+
+        Sin cache se leen en streaming desde el archivo; si este es invalido
+        antes del primer registro se recurre a la carga completa (que intenta
+        recuperar un respaldo).
+        """
+        if self._cambios_pendientes or self.cache or not self._diario_vacio():
+            yield from self.cargar_datos().get(clave, [])
+            return
+        if not self.archivo_datos.exists():
+            return
+        with open(self.archivo_datos, "rb") as f:
+            cabecera = f.read(8)
+        if detectar_serializador(cabecera) is not SERIALIZADORES[SerializadorJSON.nombre]:
+            # El lector incremental solo entiende JSON
+            yield from self._leer_archivo().get(clave, [])
+            return
+
+        entregados = 0
+        try:
+            for registro in iterar_arreglo_json(self.archivo_datos, clave):
+                entregados += 1
+                yield registro
+        except (ValueError, IOError) as e:
+            if entregados:
+                print(f"Error al cargar datos: {e}")
+                return
+            yield from self._leer_archivo().get(clave, [])
+
+    def iterar_proyectos(self) -> Iterator[Proyecto]:
+        """Genera los proyectos de uno en uno (memoria acotada por proyecto)"""
+        for datos_proyecto in self._iterar_registros("proyectos"):
+            yield Proyecto.from_dict(datos_proyecto)
+
+    def iterar_usuarios(self) -> Iterator[Usuario]:
+        """Genera los usuarios de uno en uno"""
+        for datos_usuario in self._iterar_registros("usuarios"):
+            yield Usuario.from_dict(datos_usuario)
 
     def cargar_proyecto(self, proyecto_id: str) -> Optional[Proyecto]:
         """Carga un proyecto especÃ­fico"""
-        datos = self.cargar_datos()
-        for datos_proyecto in datos.get("proyectos", []):
+        for datos_proyecto in self._iterar_registros("proyectos"):
             if datos_proyecto["proyecto_id"] == proyecto_id:
                 return Proyecto.from_dict(datos_proyecto)
         return None
 
     def guardar_proyecto(self, proyecto: Proyecto) -> bool:
-        """Guarda un proyecto"""
-        datos = self.cargar_datos()
+        """Guarda un proyecto
 
-        # Buscar y actualizar o crear
-        proyectos = datos.get("proyectos", [])
-        for i, p in enumerate(proyectos):
-            if p["proyecto_id"] == proyecto.proyecto_id:
-                proyectos[i] = proyecto.to_dict()
-                datos["proyectos"] = proyectos
-                return self.guardar_datos(datos)
+        Si otro proceso guardo el proyecto despues de que se cargara (su
+        ``version`` cambio), en lugar de sobrescribirlo se fusionan los cambios
+        por tarea y el objeto se actualiza con el resultado.
+        """
+        fusionado = False
+        with self._bloqueo():
+            datos = self.cargar_datos()
+            proyectos = datos.get("proyectos", [])
+            posicion, guardado = next(
+                (
+                    (i, p)
+                    for i, p in enumerate(proyectos)
+                    if p["proyecto_id"] == proyecto.proyecto_id
+                ),
+                (None, None),
+            )
+            vigente = guardado is not None and guardado.get("version", 0) == proyecto.version
+            version = (guardado.get("version", 0) if guardado else proyecto.version) + 1
 
-        # Si no existe, agregarlo
-        proyectos.append(proyecto.to_dict())
-        datos["proyectos"] = proyectos
-        return self.guardar_datos(datos)
+            if self.diario and vigente and proyecto._operaciones:
+                # Solo las operaciones hechas desde que se cargo el proyecto
+                registros = [
+                    dict(op, proyecto_id=proyecto.proyecto_id, version=version)
+                    for op in proyecto._operaciones
+                ]
+                guardado_ok = self._anotar(datos, registros)
+            else:
+                nuevo = proyecto._a_dict()
+                if guardado is not None and not vigente:
+                    nuevo = fusionar_proyectos(
+                        guardado, nuevo, proyecto._columnas_base, proyecto._tareas_base
+                    )
+                    fusionado = True
+                nuevo["version"] = version
+                if self.diario:
+                    guardado_ok = self._anotar(
+                        datos, [{"op": "guardar_proyecto", "proyecto": nuevo}]
+                    )
+                else:
+                    if posicion is None:
+                        proyectos.append(nuevo)
+                    else:
+                        proyectos[posicion] = nuevo
+                    datos["proyectos"] = proyectos
+                    guardado_ok = self.guardar_datos(datos)
+            if not guardado_ok:
+                return False
+
+        if fusionado:
+            proyecto.restaurar_contenido(nuevo["columnas"], nuevo["miembros"])
+        proyecto.marcar_como_base(version)
+        return True
 
     def cargar_todos_proyectos(self) -> List[Proyecto]:
         """Carga todos los proyectos"""
-        datos = self.cargar_datos()
-        proyectos = []
-        for datos_proyecto in datos.get("proyectos", []):
-            proyectos.append(Proyecto.from_dict(datos_proyecto))
-        return proyectos
+        return list(self.iterar_proyectos())
 
     def eliminar_proyecto(self, proyecto_id: str) -> bool:
         """Elimina un proyecto"""
-        datos = self.cargar_datos()
-        proyectos = datos.get("proyectos", [])
-        datos["proyectos"] = proyectos
-        return self.guardar_datos(datos)
+        with self._bloqueo():
+            datos = self.cargar_datos()
+            if self.diario:
+                return self._anotar(
+                    datos, [{"op": "eliminar_proyecto", "proyecto_id": proyecto_id}]
+                )
+            proyectos = datos.get("proyectos", [])
+            datos["proyectos"] = [p for p in proyectos if p["proyecto_id"] != proyecto_id]
+            return self.guardar_datos(datos)
 
     def cargar_usuario(self, usuario_id: str) -> Optional[Usuario]:
         """Carga un usuario especÃ­fico"""
-        datos = self.cargar_datos()
-        for datos_usuario in datos.get("usuarios", []):
+        for datos_usuario in self._iterar_registros("usuarios"):
             if datos_usuario["usuario_id"] == usuario_id:
                 return Usuario.from_dict(datos_usuario)
         return None
 
     def guardar_usuario(self, usuario: Usuario) -> bool:
         """Guarda un usuario"""
-        datos = self.cargar_datos()
+        with self._bloqueo():
+            datos = self.cargar_datos()
+            if self.diario:
+                return self._anotar(
+                    datos, [{"op": "guardar_usuario", "usuario": usuario.to_dict()}]
+                )
 
-        # Buscar y actualizar o crear
-        usuarios = datos.get("usuarios", [])
-        for i, u in enumerate(usuarios):
-            if u["usuario_id"] == usuario.usuario_id:
-                usuarios[i] = usuario.to_dict()
-                datos["usuarios"] = usuarios
-                return self.guardar_datos(datos)
+            # Buscar y actualizar o crear
+            usuarios = datos.get("usuarios", [])
+            for i, u in enumerate(usuarios):
+                if u["usuario_id"] == usuario.usuario_id:
+                    usuarios[i] = usuario.to_dict()
+                    datos["usuarios"] = usuarios
+                    return self.guardar_datos(datos)
 
-        # Si no existe, agregarlo
-        usuarios.append(usuario.to_dict())
-        datos["usuarios"] = usuarios
-        return self.guardar_datos(datos)
+            # Si no existe, agregarlo
+            usuarios.append(usuario.to_dict())
+            datos["usuarios"] = usuarios
+            return self.guardar_datos(datos)
 
     def cargar_todos_usuarios(self) -> List[Usuario]:
         """Carga todos los usuarios"""
-        datos = self.cargar_datos()
-        usuarios = []
-        for datos_usuario in datos.get("usuarios", []):
-            usuarios.append(Usuario.from_dict(datos_usuario))
-        return usuarios
+        return list(self.iterar_usuarios())
 
     def eliminar_usuario(self, usuario_id: str) -> bool:
         """Elimina un usuario"""
-        datos = self.cargar_datos()
-        usuarios = datos.get("usuarios", [])
-        datos["usuarios"] = [u for u in usuarios if u["usuario_id"] != usuario_id]
-        return self.guardar_datos(datos)
+        with self._bloqueo():
+            datos = self.cargar_datos()
+            if self.diario:
+                return self._anotar(
+                    datos, [{"op": "eliminar_usuario", "usuario_id": usuario_id}]
+                )
+            usuarios = datos.get("usuarios", [])
+            datos["usuarios"] = [u for u in usuarios if u["usuario_id"] != usuario_id]
+            return self.guardar_datos(datos)
+
+
+class DirectorioStorageManager:
+    """Persistencia con un archivo JSON por entidad
+
+    Estructura del directorio::
+
+        <directorio>/proyectos/<proyecto_id>.json
+        <directorio>/usuarios/<usuario_id>.json
+
+    Guardar o eliminar un proyecto (o usuario) solo toca su propio archivo,
+    asi que el coste de escritura depende del tamano del cambio y no del
+    tamano total de los datos. Expone la misma interfaz que StorageManager.
+    """
+
+    # Cada guardado reescribe el archivo entero del proyecto
+    guardado_incremental = False
+
+    def __init__(self, directorio: Path = DATA_FILE.parent / "entidades"):
+        self.directorio = directorio
+        self.directorio_proyectos = directorio / "proyectos"
+        self.directorio_usuarios = directorio / "usuarios"
+        self.archivo_resumen = directorio / "resumenes.json"
+        self.directorio_indices = directorio / "indices"
+        self.archivo_bloqueo = directorio / "proyectos.lock"
+        self.directorio_proyectos.mkdir(parents=True, exist_ok=True)
+        self.directorio_usuarios.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _bloqueo(self) -> Iterator[None]:
+        """Bloqueo exclusivo entre procesos para leer, comparar y escribir un proyecto"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.archivo_bloqueo, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _ruta_entidad(directorio: Path, entidad_id: str) -> Path:
+        """Ruta del archivo de una entidad, rechazando IDs que no sean un nombre simple"""
+        if not entidad_id or Path(entidad_id).name != entidad_id:
+            raise ValueError(f"ID de entidad invalido: {entidad_id!r}")
+        return directorio / f"{entidad_id}.json"
+
+    @staticmethod
+    def _leer_entidad(ruta: Path) -> Optional[Dict]:
+        """Lee el archivo de una entidad; None si no existe o esta corrupto"""
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error al cargar {ruta.name}: {e}")
+            return None
+
+    @staticmethod
+    def _escribir_entidad(ruta: Path, datos: Dict) -> bool:
+        """Escribe el archivo de una entidad de forma atomica"""
+        try:
+            escribir_atomico(
+                ruta, lambda f: json.dump(datos, f, ensure_ascii=False, indent=2)
+            )
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    def _leer_todas(self, directorio: Path) -> List[Dict]:
+        """Lee todas las entidades de un directorio en orden de creacion"""
+        entidades = []
+        for ruta in directorio.glob("*.json"):
+            datos = self._leer_entidad(ruta)
+            if datos is not None:
+                entidades.append(datos)
+        entidades.sort(key=lambda d: d.get("fecha_creacion", ""))
+        return entidades
+
+    def _reemplazar_todas(self, directorio: Path, entidades: List[Dict], clave_id: str) -> bool:
+        """Escribe las entidades dadas y elimina los archivos sobrantes"""
+        vigentes = set()
+        for entidad in entidades:
+            ruta = self._ruta_entidad(directorio, entidad[clave_id])
+            if not self._escribir_entidad(ruta, entidad):
+                return False
+            vigentes.add(ruta.name)
+        for ruta in directorio.glob("*.json"):
+            if ruta.name not in vigentes:
+                ruta.unlink()
+        return True
+
+    def cargar_datos(self) -> Dict:
+        """Carga todos los datos en el mismo formato que StorageManager"""
+        return {
+            "proyectos": self._leer_todas(self.directorio_proyectos),
+            "usuarios": self._leer_todas(self.directorio_usuarios),
+        }
+
+    def guardar_datos(self, datos: Dict) -> bool:
+        """Reemplaza todos los datos (usado en migraciones y restauraciones)"""
+        try:
+            proyectos = datos.get("proyectos", [])
+            ok = self._reemplazar_todas(
+                self.directorio_proyectos, proyectos, "proyecto_id"
+            ) and self._reemplazar_todas(
+                self.directorio_usuarios, datos.get("usuarios", []), "usuario_id"
+            )
+            self._escribir_resumenes(
+                {p["proyecto_id"]: resumir_proyecto(p) for p in proyectos}
+            )
+            return ok
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error al guardar datos: estructura invalida ({e})")
+            return False
+
+    def sincronizar(self) -> bool:
+        """Las escrituras son inmediatas; no hay nada pendiente"""
+        return True
+
+    def _leer_resumenes(self) -> Dict[str, Dict]:
+        """Resumenes por proyecto_id, regenerandolos si el indice no existe"""
+        resumenes = self._leer_entidad(self.archivo_resumen)
+        if resumenes is None or any("por_estado" not in r for r in resumenes.values()):
+            resumenes = {
+                p["proyecto_id"]: resumir_proyecto(p)
+                for p in self._leer_todas(self.directorio_proyectos)
+            }
+            self._escribir_resumenes(resumenes)
+        return resumenes
+
+    def _escribir_resumenes(self, resumenes: Dict[str, Dict]):
+        """Persiste el indice de resumenes (archivo derivado, sin fsync)"""
+        try:
+            escribir_atomico(
+                self.archivo_resumen,
+                lambda f: json.dump(resumenes, f, ensure_ascii=False),
+                duradero=False,
+            )
+        except (IOError, OSError):
+            pass
+
+    def listar_resumenes_proyectos(self) -> List[Dict]:
+        """Lista id, nombre, version y conteo de columnas y tareas de cada proyecto"""
+        return sorted(
+            self._leer_resumenes().values(), key=lambda r: r.get("fecha_creacion", "")
+        )
+
+    def migrar_desde(self, origen: StorageManager) -> bool:
+        """Importa todos los datos de un StorageManager de archivo unico"""
+        return self.guardar_datos(origen.cargar_datos())
+
+    def cargar_proyecto(self, proyecto_id: str) -> Optional[Proyecto]:
+        """Carga un proyecto leyendo solo su archivo"""
+        datos = self._leer_entidad(
+            self._ruta_entidad(self.directorio_proyectos, proyecto_id)
+        )
+        return Proyecto.from_dict(datos) if datos is not None else None
+
+    def guardar_proyecto(self, proyecto: Proyecto) -> bool:
+        """Guarda un proyecto reescribiendo solo su archivo
+
+        Si otro proceso guardo el proyecto despues de que se cargara (su
+        ``version`` cambio), en lugar de sobrescribirlo se fusionan los cambios
+        por tarea, como en StorageManager, y el objeto se actualiza con el
+        resultado.
+        """
+        ruta = self._ruta_entidad(self.directorio_proyectos, proyecto.proyecto_id)
+        with self._bloqueo():
+            guardado = self._leer_entidad(ruta)
+            vigente = guardado is None or guardado.get("version", 0) == proyecto.version
+            datos = proyecto._a_dict()
+            if not vigente:
+                datos = fusionar_proyectos(
+                    guardado, datos, proyecto._columnas_base, proyecto._tareas_base
+                )
+            datos["version"] = (proyecto.version if vigente else guardado.get("version", 0)) + 1
+            if not self._escribir_entidad(ruta, datos):
+                return False
+            resumenes = self._leer_resumenes()
+            resumenes[proyecto.proyecto_id] = resumir_proyecto(datos)
+            self._escribir_resumenes(resumenes)
+        if not vigente:
+            proyecto.restaurar_contenido(datos["columnas"], datos["miembros"])
+        proyecto.marcar_como_base(datos["version"])
+        return True
+
+    def iterar_proyectos(self) -> Iterator[Proyecto]:
+        """Genera los proyectos de uno en uno, en el orden del indice de resumenes"""
+        for resumen in self.listar_resumenes_proyectos():
+            proyecto = self.cargar_proyecto(resumen["proyecto_id"])
+            if proyecto is not None:
+                yield proyecto
+
+    def iterar_usuarios(self) -> Iterator[Usuario]:
+        """Genera los usuarios de uno en uno"""
+        yield from self.cargar_todos_usuarios()
+
+    def cargar_todos_proyectos(self) -> List[Proyecto]:
+        """Carga todos los proyectos"""
+        return [
+            Proyecto.from_dict(datos)
+            for datos in self._leer_todas(self.directorio_proyectos)
+        ]
+
+    def eliminar_proyecto(self, proyecto_id: str) -> bool:
+        """Elimina un proyecto borrando su archivo
+
+        Como ``guardar_proyecto``, toma el bloqueo para que un guardado
+        simultaneo no pierda su entrada en el indice de resumenes.
+        """
+        ruta = self._ruta_entidad(self.directorio_proyectos, proyecto_id)
+        with self._bloqueo():
+            try:
+                ruta.unlink()
+            except FileNotFoundError:
+                return False
+            resumenes = self._leer_resumenes()
+            if resumenes.pop(proyecto_id, None) is not None:
+                self._escribir_resumenes(resumenes)
+        return True
+
+    def cargar_usuario(self, usuario_id: str) -> Optional[Usuario]:
+        """Carga un usuario leyendo solo su archivo"""
+        datos = self._leer_entidad(self._ruta_entidad(self.directorio_usuarios, usuario_id))
+        return Usuario.from_dict(datos) if datos is not None else None
+
+    def guardar_usuario(self, usuario: Usuario) -> bool:
+        """Guarda un usuario reescribiendo solo su archivo"""
+        ruta = self._ruta_entidad(self.directorio_usuarios, usuario.usuario_id)
+        return self._escribir_entidad(ruta, usuario.to_dict())
+
+    def cargar_todos_usuarios(self) -> List[Usuario]:
+        """Carga todos los usuarios"""
+        return [
+            Usuario.from_dict(datos) for datos in self._leer_todas(self.directorio_usuarios)
+        ]
+
+    def eliminar_usuario(self, usuario_id: str) -> bool:
+        """Elimina un usuario borrando su archivo"""
+        ruta = self._ruta_entidad(self.directorio_usuarios, usuario_id)
+        try:
+            ruta.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def crear_storage(backend: str = STORAGE_BACKEND):
+    """Crea el gestor de persistencia configurado en config.STORAGE_BACKEND"""
+    if backend == "json":
+        return StorageManager(
+            cache=STORAGE_CACHE,
+            intervalo_flush=STORAGE_INTERVALO_FLUSH,
+            respaldos=STORAGE_RESPALDOS,
+            formato=STORAGE_FORMATO,
+            diario=STORAGE_DIARIO,
+        )
+    if backend == "directorio":
+        return DirectorioStorageManager()
+    if backend == "sqlite":
+        # Importacion diferida: sqlite3 solo se carga si se usa este backend
+        from storage_sqlite import SqliteStorageManager
+
+        return SqliteStorageManager()
+    raise ValueError(f"Backend de persistencia desconocido: {backend}")
@@ -0,0 +1,623 @@
+"""
+Persistencia en SQLite
+Implementa la interfaz de StorageManager sobre tablas normalizadas con indices
+"""
+
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Columna, Proyecto, Tarea, Usuario
+from serializacion import detectar_serializador
+from storage import aplicar_diario, fusionar_proyectos
+from config import DATA_DB_FILE, DATA_FILE
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    usuario_id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    email TEXT NOT NULL,
+    fecha_creacion TEXT
+);
+
+CREATE TABLE IF NOT EXISTS proyectos (
+    proyecto_id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    descripcion TEXT NOT NULL DEFAULT '',
+    propietario_id TEXT,
+    fecha_creacion TEXT,
+    fecha_modificacion TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    estadisticas TEXT
+);
+
+CREATE TABLE IF NOT EXISTS proyecto_miembros (
+    proyecto_id TEXT NOT NULL REFERENCES proyectos(proyecto_id) ON DELETE CASCADE,
+    usuario_id TEXT NOT NULL,
+    posicion INTEGER NOT NULL,
+    PRIMARY KEY (proyecto_id, usuario_id)
+);
+
+CREATE TABLE IF NOT EXISTS columnas (
+    columna_id TEXT PRIMARY KEY,
+    proyecto_id TEXT NOT NULL REFERENCES proyectos(proyecto_id) ON DELETE CASCADE,
+    nombre TEXT NOT NULL,
+    orden INTEGER NOT NULL DEFAULT 0,
+    posicion INTEGER NOT NULL,
+    fecha_creacion TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tareas (
+    tarea_id TEXT PRIMARY KEY,
+    columna_id TEXT NOT NULL REFERENCES columnas(columna_id) ON DELETE CASCADE,
+    proyecto_id TEXT NOT NULL,
+    posicion INTEGER NOT NULL,
+    titulo TEXT NOT NULL,
+    descripcion TEXT NOT NULL DEFAULT '',
+    prioridad TEXT NOT NULL,
+    asignado_a TEXT,
+    estado TEXT NOT NULL,
+    fecha_creacion TEXT,
+    fecha_modificacion TEXT,
+    fecha_vencimiento TEXT,
+    rango INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS tarea_etiquetas (
+    tarea_id TEXT NOT NULL REFERENCES tareas(tarea_id) ON DELETE CASCADE,
+    etiqueta TEXT NOT NULL,
+    posicion INTEGER NOT NULL,
+    PRIMARY KEY (tarea_id, etiqueta)
+);
+
+CREATE INDEX IF NOT EXISTS idx_proyectos_propietario ON proyectos(propietario_id);
+CREATE INDEX IF NOT EXISTS idx_miembros_usuario ON proyecto_miembros(usuario_id);
+CREATE INDEX IF NOT EXISTS idx_columnas_proyecto ON columnas(proyecto_id, posicion);
+CREATE INDEX IF NOT EXISTS idx_tareas_columna ON tareas(columna_id, posicion);
+CREATE INDEX IF NOT EXISTS idx_tareas_proyecto ON tareas(proyecto_id);
+CREATE INDEX IF NOT EXISTS idx_tareas_estado ON tareas(proyecto_id, estado);
+CREATE INDEX IF NOT EXISTS idx_tareas_asignado ON tareas(asignado_a);
+CREATE INDEX IF NOT EXISTS idx_etiquetas_etiqueta ON tarea_etiquetas(etiqueta);
+"""
+
+
+def _filas_tarea(
+    tarea: Dict,
+    columna_id: str,
+    proyecto_id: str,
+    posicion: int,
+    tareas: List[tuple],
+    etiquetas: List[tuple],
+):
+    """Anade a ``tareas`` y ``etiquetas`` las filas de una tarea serializada"""
+    tareas.append(
+        (
+            tarea["tarea_id"],
+            columna_id,
+            proyecto_id,
+            posicion,
+            tarea["titulo"],
+            tarea.get("descripcion", ""),
+            tarea.get("prioridad", "Media"),
+            tarea.get("asignado_a"),
+            tarea.get("estado", "Pendiente"),
+            tarea.get("fecha_creacion"),
+            tarea.get("fecha_modificacion"),
+            tarea.get("fecha_vencimiento"),
+            tarea.get("rango"),
+        )
+    )
+    for i, etiqueta in enumerate(dict.fromkeys(tarea.get("etiquetas", []))):
+        etiquetas.append((tarea["tarea_id"], etiqueta, i))
+
+
+def _estadisticas(datos: Dict) -> Optional[str]:
+    """Contadores de un proyecto serializado como JSON (None si no los tiene)"""
+    estadisticas = datos.get("estadisticas")
+    if estadisticas is None:
+        return None
+    return json.dumps(estadisticas, ensure_ascii=False)
+
+
+class SqliteStorageManager:
+    """Gestiona la persistencia en una base de datos SQLite local
+
+    Las busquedas puntuales usan los indices de la base de datos y cada
+    guardado es una transaccion que solo reescribe las filas del proyecto o
+    usuario afectado. Expone la misma interfaz que StorageManager.
+    """
+
+    # Las altas al final de columnas solo insertan sus filas (ver _tareas_anexadas)
+    guardado_incremental = True
+
+    def __init__(self, archivo_db: Path = DATA_DB_FILE):
+        self.archivo_db = archivo_db
+        self.directorio_indices = archivo_db.with_name(f"{archivo_db.stem}.indices")
+        self.archivo_db.parent.mkdir(parents=True, exist_ok=True)
+        self._conexion = sqlite3.connect(str(archivo_db))
+        self._conexion.row_factory = sqlite3.Row
+        self._conexion.execute("PRAGMA foreign_keys = ON")
+        self._conexion.execute("PRAGMA journal_mode = WAL")
+        self._conexion.executescript(ESQUEMA)
+        self._migrar()
+        self._lotes_abiertos = 0
+
+    def _migrar(self):
+        """Anade a una base de datos anterior las columnas que le faltan"""
+        for tabla, columna, tipo in (
+            ("tareas", "rango", "INTEGER"),
+            ("proyectos", "estadisticas", "TEXT"),
+        ):
+            columnas = {
+                fila["name"] for fila in self._conexion.execute(f"PRAGMA table_info({tabla})")
+            }
+            if columna not in columnas:
+                with self._conexion:
+                    self._conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna} {tipo}")
+
+    def cerrar(self):
+        """Cierra la conexion con la base de datos"""
+        self._conexion.close()
+
+    def sincronizar(self) -> bool:
+        """Cada guardado ya es una transaccion confirmada"""
+        return True
+
+    @contextmanager
+    def _transaccion(self) -> Iterator[None]:
+        """Transaccion de una escritura; dentro de un lote, un savepoint del lote"""
+        if not self._lotes_abiertos:
+            with self._conexion:
+                # IMMEDIATE: el bloqueo de escritura se toma antes de leer la
+                # version guardada, asi nadie puede guardar entre medias
+                self._conexion.execute("BEGIN IMMEDIATE")
+                yield
+            return
+        self._conexion.execute("SAVEPOINT escritura")
+        try:
+            yield
+        except BaseException:
+            self._conexion.execute("ROLLBACK TO escritura")
+            raise
+        finally:
+            self._conexion.execute("RELEASE escritura")
+
+    @contextmanager
+    def lote(self) -> Iterator["SqliteStorageManager"]:
+        """Agrupa varios guardados en una sola transaccion (un unico commit)
+
+        Un guardado que falla dentro del lote se deshace sin afectar a los
+        demas; si el bloque lanza una excepcion se deshace todo el lote.
+        """
+        if not self._lotes_abiertos:
+            self._conexion.execute("BEGIN IMMEDIATE")
+        self._lotes_abiertos += 1
+        try:
+            yield self
+        except BaseException:
+            self._lotes_abiertos -= 1
+            if not self._lotes_abiertos:
+                self._conexion.rollback()
+            raise
+        self._lotes_abiertos -= 1
+        if not self._lotes_abiertos:
+            self._conexion.commit()
+
+    # Lectura
+
+    def _filas_a_proyectos(
+        self, filas_proyectos: Iterable[sqlite3.Row], proyecto_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Reconstruye los diccionarios de proyecto con columnas, tareas y miembros
+
+        Con ``proyecto_id`` solo se consultan las filas de ese proyecto; sin el,
+        las de todos los proyectos (sin listas IN que puedan exceder los limites).
+        """
+        proyectos = [dict(fila) for fila in filas_proyectos]
+        if not proyectos:
+            return []
+
+        filtro, parametros = ("", ())
+        if proyecto_id:
+            filtro, parametros = "WHERE proyecto_id = ?", (proyecto_id,)
+        por_id = {}
+        for proyecto in proyectos:
+            # Contadores persistidos (JSON); sin ellos se calculan al cargar
+            estadisticas = proyecto.pop("estadisticas", None)
+            if estadisticas:
+                proyecto["estadisticas"] = json.loads(estadisticas)
+            proyecto["columnas"] = []
+            proyecto["miembros"] = []
+            por_id[proyecto["proyecto_id"]] = proyecto
+
+        for fila in self._conexion.execute(
+            f"SELECT proyecto_id, usuario_id FROM proyecto_miembros {filtro} "
+            f"ORDER BY proyecto_id, posicion",
+            parametros,
+        ):
+            por_id[fila["proyecto_id"]]["miembros"].append(fila["usuario_id"])
+
+        columnas = {}
+        for fila in self._conexion.execute(
+            f"SELECT columna_id, proyecto_id, nombre, orden, fecha_creacion FROM columnas "
+            f"{filtro} ORDER BY proyecto_id, posicion",
+            parametros,
+        ):
+            columna = dict(fila)
+            columna["tareas"] = []
+            columnas[columna["columna_id"]] = columna
+            por_id[columna.pop("proyecto_id")]["columnas"].append(columna)
+
+        tareas = {}
+        for fila in self._conexion.execute(
+            f"SELECT tarea_id, columna_id, titulo, descripcion, prioridad, asignado_a, "
+            f"estado, fecha_creacion, fecha_modificacion, fecha_vencimiento, rango FROM tareas "
+            f"{filtro} ORDER BY columna_id, posicion",
+            parametros,
+        ):
+            tarea = dict(fila)
+            tarea["etiquetas"] = []
+            tareas[tarea["tarea_id"]] = tarea
+            columnas[tarea.pop("columna_id")]["tareas"].append(tarea)
+
+        if tareas:
+            for fila in self._conexion.execute(
+                f"SELECT tarea_id, etiqueta FROM tarea_etiquetas "
+                f"WHERE tarea_id IN (SELECT tarea_id FROM tareas {filtro}) "
+                f"ORDER BY tarea_id, posicion",
+                parametros,
+            ):
+                tareas[fila["tarea_id"]]["etiquetas"].append(fila["etiqueta"])
+        return proyectos
+
+    def cargar_datos(self) -> Dict:
+        """Carga todos los datos con el mismo formato que StorageManager"""
+        filas = self._conexion.execute("SELECT * FROM proyectos ORDER BY rowid")
+        usuarios = self._conexion.execute("SELECT * FROM usuarios ORDER BY rowid")
+        return {
+            "proyectos": self._filas_a_proyectos(filas.fetchall()),
+            "usuarios": [dict(fila) for fila in usuarios],
+        }
+
+    def cargar_proyecto(self, proyecto_id: str) -> Optional[Proyecto]:
+        """Carga un proyecto por su clave primaria"""
+        filas = self._conexion.execute(
+            "SELECT * FROM proyectos WHERE proyecto_id = ?", (proyecto_id,)
+        ).fetchall()
+        proyectos = self._filas_a_proyectos(filas, proyecto_id)
+        return Proyecto.from_dict(proyectos[0]) if proyectos else None
+
+    def cargar_todos_proyectos(self) -> List[Proyecto]:
+        """Carga todos los proyectos"""
+        filas = self._conexion.execute("SELECT * FROM proyectos ORDER BY rowid").fetchall()
+        return [Proyecto.from_dict(datos) for datos in self._filas_a_proyectos(filas)]
+
+    def listar_resumenes_proyectos(self) -> List[Dict]:
+        """Lista id, nombre, version y conteo de columnas y tareas usando los indices
+
+        Los conteos de tareas salen de los contadores persistidos; los
+        proyectos que no los tienen se cuentan con consultas agrupadas.
+        """
+        filas = self._conexion.execute(
+            "SELECT p.proyecto_id, p.nombre, "
+            "(SELECT COUNT(*) FROM columnas c WHERE c.proyecto_id = p.proyecto_id) "
+            "AS total_columnas, "
+            "p.fecha_creacion, p.version, p.estadisticas FROM proyectos p ORDER BY p.rowid"
+        )
+        resumenes = []
+        for fila in filas:
+            resumen = dict(fila)
+            estadisticas = resumen.pop("estadisticas")
+            if estadisticas:
+                estadisticas = json.loads(estadisticas)
+            else:
+                estadisticas = self._contar_tareas(resumen["proyecto_id"])
+            resumen["total_tareas"] = estadisticas["total"]
+            resumen["por_estado"] = estadisticas.get("por_estado", {})
+            resumen["por_prioridad"] = estadisticas.get("por_prioridad", {})
+            resumenes.append(resumen)
+        return resumenes
+
+    def _contar_tareas(self, proyecto_id: str) -> Dict:
+        """Total de tareas de un proyecto y conteos por estado y prioridad"""
+        conteos = {}
+        for campo in ("estado", "prioridad"):
+            filas = self._conexion.execute(
+                f"SELECT {campo}, COUNT(*) FROM tareas WHERE proyecto_id = ? GROUP BY {campo}",
+                (proyecto_id,),
+            )
+            conteos[f"por_{campo}"] = {valor: cantidad for valor, cantidad in filas}
+        conteos["total"] = sum(conteos["por_estado"].values())
+        return conteos
+
+    def iterar_proyectos(self) -> Iterator[Proyecto]:
+        """Genera los proyectos de uno en uno (una consulta indexada por proyecto)"""
+        ids = [
+            fila["proyecto_id"]
+            for fila in self._conexion.execute("SELECT proyecto_id FROM proyectos ORDER BY rowid")
+        ]
+        for proyecto_id in ids:
+            proyecto = self.cargar_proyecto(proyecto_id)
+            if proyecto is not None:
+                yield proyecto
+
+    def iterar_usuarios(self) -> Iterator[Usuario]:
+        """Genera los usuarios de uno en uno"""
+        for fila in self._conexion.execute("SELECT * FROM usuarios ORDER BY rowid"):
+            yield Usuario.from_dict(dict(fila))
+
+    def cargar_usuario(self, usuario_id: str) -> Optional[Usuario]:
+        """Carga un usuario por su clave primaria"""
+        fila = self._conexion.execute(
+            "SELECT * FROM usuarios WHERE usuario_id = ?", (usuario_id,)
+        ).fetchone()
+        return Usuario.from_dict(dict(fila)) if fila else None
+
+    def cargar_todos_usuarios(self) -> List[Usuario]:
+        """Carga todos los usuarios"""
+        filas = self._conexion.execute("SELECT * FROM usuarios ORDER BY rowid")
+        return [Usuario.from_dict(dict(fila)) for fila in filas]
+
+    # Escritura
+
+    def _escribir_proyecto(self, datos: Dict):
+        """Inserta o reemplaza las filas de un proyecto (dentro de una transaccion)"""
+        proyecto_id = datos["proyecto_id"]
+        self._conexion.execute(
+            "INSERT INTO proyectos (proyecto_id, nombre, descripcion, propietario_id, "
+            "fecha_creacion, fecha_modificacion, version, estadisticas) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(proyecto_id) DO UPDATE SET nombre = excluded.nombre, "
+            "descripcion = excluded.descripcion, propietario_id = excluded.propietario_id, "
+            "fecha_creacion = excluded.fecha_creacion, "
+            "fecha_modificacion = excluded.fecha_modificacion, version = excluded.version, "
+            "estadisticas = excluded.estadisticas",
+            (
+                proyecto_id,
+                datos["nombre"],
+                datos.get("descripcion", ""),
+                datos.get("propietario_id"),
+                datos.get("fecha_creacion"),
+                datos.get("fecha_modificacion"),
+                datos.get("version", 0),
+                _estadisticas(datos),
+            ),
+        )
+        # Las columnas arrastran en cascada a sus tareas y etiquetas
+        self._conexion.execute("DELETE FROM columnas WHERE proyecto_id = ?", (proyecto_id,))
+        self._conexion.execute(
+            "DELETE FROM proyecto_miembros WHERE proyecto_id = ?", (proyecto_id,)
+        )
+
+        self._conexion.executemany(
+            "INSERT INTO proyecto_miembros (proyecto_id, usuario_id, posicion) VALUES (?, ?, ?)",
+            [(proyecto_id, u, i) for i, u in enumerate(dict.fromkeys(datos.get("miembros", [])))],
+        )
+
+        columnas, tareas, etiquetas = [], [], []
+        for posicion_columna, columna in enumerate(datos.get("columnas", [])):
+            columnas.append(
+                (
+                    columna["columna_id"],
+                    proyecto_id,
+                    columna["nombre"],
+                    columna.get("orden", 0),
+                    posicion_columna,
+                    columna.get("fecha_creacion"),
+                )
+            )
+            for posicion, tarea in enumerate(columna.get("tareas", [])):
+                _filas_tarea(tarea, columna["columna_id"], proyecto_id, posicion, tareas, etiquetas)
+
+        self._conexion.executemany(
+            "INSERT INTO columnas (columna_id, proyecto_id, nombre, orden, posicion, "
+            "fecha_creacion) VALUES (?, ?, ?, ?, ?, ?)",
+            columnas,
+        )
+        self._insertar_tareas(tareas, etiquetas)
+
+    def _insertar_tareas(self, tareas: List[tuple], etiquetas: List[tuple]):
+        """Inserta filas de tareas y de sus etiquetas (dentro de una transaccion)"""
+        self._conexion.executemany(
+            "INSERT INTO tareas (tarea_id, columna_id, proyecto_id, posicion, titulo, "
+            "descripcion, prioridad, asignado_a, estado, fecha_creacion, "
+            "fecha_modificacion, fecha_vencimiento, rango) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            tareas,
+        )
+        self._conexion.executemany(
+            "INSERT INTO tarea_etiquetas (tarea_id, etiqueta, posicion) VALUES (?, ?, ?)",
+            etiquetas,
+        )
+
+    def _escribir_usuario(self, datos: Dict):
+        """Inserta o actualiza la fila de un usuario (dentro de una transaccion)"""
+        self._conexion.execute(
+            "INSERT INTO usuarios (usuario_id, nombre, email, fecha_creacion) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT(usuario_id) DO UPDATE SET "
+            "nombre = excluded.nombre, email = excluded.email, "
+            "fecha_creacion = excluded.fecha_creacion",
+            (
+                datos["usuario_id"],
+                datos["nombre"],
+                datos["email"],
+                datos.get("fecha_creacion"),
+            ),
+        )
+
+    def guardar_datos(self, datos: Dict) -> bool:
+        """Reemplaza todos los datos en una unica transaccion"""
+        try:
+            with self._transaccion():
+                self._conexion.execute("DELETE FROM proyectos")
+                self._conexion.execute("DELETE FROM usuarios")
+                for datos_usuario in datos.get("usuarios", []):
+                    self._escribir_usuario(datos_usuario)
+                for datos_proyecto in datos.get("proyectos", []):
+                    self._escribir_proyecto(datos_proyecto)
+            return True
+        except (sqlite3.Error, KeyError, TypeError) as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    def _tareas_anexadas(
+        self, proyecto: Proyecto
+    ) -> Optional[List[Tuple[Columna, int, Tarea]]]:
+        """(columna, posicion, tarea) agregadas al final de sus columnas desde la
+        ultima carga o guardado, si es el unico cambio pendiente; None en otro caso
+        """
+        operaciones = proyecto.operaciones_pendientes()
+        if not operaciones or any(op["op"] != "agregar_tarea" for op in operaciones):
+            return None
+
+        por_columna: Dict[str, List[str]] = {}
+        for op in operaciones:
+            por_columna.setdefault(op["columna_id"], []).append(op["tarea"]["tarea_id"])
+        anexadas = []
+        for columna_id, ids in por_columna.items():
+            columna = proyecto.obtener_columna(columna_id)
+            if columna is None or columna.columna_id not in proyecto._columnas_base:
+                return None
+            # Solo si ocupan las ultimas posiciones: las demas filas no cambian
+            tareas = columna.tareas
+            inicio = len(tareas) - len(ids)
+            if inicio < 0 or {t.tarea_id for t in tareas[inicio:]} != set(ids):
+                return None
+            anexadas.extend(
+                (columna, posicion, tareas[posicion]) for posicion in range(inicio, len(tareas))
+            )
+        return anexadas
+
+    def guardar_proyecto(self, proyecto: Proyecto) -> bool:
+        """Guarda un proyecto en una transaccion
+
+        Si desde que se cargo o guardo solo se agregaron tareas al final de sus
+        columnas (por ejemplo, una importacion por lotes) solo se insertan las
+        filas de esas tareas en lugar de reescribir el proyecto. Cualquier otra
+        operacion pendiente, incluidas las de asignar campos del proyecto o de
+        una tarea, obliga a reescribirlo.
+
+        Si otro proceso guardo el proyecto despues de que se cargara (su
+        ``version`` cambio), en lugar de sobrescribirlo se fusionan los cambios
+        por tarea, como en StorageManager, y el objeto se actualiza con el
+        resultado.
+        """
+        try:
+            with self._transaccion():
+                fila = self._conexion.execute(
+                    "SELECT * FROM proyectos WHERE proyecto_id = ?", (proyecto.proyecto_id,)
+                ).fetchone()
+                vigente = fila is None or fila["version"] == proyecto.version
+                version = (proyecto.version if fila is None else fila["version"]) + 1
+                anexadas = self._tareas_anexadas(proyecto) if fila is not None and vigente else None
+                if anexadas is None:
+                    nuevo = proyecto._a_dict()
+                    if not vigente:
+                        guardado = self._filas_a_proyectos([fila], proyecto.proyecto_id)[0]
+                        nuevo = fusionar_proyectos(
+                            guardado, nuevo, proyecto._columnas_base, proyecto._tareas_base
+                        )
+                    nuevo["version"] = version
+                    self._escribir_proyecto(nuevo)
+                else:
+                    tareas, etiquetas = [], []
+                    for columna, posicion, tarea in anexadas:
+                        _filas_tarea(
+                            tarea._a_dict(),
+                            columna.columna_id,
+                            proyecto.proyecto_id,
+                            posicion,
+                            tareas,
+                            etiquetas,
+                        )
+                    self._insertar_tareas(tareas, etiquetas)
+                    self._conexion.execute(
+                        "UPDATE proyectos SET version = ?, estadisticas = ? "
+                        "WHERE proyecto_id = ?",
+                        (
+                            version,
+                            json.dumps(proyecto._contadores.to_dict(), ensure_ascii=False),
+                            proyecto.proyecto_id,
+                        ),
+                    )
+            if not vigente:
+                proyecto.restaurar_contenido(nuevo["columnas"], nuevo["miembros"])
+            proyecto.marcar_como_base(version)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    def eliminar_proyecto(self, proyecto_id: str) -> bool:
+        """Elimina un proyecto con sus columnas, tareas y miembros"""
+        try:
+            with self._transaccion():
+                cursor = self._conexion.execute(
+                    "DELETE FROM proyectos WHERE proyecto_id = ?", (proyecto_id,)
+                )
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    def guardar_usuario(self, usuario: Usuario) -> bool:
+        """Guarda un usuario en una transaccion"""
+        try:
+            with self._transaccion():
+                self._escribir_usuario(usuario.to_dict())
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    def eliminar_usuario(self, usuario_id: str) -> bool:
+        """Elimina un usuario"""
+        try:
+            with self._transaccion():
+                self._conexion.execute(
+                    "DELETE FROM usuarios WHERE usuario_id = ?", (usuario_id,)
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar datos: {e}")
+            return False
+
+    # Migracion
+
+    def migrar_desde_json(self, archivo_json: Path = DATA_FILE) -> bool:
+        """Importa de una vez un projects.json existente, reemplazando el contenido
+
+        Acepta tanto el formato JSON como el binario de serializacion.py, y
+        reaplica el diario de operaciones si existe.
+        """
+        try:
+            with open(archivo_json, "rb") as f:
+                contenido = f.read()
+            datos = detectar_serializador(contenido).leer(contenido)
+        except (ValueError, IOError) as e:
+            print(f"Error al cargar datos: {e}")
+            return False
+        aplicar_diario(datos, archivo_json.with_name(f"{archivo_json.name}.diario"))
+        return self.guardar_datos(datos)
+
+
+def migrar_json_a_sqlite(
+    archivo_json: Path = DATA_FILE, archivo_db: Path = DATA_DB_FILE
+) -> bool:
+    """Migra un projects.json a una base de datos SQLite"""
+    storage = SqliteStorageManager(archivo_db)
+    try:
+        return storage.migrar_desde_json(archivo_json)
+    finally:
+        storage.cerrar()
+
+
+if __name__ == "__main__":
+    # Uso: python storage_sqlite.py [projects.json] [projects.db]
+    origen = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_FILE
+    destino = Path(sys.argv[2]) if len(sys.argv) > 2 else DATA_DB_FILE
+    sys.exit(0 if migrar_json_a_sqlite(origen, destino) else 1)
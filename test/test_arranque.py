@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Tiempo acumulado de "import main" segun python -X importtime (minimo de varias
+# ejecuciones, en milisegundos). Holgado para maquinas lentas de CI.
+PRESUPUESTO_IMPORTACION_MS = 60
+MODULOS_DIFERIDOS = ("models", "storage", "serializacion", "typing", "pathlib", "uuid")
+
+
+def _ejecutar(codigo: str, *opciones: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *opciones, "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_importar_config_no_toca_el_sistema_de_archivos():
+    salida = _ejecutar("import sys, config; print('pathlib' in sys.modules)").stdout
+    assert salida.strip() == "False"
+
+
+def test_menu_principal_sin_cargar_modelos_ni_persistencia():
+    codigo = (
+        "import sys, builtins\n"
+        "builtins.input = lambda *a: '4'\n"
+        "import cli\n"
+        "app = cli.CliInterface()\n"
+        "app.limpiar_pantalla = lambda: None\n"
+        "app.ejecutar()\n"
+        f"print([m for m in {MODULOS_DIFERIDOS!r} if m in sys.modules])\n"
+    )
+    salida = _ejecutar(codigo).stdout
+    assert "MENU PRINCIPAL" in salida
+    assert salida.strip().splitlines()[-1] == "[]"
+
+
+def test_presupuesto_de_importacion():
+    tiempos = []
+    for _ in range(3):
+        registro = _ejecutar("import main", "-X", "importtime").stderr
+        linea = next(l for l in registro.splitlines() if l.endswith("| main"))
+        tiempos.append(int(linea.split("|")[1]) / 1000)
+    assert min(tiempos) < PRESUPUESTO_IMPORTACION_MS
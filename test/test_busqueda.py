@@ -0,0 +1,92 @@
+import random
+
+from busqueda import IndiceBusqueda, buscar_tareas, guardar_indice_busqueda, indice_busqueda
+from models import Proyecto, Tarea
+
+PALABRAS = ["implementar", "revisar", "codigo", "documentación", "API", "login", "pago", "ab"]
+
+
+def _proyecto(cantidad=300):
+    aleatorio = random.Random(7)
+    proyecto = Proyecto("Busqueda")
+    columnas = [proyecto.agregar_columna(n) for n in ("Pendiente", "Hecho")]
+    for i in range(cantidad):
+        tarea = Tarea(
+            " ".join(aleatorio.sample(PALABRAS, 2)) + f" T{i}",
+            " ".join(aleatorio.choices(PALABRAS, k=4)),
+        )
+        columnas[i % 2].agregar_tarea(tarea)
+        if i % 3 == 0:
+            tarea.agregar_etiqueta("Backend")
+    return proyecto
+
+
+def _recorrido(proyecto, termino):
+    termino = termino.strip().lower()
+    return {
+        t.tarea_id
+        for t in proyecto.obtener_todas_las_tareas()
+        if termino in t.titulo.lower() or termino in t.descripcion.lower()
+    }
+
+
+def test_coincide_con_recorrer_las_tareas_y_ordena_por_relevancia():
+    proyecto = _proyecto()
+    indice = IndiceBusqueda(proyecto)
+    for termino in ["ment", "DOCUMENTACIÓN", "a", "ab", "codigo revisar", "T1", "t12 ", "nada"]:
+        encontradas = {t.tarea_id for _, t in indice.buscar(proyecto, termino)}
+        assert encontradas == _recorrido(proyecto, termino)
+
+    resultados = indice.buscar(proyecto, "t1", limite=3)
+    assert len(resultados) == 3
+    titulos = [t.titulo.lower() for _, t in resultados]
+    assert all(titulo.split()[-1].startswith("t1") for titulo in titulos)
+    columna, tarea = resultados[0]
+    assert proyecto.localizar_tarea(tarea.tarea_id) == (columna, tarea)
+
+    con_etiqueta = indice.buscar(proyecto, "#backend pago")
+    assert con_etiqueta and all("Backend" in t.etiquetas for _, t in con_etiqueta)
+    assert {t.tarea_id for _, t in con_etiqueta} < _recorrido(proyecto, "pago")
+    assert len(indice.buscar(proyecto, "#backend")) == 100
+
+
+def test_indice_se_mantiene_con_las_operaciones():
+    proyecto = _proyecto(30)
+    pendiente, hecho = proyecto.columnas
+    indice = indice_busqueda(proyecto)
+    tarea = pendiente.tareas[0]
+
+    tarea.actualizar(titulo="Migrar facturacion", descripcion="")
+    nueva = Tarea("Facturas pendientes")
+    hecho.agregar_tarea(nueva)
+    nueva.agregar_etiqueta("urgente")
+    pendiente.eliminar_tarea(pendiente.tareas[1].tarea_id)
+    hecho.tareas[0].eliminar_etiqueta("Backend")
+
+    assert indice_busqueda(proyecto) is indice
+    for termino in ["factura", "T0", "implementar", "#urgente", "#backend"]:
+        assert indice.buscar(proyecto, termino) == IndiceBusqueda(proyecto).buscar(proyecto, termino)
+    assert [t for _, t in buscar_tareas(proyecto, "fact #urgente")] == [nueva]
+
+
+def test_indice_persistido_se_reutiliza_si_sigue_vigente(tmp_path):
+    proyecto = _proyecto(50)
+    proyecto.marcar_como_base(3)
+    indice = indice_busqueda(proyecto, tmp_path)
+    ruta = tmp_path / f"{proyecto.proyecto_id}.busqueda.json"
+    assert ruta.exists()
+
+    cargado = IndiceBusqueda.cargar(proyecto, ruta)
+    for termino in ["login", "T4", "#backend", "ab"]:
+        assert cargado.buscar(proyecto, termino) == indice.buscar(proyecto, termino)
+    # Tras eliminar tareas el indice guardado se compacta
+    proyecto.columnas[0].eliminar_tarea(proyecto.columnas[0].tareas[0].tarea_id)
+    proyecto.marcar_como_base(4)
+    assert guardar_indice_busqueda(proyecto, tmp_path)
+    assert IndiceBusqueda.cargar(proyecto, ruta).buscar(proyecto, "T") == indice.buscar(proyecto, "T")
+
+    # No sirve para otra version del proyecto ni con cambios sin guardar
+    proyecto.marcar_como_base(5)
+    assert IndiceBusqueda.cargar(proyecto, ruta) is None
+    proyecto.columnas[0].tareas[0].actualizar(titulo="Cambio")
+    assert not guardar_indice_busqueda(proyecto, tmp_path)
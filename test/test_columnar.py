@@ -0,0 +1,71 @@
+from datetime import date
+
+from columnar import SIN_FECHA, TareasColumnares, vista_columnar
+from models import Proyecto, Tarea
+from utils import ProyectoAnalytics
+
+
+def _proyecto():
+    proyecto = Proyecto("Analitica")
+    pendiente = proyecto.agregar_columna("Pendiente")
+    hecho = proyecto.agregar_columna("Hecho")
+    for i in range(12):
+        tarea = Tarea(f"T{i}", prioridad=("Baja", "Alta", "Urgente")[i % 3],
+                      asignado_a=("ana", None, "luis", "")[i % 4])
+        tarea.fecha_vencimiento = ("2020-01-01", "2999-01-01T10:00:00", None, "no es fecha")[i % 4]
+        (hecho if i % 2 else pendiente).agregar_tarea(tarea)
+    hecho.tareas[0].actualizar(estado="Completada")
+    return proyecto
+
+
+def test_vista_columnar_equivale_a_recorrer_tareas():
+    proyecto = _proyecto()
+    vista = TareasColumnares(proyecto)
+    tareas = proyecto.obtener_todas_las_tareas()
+
+    assert vista.contar_por_prioridad()["Alta"] == sum(t.prioridad == "Alta" for t in tareas)
+    assert vista.contar_por_estado() == {
+        "Pendiente": 11, "En Progreso": 0, "Completada": 1, "Bloqueada": 0
+    }
+    assert vista.contar_por_asignado() == {"ana": 3, None: 6, "luis": 3}
+    assert vista.contar_por_columna() == {c.columna_id: 6 for c in proyecto.columnas}
+    assert vista.seleccionar(vista.filtrar(prioridad="Urgente", asignado_a="luis")) == [
+        t for t in tareas if t.prioridad == "Urgente" and t.asignado_a == "luis"
+    ]
+    assert vista.filtrar(estado="Inexistente") == []
+    sin_fecha = [t.titulo for i, t in enumerate(vista.tareas) if vista.vencimiento[i] == SIN_FECHA]
+    assert sorted(sin_fecha) == sorted(f"T{i}" for i in range(12) if i % 4 in (2, 3))
+
+    retrasadas = vista.seleccionar(vista.posiciones_retrasadas(date(2021, 1, 1)))
+    assert [t.titulo for t in retrasadas] == ["T0", "T4", "T8"]
+
+
+def test_vista_se_reconstruye_solo_si_el_proyecto_cambia():
+    proyecto = _proyecto()
+    vista = vista_columnar(proyecto)
+    assert vista_columnar(proyecto) is vista
+
+    proyecto.columnas[0].tareas[0].actualizar(estado="Completada")
+    assert vista_columnar(proyecto) is not vista
+    assert ProyectoAnalytics.obtener_tareas_por_estado(proyecto)["Completada"] == 2
+    assert ProyectoAnalytics.obtener_tareas_por_usuario(proyecto)["Sin Asignar"] == 6
+    assert len(ProyectoAnalytics.obtener_tareas_retrasadas(proyecto)) == 2
+    assert ProyectoAnalytics.obtener_progreso_proyecto(proyecto) == 2 / 12 * 100
+
+
+def test_estadisticas_en_un_recorrido_coinciden_con_metricas_sueltas():
+    from utils import EstadisticasProyecto
+
+    proyecto = _proyecto()
+    estadisticas = EstadisticasProyecto(proyecto, hoy=date(2021, 1, 1))
+
+    assert estadisticas.total_tareas == proyecto.contar_tareas() == 12
+    assert estadisticas.por_estado == ProyectoAnalytics.obtener_tareas_por_estado(proyecto)
+    assert estadisticas.por_prioridad == ProyectoAnalytics.obtener_tareas_por_prioridad(proyecto)
+    assert estadisticas.por_usuario == ProyectoAnalytics.obtener_tareas_por_usuario(proyecto)
+    assert estadisticas.progreso == ProyectoAnalytics.obtener_progreso_proyecto(proyecto)
+    assert (estadisticas.asignadas, estadisticas.sin_asignar) == (6, 6)
+    assert [n for _, n in estadisticas.por_columna] == [6, 6]
+    assert [t.titulo for t in estadisticas.retrasadas] == ["T0", "T4", "T8"]
+    assert estadisticas.porcentaje(3) == 25
+    assert "Total de tareas: 12" in ProyectoAnalytics.generar_reporte_texto(proyecto, estadisticas)
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from comandos import EjecutorComandos, ErrorComando, ejecutar_comandos
+from models import Proyecto
+from storage import StorageManager
+from storage_sqlite import SqliteStorageManager
+
+LOTE = """
+# Tablero de ejemplo
+proyecto crear Web --columnas "Pendiente,Hecho"
+usuario crear Ana ana@dom.com
+tarea agregar Web Pendiente "Pantalla de login" -p Alta -a Ana -e backend -e api
+tarea agregar web pendiente 'Pago con tarjeta' -v 2024-05-01 -s "En Progreso"
+columna agregar Web Revision
+"""
+
+
+def test_lote_se_ejecuta_y_guarda_una_vez(tmp_json_path, monkeypatch, capsys):
+    storage = StorageManager(tmp_json_path)
+    escrituras = []
+    original = storage._escribir_archivo
+    monkeypatch.setattr(
+        storage, "_escribir_archivo", lambda d: escrituras.append(1) or original(d)
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO(LOTE))
+
+    assert ejecutar_comandos(["lote"], storage) == 0
+    assert len(escrituras) == 1
+    proyecto = storage.cargar_todos_proyectos()[0]
+    assert [c.nombre for c in proyecto.columnas] == ["Pendiente", "Hecho", "Revision"]
+    login, pago = proyecto.columnas[0].tareas
+    assert (login.prioridad, login.asignado_a) == ("Alta", "Ana")
+    assert login.etiquetas == ("backend", "api")
+    assert (pago.estado, pago.fecha_vencimiento) == ("En Progreso", "2024-05-01")
+    assert [u.nombre for u in storage.cargar_todos_usuarios()] == ["Ana"]
+
+    # Los comandos sueltos trabajan sobre lo guardado
+    capsys.readouterr()
+    assert ejecutar_comandos(["tarea", "mover", "Web", login.tarea_id, "Hecho"], storage) == 0
+    actualizar = ["tarea", "actualizar", "Web", pago.tarea_id, "-t", "Pago"]
+    assert ejecutar_comandos(actualizar, storage) == 0
+    assert ejecutar_comandos(["tarea", "listar", "Web"], storage) == 0
+    salida = capsys.readouterr().out.splitlines()
+    assert [linea.split("\t")[1:3] for linea in salida] == [
+        ["Pendiente", "Pago"],
+        ["Hecho", "Pantalla de login"],
+    ]
+
+    # En la misma columna reordena; si no cambia nada es un error
+    agregar = ["tarea", "agregar", "Web", "Hecho", "Despliegue"]
+    assert ejecutar_comandos(agregar, storage) == 0
+    mover = ["tarea", "mover", "Web", login.tarea_id, "Hecho"]
+    assert ejecutar_comandos(mover, storage) == 0
+    assert ejecutar_comandos(mover + ["--posicion", "2"], storage) == 1
+    assert "ya esta en esa posicion" in capsys.readouterr().err
+    assert ejecutar_comandos(mover + ["--posicion", "1"], storage) == 0
+    hecho = storage.cargar_todos_proyectos()[0].columnas[1]
+    assert [t.titulo for t in hecho.tareas] == ["Pantalla de login", "Despliegue"]
+    assert ejecutar_comandos(["tarea", "mover", "Web", "nada", "Hecho"], storage) == 1
+
+
+def test_error_en_el_lote_no_guarda_nada(tmp_json_path, capsys):
+    storage = StorageManager(tmp_json_path)
+    ruta = tmp_json_path.parent / "lote.txt"
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(LOTE + "tarea agregar Web Inexistente Otra\n", encoding="utf-8")
+
+    assert ejecutar_comandos(["lote", str(ruta)], storage) == 1
+    assert "linea 8" in capsys.readouterr().err
+    assert storage.listar_resumenes_proyectos() == []
+
+    ejecutor = EjecutorComandos(storage)
+    for comando in (
+        ["tarea", "agregar", "Web"],
+        ["tarea", "agregar", "Nada", "P", "T"],
+        ["tarea", "agregar", "Web", "P", "T", "-p", "Maxima"],
+    ):
+        with pytest.raises(ErrorComando):
+            ejecutor.ejecutar(comando)
+
+
+def test_lote_en_sqlite_es_una_transaccion(tmp_path):
+    storage = SqliteStorageManager(tmp_path / "projects.db")
+    ejecutor = EjecutorComandos(storage)
+    ejecutor.ejecutar_lote(["proyecto crear Carga --columnas Pendiente"])
+    ejecutor.ejecutar_lote(f"tarea agregar Carga Pendiente 'Tarea {i}'" for i in range(500))
+    assert storage.listar_resumenes_proyectos() == []
+
+    assert ejecutor.confirmar()
+    otra = SqliteStorageManager(tmp_path / "projects.db")
+    assert otra.listar_resumenes_proyectos()[0]["total_tareas"] == 500
+
+    # Si el bloque del lote falla se deshacen todos sus guardados
+    with pytest.raises(RuntimeError):
+        with storage.lote():
+            storage.guardar_proyecto(Proyecto("Deshecho"))
+            raise RuntimeError("fallo")
+    assert [r["nombre"] for r in otra.listar_resumenes_proyectos()] == ["Carga"]
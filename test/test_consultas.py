@@ -0,0 +1,136 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from consultas import ARCHIVO_INDICE_GLOBAL, ConsultaTareas, MotorConsultas
+from models import Proyecto, Tarea
+from storage import DirectorioStorageManager, StorageManager
+from storage_sqlite import SqliteStorageManager
+
+ESTADOS = ["Pendiente", "En Progreso", "Completada", "Bloqueada"]
+PRIORIDADES = ["Baja", "Media", "Alta", "Urgente"]
+HOY = date(2024, 3, 1)
+
+
+def _storage(tmp_path, backend):
+    if backend == "json":
+        return StorageManager(tmp_path / "projects.json")
+    if backend == "directorio":
+        return DirectorioStorageManager(tmp_path / "entidades")
+    return SqliteStorageManager(tmp_path / "projects.db")
+
+
+def _poblar(storage, proyectos=3, tareas=40):
+    aleatorio = random.Random(5)
+    for p in range(proyectos):
+        proyecto = Proyecto(f"Proyecto {p}")
+        columnas = [proyecto.agregar_columna(n) for n in ("Pendiente", "Hecho")]
+        for i in range(tareas):
+            vence = HOY + timedelta(days=aleatorio.randint(-10, 10))
+            tarea = Tarea(
+                f"Tarea {p}-{i}",
+                aleatorio.choice(["login", "pago", "factura"]),
+                prioridad=aleatorio.choice(PRIORIDADES),
+                asignado_a=aleatorio.choice(["ana", "luis", None]),
+            )
+            tarea.estado = aleatorio.choice(ESTADOS)
+            tarea.fecha_vencimiento = vence.isoformat() if i % 4 else None
+            columnas[i % 2].agregar_tarea(tarea)
+            if i % 3 == 0:
+                tarea.agregar_etiqueta("Backend")
+            if i % 5 == 0:
+                tarea.agregar_etiqueta("urgente")
+        storage.guardar_proyecto(proyecto)
+
+
+def _recorrido(storage, consulta):
+    return [
+        tarea.tarea_id
+        for proyecto in storage.iterar_proyectos()
+        for columna in proyecto.columnas
+        for tarea in columna.tareas
+        if consulta.cumple(tarea) and (not consulta.texto or consulta.cumple_texto(tarea))
+    ]
+
+
+CONSULTAS = [
+    ConsultaTareas(),
+    ConsultaTareas(estados=["Pendiente", "Bloqueada"]),
+    ConsultaTareas(prioridades=["Alta"], asignados=["ana"]),
+    ConsultaTareas(asignados=[""], etiquetas=["backend"]),
+    ConsultaTareas(etiquetas=["BACKEND", "urgente"], estados=["Completada"]),
+    ConsultaTareas(vence_desde=HOY, vence_hasta=HOY + timedelta(days=3)),
+    ConsultaTareas(vence_hasta=HOY - timedelta(days=5), texto="PAGO"),
+    ConsultaTareas(etiquetas=["inexistente"]),
+]
+
+
+@pytest.mark.parametrize("backend", ["json", "directorio", "sqlite"])
+def test_consultas_coinciden_con_recorrer_todos_los_proyectos(tmp_path, backend):
+    storage = _storage(tmp_path, backend)
+    _poblar(storage)
+    motor = MotorConsultas(storage)
+    for consulta in CONSULTAS:
+        encontradas = [tarea.tarea_id for _, _, tarea in motor.iterar(consulta)]
+        assert encontradas == _recorrido(storage, consulta)
+        assert motor.contar(consulta) == len(encontradas)
+    assert (storage.directorio_indices / ARCHIVO_INDICE_GLOBAL).exists()
+
+
+def test_paginas_recorren_los_resultados_en_orden(tmp_path):
+    storage = _storage(tmp_path, "directorio")
+    _poblar(storage)
+    motor = MotorConsultas(storage)
+    consulta = ConsultaTareas(estados=["Pendiente", "En Progreso"])
+    todas = [tarea.tarea_id for _, _, tarea in motor.iterar(consulta)]
+
+    paginas, numero, hay_mas = [], 1, True
+    while hay_mas:
+        resultados, hay_mas = motor.pagina(consulta, numero, tamano=7)
+        paginas.extend(tarea.tarea_id for _, _, tarea in resultados)
+        numero += 1
+    assert paginas == todas
+    assert motor.pagina(consulta, numero, tamano=7) == ([], False)
+
+
+def test_indice_persistido_solo_reindexa_proyectos_modificados(tmp_path, monkeypatch):
+    storage = _storage(tmp_path, "sqlite")
+    _poblar(storage)
+    MotorConsultas(storage).actualizar_indice()
+
+    proyecto = next(storage.iterar_proyectos())
+    tarea = proyecto.columnas[0].tareas[0]
+    tarea.agregar_etiqueta("revisar")
+    storage.guardar_proyecto(proyecto)
+    otro = Proyecto("Nuevo")
+    otro.agregar_columna("Pendiente").agregar_tarea(Tarea("Revisar login"))
+    otro.columnas[0].tareas[0].agregar_etiqueta("revisar")
+    storage.guardar_proyecto(otro)
+
+    cargados = []
+    original = storage.cargar_proyecto
+    monkeypatch.setattr(
+        storage, "cargar_proyecto", lambda pid: cargados.append(pid) or original(pid)
+    )
+    motor = MotorConsultas(storage)
+    resultados = list(motor.iterar(ConsultaTareas(etiquetas=["revisar"])))
+    assert [t.tarea_id for _, _, t in resultados] == [
+        tarea.tarea_id,
+        otro.columnas[0].tareas[0].tarea_id,
+    ]
+    # Dos proyectos reindexados y los mismos dos cargados para los resultados
+    assert sorted(cargados) == sorted([proyecto.proyecto_id, otro.proyecto_id] * 2)
+
+    storage.eliminar_proyecto(otro.proyecto_id)
+    assert motor.contar(ConsultaTareas(etiquetas=["revisar"])) == 1
+
+
+def test_menu_de_proyectos_acepta_c_mayuscula(app, monkeypatch, capsys):
+    entradas = iter(["C", "5"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(entradas))
+    consultas = []
+    monkeypatch.setattr(app, "consultar_tareas", lambda: consultas.append(1))
+    app.mostrar_menu_proyectos()
+    assert consultas == [1]
+    assert "Opcion no valida" not in capsys.readouterr().out
@@ -0,0 +1,88 @@
+import pytest
+
+from etiquetas import IndiceEtiquetas, indice_etiquetas
+from models import Proyecto, Tarea
+from utils import EstadisticasProyecto
+
+
+def _proyecto():
+    proyecto = Proyecto("Etiquetas")
+    pendiente, hecho = proyecto.agregar_columna("Pendiente"), proyecto.agregar_columna("Hecho")
+    etiquetas = [
+        ["backend", "api"], ["Backend"], ["frontend"], [], ["api", "urgente"], ["BACKEND", "urgente"]
+    ]
+    for i, nombres in enumerate(etiquetas):
+        tarea = Tarea(f"T{i}")
+        (pendiente if i < 3 else hecho).agregar_tarea(tarea)
+        for nombre in nombres:
+            tarea.agregar_etiqueta(nombre)
+    return proyecto
+
+
+def _titulos(resultados):
+    return [tarea.titulo for _, tarea in resultados]
+
+
+def test_etiquetas_son_conjunto_ordenado():
+    tarea = Tarea("T")
+    for etiqueta in ["b", "a", "b", "c"]:
+        tarea.agregar_etiqueta(etiqueta)
+    tarea.eliminar_etiqueta("a")
+    tarea.eliminar_etiqueta("x")
+    assert tarea.etiquetas == ("b", "c") and tarea.tiene_etiqueta("c")
+    assert Tarea.from_dict(tarea.to_dict()).etiquetas == ("b", "c")
+    tarea.eliminar_etiqueta("b")
+    tarea.eliminar_etiqueta("c")
+    assert tarea._etiquetas is None and not tarea.tiene_etiqueta("c")
+
+
+def test_filtra_con_todas_o_alguna_etiqueta():
+    proyecto = _proyecto()
+    indice = IndiceEtiquetas(proyecto)
+    assert _titulos(indice.filtrar(proyecto, todas=["backend"])) == ["T0", "T1", "T5"]
+    assert _titulos(indice.filtrar(proyecto, todas=["api", "URGENTE"])) == ["T4"]
+    assert _titulos(indice.filtrar(proyecto, alguna=["frontend", "urgente"])) == ["T2", "T4", "T5"]
+    assert _titulos(indice.filtrar(proyecto, todas=["backend"], alguna=["api", "urgente"])) == [
+        "T0",
+        "T5",
+    ]
+    assert indice.filtrar(proyecto, todas=["backend", "nada"]) == []
+    assert indice.contar() == {"backend": 3, "api": 2, "urgente": 2, "frontend": 1}
+
+
+def test_indice_se_mantiene_con_las_operaciones():
+    proyecto = _proyecto()
+    pendiente, hecho = proyecto.columnas
+    indice = indice_etiquetas(proyecto)
+
+    t0, t1, t2 = pendiente.tareas
+    t0.eliminar_etiqueta("backend")
+    t2.agregar_etiqueta("api")
+    proyecto.mover_tarea(t2.tarea_id, hecho.columna_id)
+    hecho.eliminar_tarea(hecho.tareas[0].tarea_id)
+    nueva = Tarea("Nueva")
+    nueva.agregar_etiqueta("Docs")
+    pendiente.agregar_tarea(nueva)
+
+    assert indice_etiquetas(proyecto) is indice
+    assert indice.contar() == IndiceEtiquetas(proyecto).contar()
+    for todas in (["api"], ["backend"], ["docs"], ["frontend", "api"]):
+        assert indice.filtrar(proyecto, todas) == IndiceEtiquetas(proyecto).filtrar(proyecto, todas)
+    assert EstadisticasProyecto(proyecto).por_etiqueta == {
+        "api": 3, "backend": 2, "urgente": 2, "docs": 1, "frontend": 1
+    }
+
+
+def test_asignar_etiquetas_registra_operaciones():
+    proyecto = _proyecto()
+    indice = indice_etiquetas(proyecto)
+    t0 = proyecto.columnas[0].tareas[0]
+    with pytest.raises(AttributeError):
+        t0.etiquetas.append("perdida")
+
+    t0.etiquetas = ["urgente", "backend"]
+    assert t0.etiquetas == ("urgente", "backend")
+    assert indice_etiquetas(proyecto) is indice
+    assert _titulos(indice.filtrar(proyecto, todas=["urgente"])) == ["T0", "T4", "T5"]
+    assert proyecto.to_dict()["columnas"][0]["tareas"][0]["etiquetas"] == ["urgente", "backend"]
+    assert IndiceEtiquetas(proyecto).contar() == indice.contar()
@@ -0,0 +1,130 @@
+import json
+
+from comandos import ejecutar_comandos
+from importacion import ImportadorTareas, importar_tareas, leer_filas
+from models import Proyecto, Tarea
+from storage import StorageManager
+from storage_sqlite import SqliteStorageManager
+from utils import ExportadorDatos
+
+
+def test_importa_csv_exportado_con_validacion_y_duplicados(tmp_json_path):
+    origen = Proyecto("Origen")
+    pendiente, progreso = origen.agregar_columna("Pendiente"), origen.agregar_columna("En Progreso")
+    for i in range(5):
+        tarea = Tarea(f"Tarea {i}", "desc", "Alta" if i % 2 else "Baja", "ana")
+        tarea.etiquetas = ["api", "web"] if i == 0 else []
+        if i == 3:
+            tarea.estado = "En Progreso"
+        (progreso if i == 3 else pendiente).agregar_tarea(tarea)
+    ruta = tmp_json_path.parent / "tareas.csv"
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    csv = ExportadorDatos.exportar_a_csv(origen)
+    existente = origen.columnas[0].tareas[1].tarea_id
+    csv += '\n,"",,Media,Pendiente,,,\nnuevo,"Mal",,Maxima,Pendiente,,,\n'
+    ruta.write_text(csv, encoding="utf-8")
+
+    storage = StorageManager(tmp_json_path)
+    destino = Proyecto("Destino")
+    destino.agregar_columna("Pendiente")
+    destino.columnas[0].agregar_tarea(Tarea("Ya estaba", tarea_id=existente))
+    storage.guardar_proyecto(destino)
+    informes = []
+    informe = importar_tareas(
+        storage, destino, ruta, tamano_lote=1, progreso=lambda i: informes.append(i.importadas)
+    )
+
+    assert informe.completa
+    assert (informe.leidas, informe.importadas) == (7, 4)
+    assert (informe.duplicadas, informe.invalidas) == (1, 2)
+    assert informe.errores[0] == "linea 7: titulo vacio"
+    assert "prioridad no valida: Maxima" in informe.errores[1]
+    assert informe.columnas_creadas == []
+    # El archivo unico se reescribe entero: cada lote iguala lo ya guardado
+    assert informes == [1, 3, 4] and informe.guardados == 3
+
+    cargado = storage.cargar_proyecto(destino.proyecto_id)
+    titulos = [[t.titulo for t in c.tareas] for c in cargado.columnas]
+    # Sin columna "En Progreso" la tarea 3 va a la primera columna
+    assert titulos == [["Ya estaba", "Tarea 0", "Tarea 2", "Tarea 4", "Tarea 3"]]
+    primera = cargado.columnas[0].tareas[1]
+    assert (primera.prioridad, primera.asignado_a) == ("Baja", "ana")
+    assert primera.etiquetas == ("api", "web")
+
+
+def test_jsonl_en_sqlite_solo_inserta_las_tareas_nuevas(tmp_path, monkeypatch):
+    ruta = tmp_path / "tareas.jsonl"
+    with open(ruta, "w", encoding="utf-8") as f:
+        for i in range(250):
+            fila = {"titulo": f"T{i}", "columna": "Hecho" if i % 5 == 0 else "Pendiente"}
+            if i % 7 == 0:
+                fila["etiquetas"] = ["x", "y"]
+            if i == 11:
+                fila["fecha_vencimiento"] = "2024-05-01"
+            f.write(json.dumps(fila) + "\n")
+        f.write("{no es json\n")
+    assert [n for n, _, e in leer_filas(ruta) if e] == [251]
+
+    storage = SqliteStorageManager(tmp_path / "projects.db")
+    proyecto = Proyecto("Migrado")
+    proyecto.agregar_columna("Pendiente")
+    storage.guardar_proyecto(proyecto)
+
+    reescrituras = []
+    original = storage._escribir_proyecto
+    monkeypatch.setattr(
+        storage, "_escribir_proyecto", lambda d: reescrituras.append(1) or original(d)
+    )
+    informe = ImportadorTareas(storage, proyecto, tamano_lote=100).importar(leer_filas(ruta))
+
+    assert (informe.importadas, informe.invalidas, informe.guardados) == (250, 1, 3)
+    assert informe.columnas_creadas == ["Hecho"]
+    # Solo el guardado que creo la columna reescribe el proyecto
+    assert len(reescrituras) == 1
+
+    otra = SqliteStorageManager(tmp_path / "projects.db")
+    cargado = otra.cargar_proyecto(proyecto.proyecto_id)
+    assert cargado.version == proyecto.version == 4
+    pendiente, hecho = cargado.columnas
+    assert [t.titulo for t in hecho.tareas] == [f"T{i}" for i in range(0, 250, 5)]
+    assert [t.titulo for t in pendiente.tareas] == [f"T{i}" for i in range(250) if i % 5]
+    assert pendiente.tareas[5].etiquetas == ("x", "y")  # T7
+    assert pendiente.tareas[8].fecha_vencimiento == "2024-05-01"  # T11
+
+
+def test_comando_importar(tmp_json_path, capsys):
+    storage = StorageManager(tmp_json_path)
+    assert ejecutar_comandos(["proyecto", "crear", "Web", "--columnas", "Pendiente"], storage) == 0
+    ruta = tmp_json_path.parent / "tareas.csv"
+    ruta.write_text(
+        "id,title,estado,columna,etiquetas\n"
+        "a1,Login,Pendiente,,api|web\n"
+        "a2,Pago,Completada,Hecho,\n"
+        "a1,Login otra vez,Pendiente,,\n",
+        encoding="utf-8",
+    )
+
+    importar = ["tarea", "importar", "Web", str(ruta), "--sin-crear-columnas"]
+    assert ejecutar_comandos(importar, storage) == 0
+    salida = capsys.readouterr()
+    assert "linea 3: columna no encontrada" in salida.err
+    assert "1 importadas, 1 duplicadas, 1 invalidas" in salida.out
+
+    assert ejecutar_comandos(importar[:-1], storage) == 0
+    assert "1 importadas, 2 duplicadas" in capsys.readouterr().out
+    proyecto = storage.cargar_todos_proyectos()[0]
+    assert [[t.tarea_id for t in c.tareas] for c in proyecto.columnas] == [["a1"], ["a2"]]
+    assert proyecto.columnas[0].tareas[0].etiquetas == ("api", "web")
+    assert ejecutar_comandos(["tarea", "importar", "Web", "falta.csv"], storage) == 1
+
+    # Dentro de un lote se rechaza: el lote no guarda nada si un comando falla
+    lote = tmp_json_path.parent / "lote.txt"
+    lote.write_text(
+        "proyecto crear Otro --columnas Pendiente\n"
+        "tarea agregar Otro Pendiente Previa\n"
+        f"tarea importar Otro '{ruta}'\n",
+        encoding="utf-8",
+    )
+    assert ejecutar_comandos(["lote", str(lote)], storage) == 1
+    assert "linea 3: 'tarea importar' no se puede usar dentro de un lote" in capsys.readouterr().err
+    assert [r["nombre"] for r in storage.listar_resumenes_proyectos()] == ["Web"]
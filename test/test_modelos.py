@@ -0,0 +1,343 @@
+import json
+
+import pytest
+
+from models import Columna, Proyecto, Tarea, Usuario
+
+
+def test_columna_indice_por_id_conserva_orden():
+    columna = Columna("Pendiente")
+    tareas = [Tarea(f"T{i}") for i in range(5)]
+    for tarea in tareas:
+        assert columna.agregar_tarea(tarea)
+    # Otra instancia con el mismo ID no se duplica
+    assert not columna.agregar_tarea(Tarea("Copia", tarea_id=tareas[0].tarea_id))
+
+    assert columna.eliminar_tarea(tareas[2].tarea_id)
+    assert not columna.eliminar_tarea(tareas[2].tarea_id)
+    assert [t.titulo for t in columna.tareas] == ["T0", "T1", "T3", "T4"]
+    assert columna.obtener_tarea(tareas[3].tarea_id) is tareas[3]
+    assert not columna.contiene_tarea(tareas[2].tarea_id)
+    assert columna.contar_tareas() == 4
+
+
+def test_orden_por_rangos_en_la_columna():
+    proyecto = Proyecto("Orden")
+    pendiente = proyecto.agregar_columna("Pendiente")
+    hecho = proyecto.agregar_columna("Hecho")
+    a, b, c, d = (Tarea(t) for t in "ABCD")
+    pendiente.agregar_tarea(a)
+    pendiente.agregar_tarea(b)
+    pendiente.agregar_tarea(c, posicion=0)
+    pendiente.agregar_tarea(d, posicion=2)
+    assert [t.titulo for t in pendiente.tareas] == ["C", "A", "D", "B"]
+
+    rangos = {t.tarea_id: t.rango for t in pendiente.tareas}
+    assert pendiente.subir_tarea(b.tarea_id)
+    assert not pendiente.subir_tarea(c.tarea_id)
+    assert pendiente.bajar_tarea(c.tarea_id)
+    assert not pendiente.bajar_tarea(d.tarea_id)
+    assert pendiente.reordenar_tarea(a.tarea_id, 99)
+    assert [t.titulo for t in pendiente.tareas] == ["C", "B", "D", "A"]
+    assert pendiente.posicion_tarea(a.tarea_id) == 3
+    # Reordenar solo cambia el rango de la tarea movida
+    assert d.rango == rangos[d.tarea_id]
+
+    assert proyecto.mover_tarea(b.tarea_id, hecho.columna_id)
+    assert proyecto.mover_tarea(c.tarea_id, hecho.columna_id, posicion=0)
+    assert [t.titulo for t in hecho.tareas] == ["C", "B"]
+    assert [op["op"] for op in proyecto.operaciones_pendientes()][-3:] == [
+        "reordenar_tarea", "mover_tarea", "mover_tarea"
+    ]
+    assert Proyecto.from_dict(proyecto.to_dict()).to_dict() == proyecto.to_dict()
+
+
+def test_renumera_sin_hueco_y_numera_datos_sin_rangos():
+    columna = Columna("Pendiente")
+    primera, ultima = Tarea("Primera"), Tarea("Ultima")
+    columna.agregar_tarea(primera)
+    columna.agregar_tarea(ultima)
+    for i in range(40):
+        columna.agregar_tarea(Tarea(f"T{i}"), posicion=1)
+    titulos = [t.titulo for t in columna.tareas]
+    assert titulos[0] == "Primera" and titulos[1] == "T39" and titulos[-1] == "Ultima"
+    rangos = [t.rango for t in columna.tareas]
+    assert rangos == sorted(set(rangos))
+
+    datos = columna.to_dict()
+    antiguos = dict(datos, tareas=[
+        {k: v for k, v in t.items() if k != "rango"} for t in reversed(datos["tareas"])
+    ])
+    cargada = Columna.from_dict(antiguos)
+    assert [t.titulo for t in cargada.tareas] == titulos[::-1]
+    assert cargada.reordenar_tarea(cargada.tareas[0].tarea_id, 1)
+
+
+def test_proyecto_localiza_y_mueve_tareas_con_indice():
+    proyecto = Proyecto("Indices")
+    origen = proyecto.agregar_columna("Pendiente")
+    destino = proyecto.agregar_columna("Hecho")
+    tarea = Tarea("Mover")
+    origen.agregar_tarea(tarea)
+
+    assert proyecto.obtener_columna(destino.columna_id) is destino
+    assert proyecto.localizar_tarea(tarea.tarea_id) == (origen, tarea)
+    assert proyecto.mover_tarea(tarea.tarea_id, destino.columna_id)
+    assert not proyecto.mover_tarea(tarea.tarea_id, destino.columna_id)
+    assert proyecto.localizar_tarea(tarea.tarea_id) == (destino, tarea)
+    assert origen.tareas == () and destino.tareas == (tarea,)
+
+    destino.eliminar_tarea(tarea.tarea_id)
+    assert proyecto.localizar_tarea(tarea.tarea_id) is None
+
+    copia = Proyecto.from_dict(proyecto.to_dict())
+    nueva = Tarea("Tras cargar")
+    copia.columnas[0].agregar_tarea(nueva)
+    assert copia.localizar_tarea(nueva.tarea_id)[0] is copia.columnas[0]
+    assert copia.eliminar_columna(copia.columnas[0].columna_id)
+    assert copia.localizar_tarea(nueva.tarea_id) is None
+    assert copia.obtener_columna(origen.columna_id) is None
+
+    # Las colecciones expuestas son de solo lectura: no desfasan los indices
+    with pytest.raises(AttributeError):
+        copia.columnas.append(Columna("Suelta"))
+    with pytest.raises(AttributeError):
+        destino.tareas.append(Tarea("Suelta"))
+
+
+def test_modelos_compactos_conservan_interfaz():
+    datos = Tarea("Compacta", prioridad="Alta").to_dict()
+    a = Tarea.from_dict(json.loads(json.dumps(datos)))
+    b = Tarea.from_dict(json.loads(json.dumps(datos)))
+    for modelo in (a, Columna("C"), Proyecto("P"), Usuario("U", "u@dom.com")):
+        assert not hasattr(modelo, "__dict__")
+    assert a.prioridad is b.prioridad and a.estado is b.estado
+
+    assert a._etiquetas is None and a.to_dict()["etiquetas"] == []
+    a.agregar_etiqueta("backend")
+    assert a.etiquetas == ("backend",)
+    assert Tarea.from_dict(a.to_dict()).to_dict() == a.to_dict()
+
+
+def test_contadores_se_mantienen_con_cada_operacion(monkeypatch):
+    import config
+    from models import ContadoresProyecto
+
+    monkeypatch.setattr(config, "VERIFICAR_CONTADORES", True)
+    proyecto = Proyecto("Contadores")
+    pendiente = proyecto.agregar_columna("Pendiente")
+    hecho = proyecto.agregar_columna("Hecho")
+    tareas = [Tarea(f"T{i}", prioridad="Alta", asignado_a="ana" if i % 2 else None) for i in range(4)]
+    for tarea in tareas:
+        pendiente.agregar_tarea(tarea)
+    tareas[0].actualizar(estado="Completada", asignado_a="luis")
+    proyecto.mover_tarea(tareas[1].tarea_id, hecho.columna_id)
+    pendiente.eliminar_tarea(tareas[2].tarea_id)
+
+    contadores = proyecto.contadores
+    assert contadores.total == proyecto.contar_tareas() == 3
+    assert contadores.por_estado == {"Pendiente": 2, "Completada": 1}
+    assert contadores.por_asignado == {"ana": 2, "luis": 1}
+    assert contadores.por_columna == {pendiente.columna_id: 2, hecho.columna_id: 1}
+
+    proyecto.eliminar_columna(hecho.columna_id)
+    assert contadores.por_columna == {pendiente.columna_id: 2}
+    assert contadores.por_asignado == {"ana": 1, "luis": 1}
+
+    datos = proyecto.to_dict()
+    assert ContadoresProyecto.from_dict(datos["estadisticas"]) == contadores
+    assert ContadoresProyecto.desde_datos(datos["columnas"]) == contadores
+
+
+def test_asignar_campos_mantiene_los_contadores(monkeypatch):
+    import config
+    from utils import ProyectoAnalytics
+
+    monkeypatch.setattr(config, "VERIFICAR_CONTADORES", True)
+    proyecto = Proyecto("Directo")
+    tarea = Tarea("T1")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(tarea)
+    tarea.estado = "Completada"
+    tarea.asignado_a = "ana"
+    tarea.prioridad = "Alta"
+
+    estadisticas = ProyectoAnalytics.calcular_estadisticas(proyecto)
+    assert estadisticas.completadas == 1 and estadisticas.sin_asignar == 0
+    assert proyecto.to_dict()["estadisticas"]["por_asignado"] == {"ana": 1}
+    assert proyecto.contadores.por_prioridad == {"Alta": 1}
+
+
+def test_from_dict_usa_los_contadores_persistidos(monkeypatch):
+    import config
+    from models import ContadoresProyecto
+
+    proyecto = Proyecto("Persistidos")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("T1", prioridad="Alta"))
+    proyecto.agregar_columna("Hecho")
+    datos = proyecto.to_dict()
+
+    calculos = []
+    calcular = ContadoresProyecto.calcular.__func__
+    monkeypatch.setattr(
+        ContadoresProyecto,
+        "calcular",
+        classmethod(lambda cls, columnas: calculos.append(1) or calcular(cls, columnas)),
+    )
+    assert Proyecto.from_dict(datos).contadores == proyecto.contadores
+    assert calculos == []
+
+    # Sin contadores, o si no cuadran con las columnas, se calculan
+    sin_contadores = dict(datos)
+    del sin_contadores["estadisticas"]
+    desfasados = json.loads(json.dumps(datos))
+    desfasados["columnas"][0]["tareas"] = []
+    assert Proyecto.from_dict(sin_contadores).contadores == proyecto.contadores
+    assert Proyecto.from_dict(desfasados).contadores.total == 0
+    assert len(calculos) == 2
+
+    # Con VERIFICAR_CONTADORES se comprueban tambien los que cuadran
+    datos["estadisticas"]["por_prioridad"] = {"Baja": 1}
+    assert Proyecto.from_dict(datos).contadores.por_prioridad == {"Baja": 1}
+    monkeypatch.setattr(config, "VERIFICAR_CONTADORES", True)
+    with pytest.raises(AssertionError, match="Contadores desfasados"):
+        Proyecto.from_dict(datos)
+
+
+def test_verificar_contadores_detecta_cambios_fuera_de_los_metodos():
+    proyecto = Proyecto("Desfase")
+    tarea = Tarea("Directa")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(tarea)
+    proyecto.verificar_contadores()
+
+    tarea._estado = "Bloqueada"  # sin pasar por el atributo
+    with pytest.raises(AssertionError, match="Contadores desfasados"):
+        proyecto.verificar_contadores()
+
+
+def test_fechas_nativas_se_formatean_al_serializar():
+    from datetime import datetime
+
+    tarea = Tarea("Fechas")
+    assert type(tarea._fecha_creacion) is datetime
+    assert tarea.fecha_creacion == tarea.momento_creacion.isoformat()
+
+    datos = dict(tarea.to_dict(), fecha_creacion="2024-03-01")
+    cargada = Tarea.from_dict(datos)
+    # El texto cargado se conserva tal cual aunque no sea el formato canonico
+    assert cargada.to_dict() == datos
+    assert cargada.momento_creacion == datetime(2024, 3, 1)
+    assert cargada.fecha_modificacion == datos["fecha_modificacion"]
+    assert type(cargada._fecha_modificacion) is str
+    assert cargada.momento_modificacion.isoformat() == datos["fecha_modificacion"]
+    assert type(cargada._fecha_modificacion) is datetime
+
+    cargada.fecha_creacion = "no es fecha"
+    assert cargada.momento_creacion is None
+
+
+def test_from_dict_completa_id_y_fechas_ausentes():
+    import gc
+
+    proyecto = Proyecto.from_dict(
+        {"nombre": "Minimo", "columnas": [{"nombre": "Pendiente", "tareas": [{"titulo": "T"}]}]}
+    )
+    columna = proyecto.columnas[0]
+    tarea = columna.tareas[0]
+
+    assert gc.isenabled()
+    assert proyecto.proyecto_id and columna.columna_id and tarea.tarea_id
+    assert tarea.fecha_creacion == tarea.fecha_modificacion == columna.fecha_creacion
+    assert (tarea.estado, tarea.prioridad, tarea.etiquetas) == ("Pendiente", "Media", ())
+    assert proyecto.localizar_tarea(tarea.tarea_id) == (columna, tarea)
+    assert proyecto.contadores.total == 1
+    assert Proyecto.from_dict(proyecto.to_dict()).to_dict() == proyecto.to_dict()
+
+
+def test_a_dict_reutiliza_lo_que_no_cambio():
+    proyecto = Proyecto("Sucio")
+    pendiente = proyecto.agregar_columna("Pendiente")
+    hecho = proyecto.agregar_columna("Hecho")
+    a, b, c = Tarea("A"), Tarea("B"), Tarea("C")
+    pendiente.agregar_tarea(a)
+    pendiente.agregar_tarea(b)
+    hecho.agregar_tarea(c)
+    antes = proyecto._a_dict()
+
+    a.actualizar(titulo="A2")
+    despues = proyecto._a_dict()
+    assert despues is not antes
+    assert despues["columnas"][1] is antes["columnas"][1]
+    assert despues["columnas"][0]["tareas"][1] is antes["columnas"][0]["tareas"][1]
+    assert despues["columnas"][0]["tareas"][0]["titulo"] == "A2"
+    assert antes["columnas"][0]["tareas"][0]["titulo"] == "A"
+
+    proyecto.mover_tarea(c.tarea_id, pendiente.columna_id)
+    b.agregar_etiqueta("urgente")
+    hecho.renombrar("Terminado")
+    final = proyecto._a_dict()
+    assert [t["titulo"] for t in final["columnas"][0]["tareas"]] == ["A2", "B", "C"]
+    assert final["columnas"][0]["tareas"][1]["etiquetas"] == ["urgente"]
+    assert final["columnas"][1] == dict(antes["columnas"][1], nombre="Terminado", tareas=[])
+    assert Proyecto.from_dict(final).to_dict() == final
+
+
+def test_asignar_campos_descarta_la_cache_y_se_guarda(tmp_json_path):
+    from storage import StorageManager
+
+    proyecto = Proyecto("Asignado")
+    columna = proyecto.agregar_columna("Pendiente")
+    tarea = Tarea("a")
+    columna.agregar_tarea(tarea)
+    storage = StorageManager(tmp_json_path)
+    storage.guardar_proyecto(proyecto)
+    proyecto.to_dict()
+
+    tarea.titulo = "b"
+    tarea.fecha_vencimiento = "2024-05-01"
+    columna.nombre = "Por hacer"
+    assert proyecto.to_dict()["columnas"][0]["tareas"][0]["titulo"] == "b"
+    assert [op["op"] for op in proyecto.operaciones_pendientes()] == [
+        "actualizar_tarea", "actualizar_tarea", "renombrar_columna"
+    ]
+    tarea.titulo = "b"  # sin cambios no se registra nada
+    assert len(proyecto.operaciones_pendientes()) == 3
+
+    assert storage.guardar_proyecto(proyecto)
+    cargado = storage.cargar_proyecto(proyecto.proyecto_id)
+    assert cargado.columnas[0].nombre == "Por hacer"
+    guardada = cargado.columnas[0].tareas[0]
+    assert (guardada.titulo, guardada.fecha_vencimiento) == ("b", "2024-05-01")
+
+
+def test_to_dict_y_exportacion_son_copias(tmp_json_path):
+    from storage import StorageManager
+    from utils import ExportadorDatos
+
+    proyecto = Proyecto("Copias")
+    tarea = Tarea("orig")
+    tarea.agregar_etiqueta("x")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(tarea)
+    storage = StorageManager(tmp_json_path)
+    storage.guardar_proyecto(proyecto)
+
+    exportado = ExportadorDatos.exportar_a_json_simple(proyecto)
+    exportado["columnas"][0]["tareas"][0]["titulo"] = "MUTADO"
+    exportado["columnas"][0]["tareas"][0]["etiquetas"].append("y")
+    tarea.to_dict()["etiquetas"].append("z")
+    proyecto.columnas[0].to_dict()["tareas"].clear()
+    proyecto.agregar_columna("Hecho")
+    storage.guardar_proyecto(proyecto)
+
+    guardada = storage.cargar_proyecto(proyecto.proyecto_id).columnas[0].tareas[0]
+    assert (guardada.titulo, guardada.etiquetas) == ("orig", ("x",))
+    assert (tarea.titulo, tarea.etiquetas) == ("orig", ("x",))
+
+
+def test_epoch_comun_a_los_indices_de_fechas():
+    from datetime import datetime
+
+    from models import SIN_FECHA, epoch
+
+    assert epoch("1970-01-02") == epoch(datetime(1970, 1, 2)) == 86400
+    assert epoch("2024-05-01T10:00:00+02:00") == epoch("2024-05-01T10:00:00")
+    assert epoch("no es fecha") == epoch(None) == SIN_FECHA
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from models import Proyecto, Tarea
+from serializacion import (
+    ErrorFormatoBinario,
+    SerializadorBinario,
+    SerializadorJSON,
+    detectar_serializador,
+)
+from storage import StorageManager
+
+
+def codificar(serializador, datos):
+    salida = io.BytesIO()
+    serializador.escribir(datos, salida)
+    return salida.getvalue()
+
+
+def test_binario_ida_y_vuelta_conserva_valores_exactos():
+    datos = {
+        "proyectos": [
+            {
+                "proyecto_id": "0b7f6c1e-8a43-4f0e-9d6a-2f7c5b1e4a90",
+                "mayusculas": "0B7F6C1E-8A43-4F0E-9D6A-2F7C5B1E4A90",
+                "fecha": "2025-11-09T17:22:49.151718",
+                "fecha_sin_micros": "2025-11-09T17:22:49",
+                "fecha_micros_cero": "2025-11-09T17:22:49.000000",
+                "antes_de_1970": "1969-07-20T20:17:40",
+                "texto": "Acción «ñ» 🚀",
+                "enteros": [0, -1, 127, 128, -(2**70), 2**70],
+                "real": -3.25,
+                "logicos": [True, False, None],
+                "vacios": [[], {}, ""],
+            }
+        ],
+        "usuarios": [],
+    }
+    contenido = codificar(SerializadorBinario(), datos)
+    assert SerializadorBinario().leer(contenido) == datos
+
+
+def test_binario_es_mas_compacto_que_json():
+    proyecto = Proyecto("Compacto")
+    columna = proyecto.agregar_columna("Pendiente")
+    for i in range(50):
+        columna.agregar_tarea(Tarea(f"Tarea {i}", asignado_a="Ana"))
+    datos = {"proyectos": [proyecto.to_dict()], "usuarios": []}
+    binario = codificar(SerializadorBinario(), datos)
+    texto = codificar(SerializadorJSON(), datos)
+    assert len(binario) * 3 < len(texto)
+
+
+def test_binario_truncado_se_rechaza():
+    contenido = codificar(SerializadorBinario(), {"proyectos": [{"nombre": "x" * 40}]})
+    with pytest.raises(ErrorFormatoBinario):
+        SerializadorBinario().leer(contenido[:-5])
+
+
+def test_deteccion_automatica_del_formato_al_cargar(tmp_json_path):
+    binario = StorageManager(tmp_json_path, formato="binario")
+    binario.guardar_proyecto(Proyecto("En binario"))
+    assert tmp_json_path.read_bytes().startswith(SerializadorBinario.MAGIA)
+    assert isinstance(detectar_serializador(tmp_json_path.read_bytes()), SerializadorBinario)
+    lector = StorageManager(tmp_json_path)
+    assert [p.nombre for p in lector.iterar_proyectos()] == ["En binario"]
+    lector.guardar_proyecto(Proyecto("Ahora JSON"))
+    assert tmp_json_path.read_bytes().lstrip().startswith(b"{")
+    assert len(binario.cargar_todos_proyectos()) == 2
@@ -0,0 +1,498 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from models import Proyecto, Tarea, Usuario
+from storage import (
+    DirectorioStorageManager,
+    AplicadorOperaciones,
+    StorageManager,
+    fcntl,
+    iterar_arreglo_json,
+    ruta_respaldo,
+)
+from storage_sqlite import SqliteStorageManager, migrar_json_a_sqlite
+
+
+def test_cache_lecturas_no_releen_archivo(tmp_json_path, monkeypatch):
+    sm = StorageManager(tmp_json_path, cache=True)
+    sm.guardar_usuario(Usuario("Cache", "cache@dom.com"))
+    lecturas = []
+    original = sm._leer_archivo
+    monkeypatch.setattr(sm, "_leer_archivo", lambda: lecturas.append(1) or original())
+    for _ in range(5):
+        assert len(sm.cargar_todos_usuarios()) == 1
+    assert lecturas == []
+
+
+def test_cache_invalida_si_archivo_cambia_en_disco(tmp_json_path):
+    sm = StorageManager(tmp_json_path, cache=True)
+    sm.guardar_usuario(Usuario("Uno", "uno@dom.com"))
+    otro = StorageManager(tmp_json_path)
+    otro.guardar_usuario(Usuario("Dos", "dos@dom.com"))
+    nombres = [u.nombre for u in sm.cargar_todos_usuarios()]
+    assert nombres == ["Uno", "Dos"]
+
+
+def test_cache_invalida_si_archivo_se_reemplaza_con_mismo_tamano_y_mtime(tmp_json_path):
+    sm = StorageManager(tmp_json_path, cache=True)
+    sm.guardar_usuario(Usuario("Uno", "uno@dom.com"))
+    assert [u.nombre for u in sm.cargar_todos_usuarios()] == ["Uno"]
+    estado = os.stat(tmp_json_path)
+    # Reemplazo atomico por un documento del mismo tamano y mismo mtime
+    contenido = open(tmp_json_path, encoding="utf-8").read().replace("Uno", "Otr")
+    temporal = str(tmp_json_path) + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.utime(temporal, ns=(estado.st_atime_ns, estado.st_mtime_ns))
+    os.replace(temporal, tmp_json_path)
+    assert os.stat(tmp_json_path).st_size == estado.st_size
+    assert [u.nombre for u in sm.cargar_todos_usuarios()] == ["Otr"]
+
+
+def test_cache_flush_diferido_hasta_sincronizar(tmp_json_path):
+    sm = StorageManager(tmp_json_path, cache=True, intervalo_flush=None)
+    sm.guardar_proyecto(Proyecto("Diferido"))
+    assert not tmp_json_path.exists()
+    assert len(sm.cargar_todos_proyectos()) == 1
+    assert sm.sincronizar()
+    datos = json.loads(tmp_json_path.read_text(encoding="utf-8"))
+    assert datos["proyectos"][0]["nombre"] == "Diferido"
+
+
+def test_cache_objetos_no_comparten_listas_con_documento(tmp_json_path):
+    sm = StorageManager(tmp_json_path, cache=True)
+    proyecto = Proyecto("Aislado")
+    columna = proyecto.agregar_columna("Pendiente")
+    columna.agregar_tarea(Tarea("T"))
+    sm.guardar_proyecto(proyecto)
+    cargado = sm.cargar_proyecto(proyecto.proyecto_id)
+    cargado.columnas[0].tareas[0].agregar_etiqueta("sin-guardar")
+    assert sm.cargar_datos()["proyectos"][0]["columnas"][0]["tareas"][0]["etiquetas"] == []
+
+
+def test_directorio_guardar_proyecto_solo_escribe_su_archivo(tmp_path):
+    sm = DirectorioStorageManager(tmp_path / "entidades")
+    a, b = Proyecto("A"), Proyecto("B")
+    sm.guardar_proyecto(a)
+    sm.guardar_proyecto(b)
+    ruta_a = sm.directorio_proyectos / f"{a.proyecto_id}.json"
+    ruta_b = sm.directorio_proyectos / f"{b.proyecto_id}.json"
+    mtime_b = ruta_b.stat().st_mtime_ns
+    a.agregar_columna("Nueva")
+    sm.guardar_proyecto(a)
+    assert ruta_b.stat().st_mtime_ns == mtime_b
+    assert len(sm.cargar_proyecto(a.proyecto_id).columnas) == 1
+
+
+def test_directorio_misma_interfaz_que_storage_manager(tmp_path, tmp_json_path):
+    origen = StorageManager(tmp_json_path)
+    origen.guardar_usuario(Usuario("U1", "u1@dom.com"))
+    origen.guardar_proyecto(Proyecto("P1"))
+    sm = DirectorioStorageManager(tmp_path / "entidades")
+    assert sm.migrar_desde(origen)
+    assert [u.nombre for u in sm.cargar_todos_usuarios()] == ["U1"]
+    proyecto = sm.cargar_todos_proyectos()[0]
+    assert sm.eliminar_proyecto(proyecto.proyecto_id)
+    assert sm.cargar_datos()["proyectos"] == []
+
+
+def test_directorio_eliminar_actualiza_resumenes_con_el_bloqueo(tmp_path, monkeypatch):
+    sm = DirectorioStorageManager(tmp_path / "entidades")
+    a, b = Proyecto("A"), Proyecto("B")
+    sm.guardar_proyecto(a)
+    sm.guardar_proyecto(b)
+
+    bloqueado = []
+    original = sm._escribir_resumenes
+
+    def escribir(resumenes):
+        # Otro proceso no puede tomar el bloqueo mientras se reescribe el indice
+        with open(sm.archivo_bloqueo, "a") as f:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        bloqueado.append(1)
+        original(resumenes)
+
+    monkeypatch.setattr(sm, "_escribir_resumenes", escribir)
+    assert sm.eliminar_proyecto(a.proyecto_id)
+    assert bloqueado == [1]
+    assert [r["nombre"] for r in sm.listar_resumenes_proyectos()] == ["B"]
+    assert not sm.eliminar_proyecto(a.proyecto_id)
+
+
+def test_directorio_rechaza_ids_con_rutas(tmp_path):
+    sm = DirectorioStorageManager(tmp_path / "entidades")
+    with pytest.raises(ValueError):
+        sm.cargar_proyecto("../projects")
+
+
+def test_sqlite_ida_y_vuelta_de_proyecto_completo(tmp_path):
+    sm = SqliteStorageManager(tmp_path / "projects.db")
+    proyecto = Proyecto("SQL", "desc")
+    proyecto.agregar_miembro("u1")
+    pendiente = proyecto.agregar_columna("Pendiente")
+    proyecto.agregar_columna("Hecho")
+    tarea = Tarea("Indexada", prioridad="Alta", asignado_a="u1")
+    tarea.agregar_etiqueta("db")
+    pendiente.agregar_tarea(tarea)
+    assert sm.guardar_proyecto(proyecto)
+    cargado = sm.cargar_proyecto(proyecto.proyecto_id)
+    assert cargado.to_dict() == proyecto.to_dict()
+    sm.cerrar()
+
+
+def test_sqlite_eliminar_proyecto_borra_en_cascada(tmp_path):
+    sm = SqliteStorageManager(tmp_path / "projects.db")
+    proyecto = Proyecto("Cascada")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("T"))
+    sm.guardar_proyecto(proyecto)
+    assert sm.eliminar_proyecto(proyecto.proyecto_id)
+    assert sm.cargar_proyecto(proyecto.proyecto_id) is None
+    assert sm._conexion.execute("SELECT COUNT(*) FROM tareas").fetchone()[0] == 0
+    sm.cerrar()
+
+
+def test_sqlite_migracion_desde_json(tmp_path, tmp_json_path):
+    origen = StorageManager(tmp_json_path)
+    origen.guardar_usuario(Usuario("U1", "u1@dom.com"))
+    proyecto = Proyecto("Migrado")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("T1"))
+    origen.guardar_proyecto(proyecto)
+    destino = tmp_path / "projects.db"
+    assert migrar_json_a_sqlite(tmp_json_path, destino)
+    sm = SqliteStorageManager(destino)
+    assert sm.cargar_datos() == origen.cargar_datos()
+    sm.cerrar()
+
+
+def test_escritura_atomica_conserva_version_anterior_si_falla(tmp_json_path):
+    sm = StorageManager(tmp_json_path)
+    sm.guardar_usuario(Usuario("Estable", "estable@dom.com"))
+    with pytest.raises(TypeError):
+        sm.guardar_datos({"proyectos": [object()], "usuarios": []})
+    assert [u.nombre for u in sm.cargar_todos_usuarios()] == ["Estable"]
+    assert list(tmp_json_path.parent.glob("*.tmp")) == []
+
+
+def test_respaldo_recupera_datos_si_archivo_corrupto(tmp_json_path, capsys):
+    sm = StorageManager(tmp_json_path, respaldos=2)
+    sm.guardar_usuario(Usuario("Uno", "uno@dom.com"))
+    sm.guardar_usuario(Usuario("Dos", "dos@dom.com"))
+    assert ruta_respaldo(tmp_json_path, 1).exists()
+    tmp_json_path.write_text('{"proyectos": [', encoding="utf-8")
+    assert [u.nombre for u in sm.cargar_todos_usuarios()] == ["Uno"]
+    assert "recuperados" in capsys.readouterr().out
+
+
+def test_lote_agrupa_guardados_en_un_solo_fsync(tmp_json_path, monkeypatch):
+    sm = StorageManager(tmp_json_path)
+    llamadas = []
+    fsync_original = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: llamadas.append(fd) or fsync_original(fd))
+    with sm.lote():
+        for i in range(10):
+            sm.guardar_proyecto(Proyecto(f"P{i}"))
+        assert not tmp_json_path.exists()
+    escrituras = len(llamadas)
+    assert len(StorageManager(tmp_json_path).cargar_todos_proyectos()) == 10
+    sm.guardar_proyecto(Proyecto("Suelto"))
+    assert len(llamadas) == 2 * escrituras
+
+
+def test_resumenes_sin_decodificar_tareas(tmp_json_path, monkeypatch):
+    sm = StorageManager(tmp_json_path)
+    proyecto = Proyecto("Resumido")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("T1"))
+    proyecto.agregar_columna("Hecho").agregar_tarea(Tarea("T2"))
+    sm.guardar_proyecto(proyecto)
+    monkeypatch.setattr(sm, "cargar_datos", lambda: pytest.fail("lectura completa"))
+    resumen = sm.listar_resumenes_proyectos()[0]
+    assert resumen["nombre"] == "Resumido"
+    assert (resumen["total_columnas"], resumen["total_tareas"]) == (2, 2)
+    assert resumen["por_estado"] == {"Pendiente": 2}
+
+
+def test_resumenes_se_regeneran_si_el_archivo_cambia(tmp_json_path):
+    sm = StorageManager(tmp_json_path)
+    sm.guardar_proyecto(Proyecto("Original"))
+    datos = json.loads(tmp_json_path.read_text(encoding="utf-8"))
+    datos["proyectos"][0]["nombre"] = "Editado a mano"
+    tmp_json_path.write_text(json.dumps(datos), encoding="utf-8")
+    assert sm.listar_resumenes_proyectos()[0]["nombre"] == "Editado a mano"
+
+
+@pytest.mark.parametrize("backend", ["directorio", "sqlite"])
+def test_resumenes_en_otros_backends(tmp_path, backend):
+    if backend == "directorio":
+        sm = DirectorioStorageManager(tmp_path / "entidades")
+    else:
+        sm = SqliteStorageManager(tmp_path / "projects.db")
+    proyecto = Proyecto("Resumen")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("T1"))
+    sm.guardar_proyecto(proyecto)
+    otro = Proyecto("Borrado")
+    sm.guardar_proyecto(otro)
+    sm.eliminar_proyecto(otro.proyecto_id)
+    resumenes = sm.listar_resumenes_proyectos()
+    assert [(r["nombre"], r["total_columnas"], r["total_tareas"]) for r in resumenes] == [
+        ("Resumen", 1, 1)
+    ]
+    assert resumenes[0]["por_estado"] == {"Pendiente": 1}
+    assert resumenes[0]["por_prioridad"] == {"Media": 1}
+    if backend == "sqlite":
+        # Bases anteriores sin contadores: se cuentan con consultas agrupadas
+        sm._conexion.execute("UPDATE proyectos SET estadisticas = NULL")
+        assert sm.listar_resumenes_proyectos() == resumenes
+        assert sm.cargar_proyecto(proyecto.proyecto_id).contadores == proyecto.contadores
+
+
+def test_lector_incremental_equivale_a_json_load(tmp_json_path):
+    sm = StorageManager(tmp_json_path)
+    for i in range(5):
+        proyecto = Proyecto(f"Proyecto {i} «ñ»", 'con "comillas" y \\ barras')
+        proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea(f"T{i}"))
+        sm.guardar_proyecto(proyecto)
+    sm.guardar_usuario(Usuario("Último", "u@dom.com"))
+    completo = json.loads(tmp_json_path.read_text(encoding="utf-8"))
+    for tamano in (1, 7, 1 << 16):
+        assert list(iterar_arreglo_json(tmp_json_path, "proyectos", tamano)) == completo["proyectos"]
+        assert list(iterar_arreglo_json(tmp_json_path, "usuarios", tamano)) == completo["usuarios"]
+
+
+def test_iterar_proyectos_es_generador_y_cargar_proyecto_se_detiene(tmp_json_path):
+    sm = StorageManager(tmp_json_path)
+    primero = Proyecto("Primero")
+    sm.guardar_proyecto(primero)
+    sm.guardar_proyecto(Proyecto("Segundo"))
+    generador = sm.iterar_proyectos()
+    assert next(generador).nombre == "Primero"
+    # Un final truncado no impide encontrar un proyecto anterior
+    contenido = tmp_json_path.read_text(encoding="utf-8")
+    tmp_json_path.write_text(contenido[: contenido.index("Segundo")], encoding="utf-8")
+    assert sm.cargar_proyecto(primero.proyecto_id).nombre == "Primero"
+
+
+def test_iterar_con_archivo_corrupto_recurre_a_respaldo(tmp_json_path):
+    sm = StorageManager(tmp_json_path, respaldos=1)
+    sm.guardar_usuario(Usuario("Uno", "uno@dom.com"))
+    sm.guardar_usuario(Usuario("Dos", "dos@dom.com"))
+    tmp_json_path.write_text("{invalid json}", encoding="utf-8")
+    assert [u.nombre for u in sm.iterar_usuarios()] == ["Uno"]
+
+
+def _insertar_tareas_en_paralelo(ruta, proyecto_id, proceso, cantidad):
+    sm = StorageManager(ruta)
+    for i in range(cantidad):
+        proyecto = sm.cargar_proyecto(proyecto_id)
+        proyecto.columnas[0].agregar_tarea(Tarea(f"P{proceso}-T{i}"))
+        assert sm.guardar_proyecto(proyecto)
+
+
+@pytest.mark.skipif(fcntl is None, reason="requiere fcntl")
+def test_estres_procesos_concurrentes_no_pierden_tareas(tmp_json_path):
+    procesos, por_proceso = 4, 15
+    proyecto = Proyecto("Concurrente")
+    proyecto.agregar_columna("Pendiente")
+    StorageManager(tmp_json_path).guardar_proyecto(proyecto)
+
+    contexto = multiprocessing.get_context("fork")
+    trabajadores = [
+        contexto.Process(
+            target=_insertar_tareas_en_paralelo,
+            args=(tmp_json_path, proyecto.proyecto_id, n, por_proceso),
+        )
+        for n in range(procesos)
+    ]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join(timeout=60)
+        assert t.exitcode == 0
+
+    final = StorageManager(tmp_json_path).cargar_proyecto(proyecto.proyecto_id)
+    titulos = {t.titulo for t in final.obtener_todas_las_tareas()}
+    assert len(titulos) == procesos * por_proceso
+    assert final.version == 1 + procesos * por_proceso
+
+
+def test_guardado_concurrente_fusiona_en_lugar_de_sobrescribir(tmp_json_path):
+    sm = StorageManager(tmp_json_path)
+    proyecto = Proyecto("Fusion")
+    columna = proyecto.agregar_columna("Pendiente")
+    compartida, borrada = Tarea("Compartida"), Tarea("Borrada")
+    columna.agregar_tarea(compartida)
+    columna.agregar_tarea(borrada)
+    sm.guardar_proyecto(proyecto)
+
+    a = sm.cargar_proyecto(proyecto.proyecto_id)
+    b = sm.cargar_proyecto(proyecto.proyecto_id)
+    a.columnas[0].agregar_tarea(Tarea("Nueva de A"))
+    a.columnas[0].eliminar_tarea(borrada.tarea_id)
+    sm.guardar_proyecto(a)
+    b.columnas[0].obtener_tarea(compartida.tarea_id).actualizar(titulo="Editada por B")
+    b.columnas[0].agregar_tarea(Tarea("Nueva de B"))
+    sm.guardar_proyecto(b)
+
+    titulos = sorted(t.titulo for t in b.obtener_todas_las_tareas())
+    assert titulos == ["Editada por B", "Nueva de A", "Nueva de B"]
+    guardado = sm.cargar_proyecto(proyecto.proyecto_id)
+    assert sorted(t.titulo for t in guardado.obtener_todas_las_tareas()) == titulos
+    assert guardado.version == b.version == 3
+
+
+@pytest.mark.parametrize("backend", ["directorio", "sqlite"])
+def test_guardado_concurrente_no_pierde_altas_en_otros_backends(tmp_path, backend):
+    def sesion():
+        if backend == "directorio":
+            return DirectorioStorageManager(tmp_path / "entidades")
+        return SqliteStorageManager(tmp_path / "projects.db")
+
+    proyecto = Proyecto("Concurrente")
+    proyecto.agregar_columna("Pendiente").agregar_tarea(Tarea("uno"))
+    assert sesion().guardar_proyecto(proyecto)
+
+    a = sesion().cargar_proyecto(proyecto.proyecto_id)
+    b = sesion().cargar_proyecto(proyecto.proyecto_id)
+    a.columnas[0].agregar_tarea(Tarea("tres"))
+    assert sesion().guardar_proyecto(a)
+    b.columnas[0].agregar_tarea(Tarea("cuatro"))
+    assert sesion().guardar_proyecto(b)
+
+    # Las dos altas tienen el mismo rango: su orden relativo no importa
+    titulos = [t.titulo for t in b.columnas[0].tareas]
+    assert sorted(titulos) == ["cuatro", "tres", "uno"]
+    guardado = sesion().cargar_proyecto(proyecto.proyecto_id)
+    assert [t.titulo for t in guardado.columnas[0].tareas] == titulos
+    assert guardado.version == b.version == 3
+    assert sesion().listar_resumenes_proyectos()[0]["total_tareas"] == 3
+
+
+def _proyecto_con_dos_columnas(sm):
+    proyecto = Proyecto("Diario")
+    origen = proyecto.agregar_columna("Pendiente")
+    proyecto.agregar_columna("Hecho")
+    origen.agregar_tarea(Tarea("Mover"))
+    sm.guardar_proyecto(proyecto)
+    return proyecto
+
+
+@pytest.mark.parametrize("backend", ["diario", "sqlite"])
+def test_campos_asignados_se_guardan_en_los_guardados_incrementales(tmp_path, backend):
+    if backend == "diario":
+        crear = lambda: StorageManager(tmp_path / "projects.json", diario=True)
+    else:
+        crear = lambda: SqliteStorageManager(tmp_path / "projects.db")
+    sm = crear()
+    proyecto = _proyecto_con_dos_columnas(sm)
+    # Cada cambio del proyecto o de una tarea es una operacion: el guardado
+    # no puede limitarse a insertar las tareas anexadas
+    proyecto.nombre = "Renombrado"
+    proyecto.descripcion = "nueva"
+    proyecto.columnas[0].agregar_tarea(Tarea("Anexada"))
+    assert sm.guardar_proyecto(proyecto)
+    cargado = crear().cargar_proyecto(proyecto.proyecto_id)
+    assert (cargado.nombre, cargado.descripcion) == ("Renombrado", "nueva")
+
+    proyecto.columnas[0].tareas[0].estado = "Completada"
+    proyecto.columnas[0].agregar_tarea(Tarea("Otra"))
+    assert sm.guardar_proyecto(proyecto)
+    cargado = crear().cargar_proyecto(proyecto.proyecto_id)
+    assert [t.estado for t in cargado.columnas[0].tareas] == ["Completada", "Pendiente", "Pendiente"]
+    assert cargado.contadores == proyecto.contadores
+    cargado.verificar_contadores()
+
+
+def test_diario_reaplica_reordenaciones(tmp_json_path):
+    sm = StorageManager(tmp_json_path, diario=True)
+    proyecto = _proyecto_con_dos_columnas(sm)
+    origen, destino = proyecto.columnas
+    for i in range(40):
+        origen.agregar_tarea(Tarea(f"T{i}"), posicion=1)
+    primera = origen.tareas[0]
+    origen.reordenar_tarea(primera.tarea_id, 20)
+    proyecto.mover_tarea(origen.tareas[5].tarea_id, destino.columna_id, posicion=0)
+    operaciones = [op["op"] for op in proyecto.operaciones_pendientes()]
+    assert "renumerar_columna" in operaciones and "reordenar_tarea" in operaciones
+    assert sm.guardar_proyecto(proyecto)
+
+    cargado = StorageManager(tmp_json_path, diario=True).cargar_proyecto(proyecto.proyecto_id)
+    assert cargado.to_dict() == proyecto.to_dict()
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_diario_anade_operaciones_sin_reescribir_archivo(tmp_json_path, cache):
+    sm = StorageManager(tmp_json_path, cache=cache, diario=True)
+    proyecto = _proyecto_con_dos_columnas(sm)
+    punto_control = tmp_json_path.read_bytes()
+
+    tarea = proyecto.columnas[0].tareas[0]
+    tarea.actualizar(estado="Completada")
+    tarea.agregar_etiqueta("urgente")
+    proyecto.mover_tarea(tarea.tarea_id, proyecto.columnas[1].columna_id)
+    proyecto.columnas[1].renombrar("Terminado")
+    assert [op["op"] for op in proyecto.operaciones_pendientes()] == [
+        "actualizar_tarea", "agregar_etiqueta", "mover_tarea", "renombrar_columna"
+    ]
+    assert sm.guardar_proyecto(proyecto)
+    assert proyecto.operaciones_pendientes() == []
+
+    assert tmp_json_path.read_bytes() == punto_control
+    registros = [json.loads(l) for l in sm.archivo_diario.read_text().splitlines()]
+    assert [r["op"] for r in registros][-2:] == ["mover_tarea", "renombrar_columna"]
+    assert registros[2]["desde"] == proyecto.columnas[0].columna_id
+
+    cargado = StorageManager(tmp_json_path, diario=True).cargar_proyecto(proyecto.proyecto_id)
+    assert cargado.to_dict() == proyecto.to_dict()
+    # El diario mantiene los contadores persistidos del punto de control
+    estadisticas = StorageManager(tmp_json_path, diario=True).cargar_datos()["proyectos"][0]
+    assert estadisticas["estadisticas"] == proyecto.contadores.to_dict()
+    assert cargado.columnas[1].nombre == "Terminado"
+    assert cargado.columnas[1].tareas[0].etiquetas == ("urgente",)
+    assert cargado.version == 2
+
+
+def test_diario_compacta_al_superar_umbral(tmp_json_path):
+    sm = StorageManager(tmp_json_path, diario=True, umbral_compactacion=600)
+    proyecto = _proyecto_con_dos_columnas(sm)
+    for i in range(5):
+        proyecto.columnas[0].agregar_tarea(Tarea(f"T{i}"))
+        sm.guardar_proyecto(proyecto)
+
+    assert sm.archivo_diario.stat().st_size < 600
+    # El punto de control mas lo que quede en el diario reproducen el estado
+    sin_diario = StorageManager(tmp_json_path).cargar_proyecto(proyecto.proyecto_id)
+    assert 1 < sin_diario.contar_tareas() <= 6
+    con_diario = StorageManager(tmp_json_path, diario=True).cargar_proyecto(proyecto.proyecto_id)
+    assert con_diario.contar_tareas() == 6
+
+    assert sm.compactar()
+    assert sm.archivo_diario.stat().st_size == 0
+    assert StorageManager(tmp_json_path).cargar_proyecto(proyecto.proyecto_id).contar_tareas() == 6
+
+
+def test_diario_tolera_linea_incompleta_y_reaplicacion(tmp_json_path, capsys):
+    sm = StorageManager(tmp_json_path, diario=True)
+    proyecto = _proyecto_con_dos_columnas(sm)
+    proyecto.columnas[0].tareas[0].actualizar(titulo="Editada")
+    sm.guardar_proyecto(proyecto)
+    with open(sm.archivo_diario, "ab") as f:
+        f.write(b'{"op": "agregar_ta')
+
+    datos = sm.cargar_datos()
+    assert "Error al cargar el diario" in capsys.readouterr().out
+    assert datos["proyectos"][0]["columnas"][0]["tareas"][0]["titulo"] == "Editada"
+
+    # La linea rota se recorta al anadir y los anexos posteriores se leen
+    proyecto.columnas[0].agregar_tarea(Tarea("Despues del corte"))
+    sm.guardar_proyecto(proyecto)
+    assert sm.cargar_proyecto(proyecto.proyecto_id).contar_tareas() == 2
+
+    # Reaplicar el diario sobre un estado que ya lo contiene no lo altera
+    datos = sm.cargar_datos()
+    aplicador = AplicadorOperaciones(json.loads(json.dumps(datos)))
+    for linea in sm.archivo_diario.read_text().splitlines():
+        aplicador.aplicar(json.loads(linea))
+    assert aplicador.datos == datos
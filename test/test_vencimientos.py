@@ -0,0 +1,73 @@
+from datetime import date
+
+from models import Proyecto, Tarea
+from vencimientos import IndiceVencimientos, indice_vencimientos, siguientes_vencimientos
+
+HOY = date(2024, 3, 10)
+
+
+def _proyecto(nombre, fechas):
+    proyecto = Proyecto(nombre)
+    columna = proyecto.agregar_columna("Pendiente")
+    for i, fecha in enumerate(fechas):
+        tarea = Tarea(f"{nombre}{i}")
+        tarea.fecha_vencimiento = fecha
+        columna.agregar_tarea(tarea)
+    return proyecto
+
+
+def test_consultas_por_vencimiento():
+    proyecto = _proyecto(
+        "T", ["2024-03-12", "2024-03-01T09:00:00", None, "2024-03-10T23:00:00", "xx", "2024-04-01"]
+    )
+    indice = IndiceVencimientos(proyecto)
+
+    assert len(indice) == 4
+    assert [t.titulo for t in indice.retrasadas(HOY)] == ["T1"]
+    assert [t.titulo for t in indice.proximas(2, HOY)] == ["T3", "T0"]
+    assert [t.titulo for t in indice.siguientes(2, HOY)] == ["T3", "T0"]
+    assert [t.titulo for t in indice.siguientes(10, HOY)] == ["T3", "T0", "T5"]
+
+
+def test_indice_se_mantiene_con_las_operaciones():
+    proyecto = _proyecto("T", ["2024-03-01", "2024-03-05", "2024-03-20"])
+    columna = proyecto.columnas[0]
+    t0, t1, t2 = columna.tareas
+    indice = indice_vencimientos(proyecto)
+
+    t0.actualizar(estado="Completada")
+    t2.actualizar(fecha_vencimiento="2024-02-01")
+    nueva = Tarea("Nueva")
+    nueva.fecha_vencimiento = "2024-03-02"
+    columna.agregar_tarea(nueva)
+    columna.eliminar_tarea(t1.tarea_id)
+
+    assert indice_vencimientos(proyecto) is indice
+    assert [t.titulo for t in indice.retrasadas(HOY)] == ["T2", "Nueva"]
+    assert [t.titulo for t in IndiceVencimientos(proyecto).retrasadas(HOY)] == ["T2", "Nueva"]
+
+
+def test_empates_siguen_el_orden_de_insercion():
+    proyecto = _proyecto("T", ["2024-03-01", "2024-03-01"])
+    hecho = proyecto.agregar_columna("Hecho")
+    t0, t1 = proyecto.columnas[0].tareas
+    indice = indice_vencimientos(proyecto)
+    assert indice.retrasadas(HOY) == [t0, t1]
+
+    # Mover no cambia el desempate y lo que se indexa despues va detras
+    proyecto.mover_tarea(t0.tarea_id, hecho.columna_id)
+    nueva = Tarea("Nueva")
+    nueva.fecha_vencimiento = "2024-03-01"
+    proyecto.columnas[0].agregar_tarea(nueva, 0)
+    assert [c.tareas for c in proyecto.columnas] == [(nueva, t1), (t0,)]
+    assert indice.retrasadas(HOY) == [t0, t1, nueva]
+    # Reconstruido, el orden vuelve a ser el del tablero
+    assert IndiceVencimientos(proyecto).retrasadas(HOY) == [nueva, t1, t0]
+
+
+def test_siguientes_vencimientos_entre_proyectos():
+    a = _proyecto("A", ["2024-03-15", "2024-03-11"])
+    b = _proyecto("B", ["2024-03-12", "2024-03-01"])
+
+    resultado = siguientes_vencimientos([a, b], 3, HOY)
+    assert [(p.nombre, t.titulo) for p, t in resultado] == [("A", "A1"), ("B", "B0"), ("A", "A0")]
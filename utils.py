@@ -3,81 +3,170 @@ MÃ³dulo de utilidades
 Funciones auxiliares para el proyecto
 """
 
-from typing import List
-from datetime import datetime, timedelta
-from models import Proyecto, Tarea
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from config import PRIORITIES, TASK_STATUS_COMPLETED, TASK_STATUSES
+from etiquetas import indice_etiquetas
+from models import Columna, Proyecto, Tarea
+from vencimientos import indice_vencimientos
+
+
+class EstadisticasProyecto:
+    """Metricas de un proyecto a partir de sus contadores, sin recorrer tareas
+
+    Atributos: ``total_tareas``, ``total_columnas``, ``por_estado``,
+    ``por_prioridad``, ``por_usuario`` (con "Sin Asignar" al final),
+    ``asignadas``, ``sin_asignar``, ``por_columna`` (pares (Columna, total) en
+    el orden de ``listar_columnas``), ``retrasadas``, que es la unica que
+    depende de las fechas y se obtiene del indice de vencimientos al consultarla,
+    y ``por_etiqueta``, que sale del indice de etiquetas.
+    """
+
+    def __init__(self, proyecto: Proyecto, hoy: Optional[date] = None):
+        contadores = proyecto.contadores
+        self._proyecto = proyecto
+        self._hoy = hoy
+        self._retrasadas: Optional[List[Tarea]] = None
+        self._por_etiqueta: Optional[Dict[str, int]] = None
+        self.total_tareas = contadores.total
+        self.total_columnas = len(proyecto.columnas)
+        self.por_estado = {e: contadores.por_estado.get(e, 0) for e in TASK_STATUSES}
+        self.por_prioridad = {p: contadores.por_prioridad.get(p, 0) for p in PRIORITIES}
+        self.sin_asignar = contadores.por_asignado.get("", 0)
+        self.asignadas = self.total_tareas - self.sin_asignar
+        self.por_usuario: Dict[str, int] = {
+            u: n for u, n in contadores.por_asignado.items() if u
+        }
+        self.por_usuario["Sin Asignar"] = self.sin_asignar
+        self.por_columna: List[Tuple[Columna, int]] = [
+            (c, contadores.por_columna.get(c.columna_id, 0))
+            for c in proyecto.listar_columnas()
+        ]
+
+    @property
+    def retrasadas(self) -> List[Tarea]:
+        """Tareas no completadas con fecha de vencimiento pasada"""
+        if self._retrasadas is None:
+            self._retrasadas = indice_vencimientos(self._proyecto).retrasadas(self._hoy)
+        return self._retrasadas
+
+    @property
+    def por_etiqueta(self) -> Dict[str, int]:
+        """Tareas por etiqueta, de la mas usada a la menos"""
+        if self._por_etiqueta is None:
+            self._por_etiqueta = indice_etiquetas(self._proyecto).contar()
+        return self._por_etiqueta
+
+    @property
+    def completadas(self) -> int:
+        return self.por_estado[TASK_STATUS_COMPLETED]
+
+    @property
+    def progreso(self) -> float:
+        """Porcentaje de tareas completadas (0-100)"""
+        if not self.total_tareas:
+            return 0.0
+        return (self.completadas / self.total_tareas) * 100
+
+    def porcentaje(self, cantidad: int) -> int:
+        """Porcentaje entero de ``cantidad`` sobre el total de tareas"""
+        return cantidad * 100 // self.total_tareas if self.total_tareas else 0
+
+    def to_dict(self) -> dict:
+        """Convierte las estadisticas a diccionario (para exportar)"""
+        return {
+            "total_tareas": self.total_tareas,
+            "total_columnas": self.total_columnas,
+            "progreso": self.progreso,
+            "por_estado": dict(self.por_estado),
+            "por_prioridad": dict(self.por_prioridad),
+            "por_usuario": dict(self.por_usuario),
+            "por_columna": {c.nombre: n for c, n in self.por_columna},
+            "por_etiqueta": dict(self.por_etiqueta),
+            "retrasadas": [t.tarea_id for t in self.retrasadas],
+        }
 
 
 class ProyectoAnalytics:
-    """AnÃ¡lisis y generaciÃ³n de reportes de proyectos"""
+    """AnÃ¡lisis y generaciÃ³n de reportes de proyectos
+
+    Los conteos salen de los contadores que mantiene el proyecto
+    (``Proyecto.contadores``), las consultas por fecha de vencimiento, del
+    indice de vencimientos (vencimientos.py) y las de etiquetas, del indice de
+    etiquetas (etiquetas.py).
+    """
 
     @staticmethod
     def obtener_tareas_por_prioridad(proyecto: Proyecto) -> dict:
         """Retorna el conteo de tareas por prioridad"""
-        tareas = proyecto.obtener_todas_las_tareas()
-        prioridades = {"Baja": 0, "Media": 0, "Alta": 0, "Urgente": 0}
-        for tarea in tareas:
-            if tarea.prioridad in prioridades:
-                prioridades[tarea.prioridad] += 1
-        return prioridades
+        cuentas = proyecto.contadores.por_prioridad
+        return {p: cuentas.get(p, 0) for p in ("Baja", "Media", "Alta", "Urgente")}
 
     @staticmethod
     def obtener_tareas_por_estado(proyecto: Proyecto) -> dict:
         """Retorna el conteo de tareas por estado"""
-        tareas = proyecto.obtener_todas_las_tareas()
-        estados = {"Pendiente": 0, "En Progreso": 0, "Completada": 0, "Bloqueada": 0}
-        for tarea in tareas:
-            if tarea.estado in estados:
-                estados[tarea.estado] += 1
-        return estados
+        cuentas = proyecto.contadores.por_estado
+        return {
+            e: cuentas.get(e, 0)
+            for e in ("Pendiente", "En Progreso", "Completada", "Bloqueada")
+        }
 
     @staticmethod
     def obtener_tareas_por_usuario(proyecto: Proyecto) -> dict:
         """Retorna el conteo de tareas asignadas por usuario"""
-        tareas = proyecto.obtener_todas_las_tareas()
-        usuarios = {}
-        sin_asignar = 0
+        cuentas = proyecto.contadores.por_asignado
+        usuarios = {u: n for u, n in cuentas.items() if u}
+        usuarios["Sin Asignar"] = cuentas.get("", 0)
+        return usuarios
 
-        for tarea in tareas:
-            if tarea.asignado_a:
-                usuarios[tarea.asignado_a] = usuarios.get(tarea.asignado_a, 0) + 1
-            else:
-                sin_asignar += 1
+    @staticmethod
+    def obtener_tareas_por_etiqueta(proyecto: Proyecto) -> dict:
+        """Retorna el conteo de tareas por etiqueta, de la mas usada a la menos"""
+        return indice_etiquetas(proyecto).contar()
 
-        usuarios["Sin Asignar"] = sin_asignar
-        return usuarios
+    @staticmethod
+    def obtener_tareas_con_etiquetas(
+        proyecto: Proyecto, todas: Tuple[str, ...] = (), alguna: Tuple[str, ...] = ()
+    ) -> List[Tarea]:
+        """Retorna las tareas con todas las etiquetas de ``todas`` y alguna de ``alguna``"""
+        return [tarea for _, tarea in indice_etiquetas(proyecto).filtrar(proyecto, todas, alguna)]
 
     @staticmethod
     def obtener_tareas_retrasadas(proyecto: Proyecto) -> List[Tarea]:
         """Retorna tareas con fecha de vencimiento pasada"""
-        tareas = proyecto.obtener_todas_las_tareas()
-        retrasadas = []
-        hoy = datetime.now().date()
+        return indice_vencimientos(proyecto).retrasadas()
 
-        for tarea in tareas:
-            if tarea.fecha_vencimiento:
-                try:
-                    fecha_venc = datetime.fromisoformat(tarea.fecha_vencimiento).date()
-                    if fecha_venc < hoy and tarea.estado != "Completada":
-                        retrasadas.append(tarea)
-                except (ValueError, TypeError):
-                    pass
+    @staticmethod
+    def obtener_proximos_vencimientos(proyecto: Proyecto, dias: int = 7) -> List[Tarea]:
+        """Retorna tareas no completadas que vencen entre hoy y dentro de ``dias`` dias"""
+        return indice_vencimientos(proyecto).proximas(dias)
 
-        return retrasadas
+    @staticmethod
+    def obtener_siguientes_vencimientos(proyecto: Proyecto, cantidad: int = 5) -> List[Tarea]:
+        """Retorna las ``cantidad`` tareas no completadas que vencen antes (desde hoy)"""
+        return indice_vencimientos(proyecto).siguientes(cantidad)
 
     @staticmethod
     def obtener_progreso_proyecto(proyecto: Proyecto) -> float:
         """Retorna el porcentaje de progreso del proyecto (0-100)"""
-        tareas = proyecto.obtener_todas_las_tareas()
-        if not tareas:
+        contadores = proyecto.contadores
+        if not contadores.total:
             return 0.0
 
-        completadas = sum(1 for t in tareas if t.estado == "Completada")
-        return (completadas / len(tareas)) * 100
+        completadas = contadores.por_estado.get("Completada", 0)
+        return (completadas / contadores.total) * 100
 
     @staticmethod
-    def generar_reporte_texto(proyecto: Proyecto) -> str:
+    def calcular_estadisticas(proyecto: Proyecto) -> EstadisticasProyecto:
+        """Calcula todas las metricas del proyecto a partir de sus contadores"""
+        return EstadisticasProyecto(proyecto)
+
+    @staticmethod
+    def generar_reporte_texto(
+        proyecto: Proyecto, estadisticas: Optional[EstadisticasProyecto] = None
+    ) -> str:
         """Genera un reporte de texto del proyecto"""
+        estadisticas = estadisticas or EstadisticasProyecto(proyecto)
         reporte = []
         reporte.append(f"\n{'='*60}")
         reporte.append(f"REPORTE DE PROYECTO: {proyecto.nombre}")
@@ -90,45 +179,46 @@ class ProyectoAnalytics:
 
         # EstadÃ­sticas generales
         reporte.append("ESTADÃSTICAS GENERALES:")
-        reporte.append(f"  Total de tareas: {proyecto.contar_tareas()}")
-        reporte.append(f"  Total de columnas: {len(proyecto.columnas)}")
-        reporte.append(
-            f"  Progreso: {ProyectoAnalytics.obtener_progreso_proyecto(proyecto):.1f}%"
-        )
+        reporte.append(f"  Total de tareas: {estadisticas.total_tareas}")
+        reporte.append(f"  Total de columnas: {estadisticas.total_columnas}")
+        reporte.append(f"  Progreso: {estadisticas.progreso:.1f}%")
         reporte.append("")
 
         # Por estado
         reporte.append("POR ESTADO:")
-        estados = ProyectoAnalytics.obtener_tareas_por_estado(proyecto)
-        for estado, count in estados.items():
+        for estado, count in estadisticas.por_estado.items():
             reporte.append(f"  {estado}: {count}")
         reporte.append("")
 
         # Por prioridad
         reporte.append("POR PRIORIDAD:")
-        prioridades = ProyectoAnalytics.obtener_tareas_por_prioridad(proyecto)
-        for prioridad, count in prioridades.items():
+        for prioridad, count in estadisticas.por_prioridad.items():
             reporte.append(f"  {prioridad}: {count}")
         reporte.append("")
 
         # Por usuario
         reporte.append("ASIGNACIÃ“N DE TAREAS:")
-        usuarios = ProyectoAnalytics.obtener_tareas_por_usuario(proyecto)
-        for usuario, count in usuarios.items():
+        for usuario, count in estadisticas.por_usuario.items():
             reporte.append(f"  {usuario}: {count}")
         reporte.append("")
 
+        # Por etiqueta
+        if estadisticas.por_etiqueta:
+            reporte.append("POR ETIQUETA:")
+            for etiqueta, count in estadisticas.por_etiqueta.items():
+                reporte.append(f"  {etiqueta}: {count}")
+            reporte.append("")
+
         # Tareas retrasadas
-        retrasadas = ProyectoAnalytics.obtener_tareas_retrasadas(proyecto)
-        if retrasadas:
+        if estadisticas.retrasadas:
             reporte.append("âš ï¸  TAREAS RETRASADAS:")
-            for tarea in retrasadas:
+            for tarea in estadisticas.retrasadas:
                 reporte.append(f"  - {tarea.titulo} (vence: {tarea.fecha_vencimiento})")
             reporte.append("")
 
         # Por columna
         reporte.append("DISTRIBUCIÃ“N POR COLUMNA:")
-        for columna in proyecto.listar_columnas():
+        for columna, _ in estadisticas.por_columna:
             reporte.append(f"  {columna.nombre}:")
             for tarea in columna.tareas:
                 reporte.append(f"    â€¢ {tarea.titulo} [{tarea.prioridad}]")
@@ -172,6 +262,26 @@ class ValidadorDatos:
         except (ValueError, TypeError):
             return False
 
+    @staticmethod
+    def errores_tarea(datos: Dict) -> List[str]:
+        """Problemas de los datos de una tarea (titulo, prioridad, estado y
+        vencimiento); lista vacia si son validos. Los campos ausentes o vacios
+        salvo el titulo toman su valor por defecto y no se comprueban
+        """
+        errores = []
+        if not ValidadorDatos.validar_no_vacio(datos.get("titulo") or ""):
+            errores.append("titulo vacio")
+        prioridad = datos.get("prioridad")
+        if prioridad and not ValidadorDatos.validar_prioridad(prioridad):
+            errores.append(f"prioridad no valida: {prioridad}")
+        estado = datos.get("estado")
+        if estado and not ValidadorDatos.validar_estado(estado):
+            errores.append(f"estado no valido: {estado}")
+        vencimiento = datos.get("fecha_vencimiento")
+        if vencimiento and not ValidadorDatos.validar_fecha_iso(vencimiento):
+            errores.append(f"fecha de vencimiento no valida: {vencimiento}")
+        return errores
+
 
 class ExportadorDatos:
     """Exporta datos del proyecto a diferentes formatos"""
@@ -199,15 +309,26 @@ class ExportadorDatos:
         return "\n".join(lineas)
 
     @staticmethod
-    def exportar_a_markdown(proyecto: Proyecto) -> str:
+    def exportar_estadisticas(
+        proyecto: Proyecto, estadisticas: Optional[EstadisticasProyecto] = None
+    ) -> dict:
+        """Exporta las estadisticas del proyecto a diccionario JSON"""
+        estadisticas = estadisticas or EstadisticasProyecto(proyecto)
+        return {"proyecto_id": proyecto.proyecto_id, **estadisticas.to_dict()}
+
+    @staticmethod
+    def exportar_a_markdown(
+        proyecto: Proyecto, estadisticas: Optional[EstadisticasProyecto] = None
+    ) -> str:
         """Exporta proyecto a formato Markdown"""
+        estadisticas = estadisticas or EstadisticasProyecto(proyecto)
         lineas = []
         lineas.append(f"# {proyecto.nombre}\n")
         lineas.append(f"**DescripciÃ³n:** {proyecto.descripcion}\n")
         lineas.append(f"**Creado:** {proyecto.fecha_creacion}\n")
-        lineas.append(f"**Total de tareas:** {proyecto.contar_tareas()}\n")
+        lineas.append(f"**Total de tareas:** {estadisticas.total_tareas}\n")
 
-        for columna in proyecto.listar_columnas():
+        for columna, _ in estadisticas.por_columna:
             lineas.append(f"## {columna.nombre}\n")
 
             if not columna.tareas:
@@ -0,0 +1,146 @@
+"""
+Indice de fechas de vencimiento de las tareas
+Tareas no completadas ordenadas por vencimiento para consultar retrasadas y
+proximos vencimientos sin volver a interpretar cada fecha
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from itertools import count, islice, repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import TASK_STATUS_COMPLETED
+from models import SIN_FECHA, Proyecto, Tarea, epoch
+
+_DIA = 24 * 60 * 60
+_EPOCA = date(1970, 1, 1)
+
+Entrada = Tuple[int, int, Tarea]
+
+
+def _inicio_del_dia(dia: date) -> int:
+    """Segundos desde 1970 hasta las 00:00 de ``dia``"""
+    return (dia - _EPOCA).days * _DIA
+
+
+class IndiceVencimientos:
+    """Tareas no completadas con vencimiento valido, ordenadas por vencimiento
+
+    Cada entrada es ``(vencimiento, orden, tarea)``: el vencimiento en segundos
+    desde 1970 y el orden de insercion, que desempata. Al construir el indice
+    ese orden es el del tablero (columna y posicion); despues, las tareas que
+    se indexan (nuevas o con la fecha o el estado cambiados) quedan detras de
+    las de su mismo vencimiento y mover o reordenar tareas no cambia los
+    empates: siguen el orden de insercion, no la posicion actual en el
+    tablero. Las consultas hacen una busqueda binaria y solo recorren las
+    entradas que devuelven, O(log n + k).
+
+    Se mantiene al dia con las operaciones del proyecto (``aplicar_operacion``)
+    en lugar de reconstruirse con cada cambio.
+    """
+
+    def __init__(self, proyecto: Proyecto):
+        self._entradas: List[Entrada] = []
+        self._por_tarea: Dict[str, Entrada] = {}
+        self._orden = count()
+        for columna in proyecto.columnas:
+            for tarea in columna.tareas:
+                entrada = self._entrada(tarea)
+                if entrada is not None:
+                    self._entradas.append(entrada)
+        self._entradas.sort()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def _entrada(self, tarea: Tarea) -> Optional[Entrada]:
+        """Crea y registra la entrada de la tarea (None si no se indexa)"""
+        if tarea.estado == TASK_STATUS_COMPLETED or not tarea.fecha_vencimiento:
+            return None
+        vencimiento = epoch(tarea.fecha_vencimiento)
+        if vencimiento == SIN_FECHA:
+            return None
+        entrada = (vencimiento, next(self._orden), tarea)
+        self._por_tarea[tarea.tarea_id] = entrada
+        return entrada
+
+    def _agregar(self, tarea: Tarea):
+        entrada = self._entrada(tarea)
+        if entrada is not None:
+            insort(self._entradas, entrada)
+
+    def _quitar(self, tarea_id: str):
+        entrada = self._por_tarea.pop(tarea_id, None)
+        if entrada is not None:
+            del self._entradas[bisect_left(self._entradas, entrada)]
+
+    def _reindexar_tarea(self, proyecto: Proyecto, tarea_id: str):
+        self._quitar(tarea_id)
+        ubicacion = proyecto.localizar_tarea(tarea_id)
+        if ubicacion is not None:
+            self._agregar(ubicacion[1])
+
+    def aplicar_operacion(self, proyecto: Proyecto, operacion: Dict) -> bool:
+        """Actualiza el indice con una operacion ya aplicada al proyecto
+
+        Retorna False si no puede hacerlo (el indice debe reconstruirse).
+        """
+        op = operacion["op"]
+        if op == "agregar_tarea":
+            self._reindexar_tarea(proyecto, operacion["tarea"]["tarea_id"])
+        elif op == "eliminar_tarea":
+            self._reindexar_tarea(proyecto, operacion["tarea_id"])
+        elif op == "actualizar_tarea":
+            campos = operacion["campos"]
+            if "estado" in campos or "fecha_vencimiento" in campos:
+                self._reindexar_tarea(proyecto, operacion["tarea_id"])
+        elif op == "eliminar_columna":
+            return False
+        return True
+
+    def _posicion(self, dia: date) -> int:
+        """Primera entrada que vence el ``dia`` indicado o despues"""
+        return bisect_left(self._entradas, (_inicio_del_dia(dia),))
+
+    def iterar_desde(self, dia: date) -> Iterator[Entrada]:
+        """Entradas que vencen desde el ``dia`` indicado, en orden"""
+        return islice(self._entradas, self._posicion(dia), None)
+
+    def retrasadas(self, hoy: Optional[date] = None) -> List[Tarea]:
+        """Tareas que vencieron antes de ``hoy``, de la mas antigua a la mas reciente"""
+        hoy = hoy or datetime.now().date()
+        return [tarea for _, _, tarea in self._entradas[: self._posicion(hoy)]]
+
+    def proximas(self, dias: int, hoy: Optional[date] = None) -> List[Tarea]:
+        """Tareas que vencen desde ``hoy`` hasta ``dias`` dias despues (inclusive)"""
+        hoy = hoy or datetime.now().date()
+        inicio = self._posicion(hoy)
+        fin = bisect_left(self._entradas, (_inicio_del_dia(hoy) + (dias + 1) * _DIA,))
+        return [tarea for _, _, tarea in self._entradas[inicio:fin]]
+
+    def siguientes(self, cantidad: int, hoy: Optional[date] = None) -> List[Tarea]:
+        """Las ``cantidad`` tareas con vencimiento mas cercano desde ``hoy``"""
+        hoy = hoy or datetime.now().date()
+        return [tarea for _, _, tarea in islice(self.iterar_desde(hoy), cantidad)]
+
+
+def indice_vencimientos(proyecto: Proyecto) -> IndiceVencimientos:
+    """Indice de vencimientos del proyecto, mantenido con sus operaciones"""
+    return proyecto.derivado("vencimientos", IndiceVencimientos)
+
+
+def siguientes_vencimientos(
+    proyectos: Iterable[Proyecto], cantidad: int, hoy: Optional[date] = None
+) -> List[Tuple[Proyecto, Tarea]]:
+    """Los ``cantidad`` vencimientos mas cercanos desde ``hoy`` entre varios proyectos
+
+    Mezcla los indices de cada proyecto con un heap, sin ordenar todas las tareas.
+    """
+    hoy = hoy or datetime.now().date()
+    flujos = [
+        zip(repeat(proyecto), indice_vencimientos(proyecto).iterar_desde(hoy))
+        for proyecto in proyectos
+    ]
+    mezcla = heapq.merge(*flujos, key=lambda par: par[1][0])
+    return [(proyecto, entrada[2]) for proyecto, entrada in islice(mezcla, cantidad)]